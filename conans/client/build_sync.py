@@ -0,0 +1,92 @@
+""" Incremental synchronization of the source folder into the build folders, so every
+configuration doesn't need a full copy of the sources
+"""
+import json
+import os
+
+from conans.paths import BUILD_SYNC_MANIFEST
+from conans.util.files import copy_file, load, save, mkdir
+from conans.util.log import logger
+
+
+def _file_state(path):
+    st = os.stat(path)
+    return [st.st_mtime, st.st_size]
+
+
+def _load_manifest(manifest_path):
+    """ {relative path: [src mtime, src size, dst mtime, dst size]} of the last sync
+    """
+    try:
+        return json.loads(load(manifest_path))
+    except Exception:  # Not existing or corrupted, everything will be copied again
+        return {}
+
+
+def sync_folder(src_folder, dst_folder, link=False, ignore=None):
+    """ Makes dst_folder have the same files as src_folder, copying only the new and
+    modified ones. Files are compared by mtime and size, both in the source and in the
+    destination, so files modified in the build folder (e.g. patched by the build) are
+    copied again. Files copied in a previous sync and removed from the source are removed,
+    other files in dst_folder (build products) are kept.
+    The state of the last sync is stored in a manifest in dst_folder.
+
+    param link: hard link the files instead of copying them. The sources are shared by all
+                the build folders, so they MUST NOT be modified in place by the build.
+                tools.replace_in_file, tools.patch and save() replace the links instead
+    param ignore: same as shutil.copytree ignore, callable(folder, names) returning the
+                  names to be ignored
+    return: number of copied files
+    """
+    manifest_path = os.path.join(dst_folder, BUILD_SYNC_MANIFEST)
+    previous = _load_manifest(manifest_path)
+    current = {}
+    copied = 0
+    mkdir(dst_folder)
+    for root, dirs, files in os.walk(src_folder):
+        relative_root = os.path.relpath(root, src_folder)
+        ignored = ignore(root, dirs + files) if ignore else ()
+        dirs[:] = [d for d in dirs if d not in ignored]
+        for name in list(dirs):  # Links to folders are recreated, not followed
+            src = os.path.join(root, name)
+            if os.path.islink(src):
+                dirs.remove(name)
+                files.append(name)
+        for name in files:
+            if name in ignored:
+                continue
+            relative_name = os.path.normpath(os.path.join(relative_root, name))
+            src = os.path.join(root, name)
+            dst = os.path.join(dst_folder, relative_name)
+            if os.path.islink(src):
+                _sync_link(src, dst)
+                continue
+            src_state = _file_state(src)
+            state = previous.get(relative_name)
+            if (state is None or state[:2] != src_state or not os.path.exists(dst) or
+                    state[2:] != _file_state(dst)):
+                mkdir(os.path.dirname(dst))
+                copy_file(src, dst, link)
+                copied += 1
+            current[relative_name] = src_state + _file_state(dst)
+
+    for relative_name in set(previous).difference(current):
+        try:
+            os.remove(os.path.join(dst_folder, relative_name))
+        except OSError:
+            pass
+    save(manifest_path, json.dumps(current))
+    logger.debug("Synced %d files from %s to %s" % (copied, src_folder, dst_folder))
+    return copied
+
+
+def _sync_link(src, dst):
+    target = os.readlink(src)
+    if os.path.islink(dst):
+        if os.readlink(dst) == target:
+            return
+        os.remove(dst)
+    elif os.path.exists(dst):
+        os.remove(dst)
+    mkdir(os.path.dirname(dst))
+    os.symlink(target, dst)
@@ -1,20 +1,28 @@
 import os
-from conans.util.files import save, load, relative_dirs, path_exists, mkdir
+from six.moves import cPickle as pickle
+from conans.util.files import save, load, relative_dirs, path_exists, mkdir, rmdir
+from conans.util.env_reader import get_env
 from conans.model.settings import Settings
 from conans.client.conf import ConanClientConfigParser, default_client_conf, default_settings_yml
 from conans.model.values import Values
 from conans.client.detect import detect_defaults_settings
 from conans.model.ref import ConanFileReference
 from conans.model.manifest import FileTreeManifest
-from conans.paths import SimplePaths
+from conans.paths import SimplePaths, TRASH_FOLDER, EXPORTS_PENDING
 from genericpath import isdir
 from conans.model.profile import Profile
+from conans.util.log import logger
+from conans.client.remote_registry import RemoteRegistry
+from conans.client.store.localdb import LOCALDB
+from conans.client.store.registrydb import REGISTRY_DB
+from conans.client.trash import Trash
 
 CONAN_CONF = 'conan.conf'
 CONAN_SETTINGS = "settings.yml"
-LOCALDB = ".conan.db"
+SETTINGS_SNAPSHOT = ".settings.pickle"
 REGISTRY = "registry.txt"
 PROFILES_FOLDER = "profiles"
+LOCKS_FOLDER = "locks"
 
 
 class ClientCache(SimplePaths):
@@ -26,6 +34,8 @@ class ClientCache(SimplePaths):
         self.conan_folder = os.path.join(base_folder, ".conan")
         self._conan_config = None
         self._settings = None
+        self._remote_registry = None
+        self._trash = None
         self._output = output
         self._store_folder = store_folder or self.conan_config.storage_path or self.conan_folder
         super(ClientCache, self).__init__(self._store_folder)
@@ -34,6 +44,32 @@ class ClientCache(SimplePaths):
     def registry(self):
         return os.path.join(self.conan_folder, REGISTRY)
 
+    @property
+    def registry_db(self):
+        return os.path.join(self.conan_folder, REGISTRY_DB)
+
+    @property
+    def trash(self):
+        if self._trash is None:
+            self._trash = Trash(os.path.join(self.store, TRASH_FOLDER))
+        return self._trash
+
+    def remove_folder(self, path, short_paths=False):
+        """ removes a folder of the store. With CONAN_TRASH it is moved to the trash, and
+        deleted by a background process
+        """
+        if get_env("CONAN_TRASH", False):
+            self.trash.remove(path, short_paths)
+        else:
+            rmdir(path, short_paths)
+
+    @property
+    def remote_registry(self):
+        """ RemoteRegistry shared by the whole command, it has to be flushed at the end """
+        if self._remote_registry is None:
+            self._remote_registry = RemoteRegistry(self.registry, self._output, self.registry_db)
+        return self._remote_registry
+
     @property
     def conan_config(self):
         def generate_default_config_file():
@@ -50,6 +86,21 @@ class ClientCache(SimplePaths):
 
         return self._conan_config
 
+    def recipe_lock(self, conan_reference):
+        """ Lock file path, to serialize among processes the retrieval of a recipe """
+        return os.path.normpath(os.path.join(self.conan_folder, LOCKS_FOLDER,
+                                             "/".join(conan_reference) + ".lock"))
+
+    def package_locks(self, conan_reference):
+        """ Folder of the lock files of the packages of a recipe """
+        return os.path.normpath(os.path.join(self.conan_folder, LOCKS_FOLDER,
+                                             "/".join(conan_reference)))
+
+    def package_lock(self, package_reference):
+        """ Lock file path, to serialize among processes the retrieval of a package """
+        return os.path.join(self.package_locks(package_reference.conan),
+                            package_reference.package_id + ".lock")
+
     @property
     def localdb(self):
         return os.path.join(self.conan_folder, LOCALDB)
@@ -74,14 +125,40 @@ class ClientCache(SimplePaths):
             # TODO: Read default environment settings
             if not os.path.exists(self.settings_path):
                 save(self.settings_path, default_settings_yml)
-                settings = Settings.loads(default_settings_yml)
-            else:
-                content = load(self.settings_path)
-                settings = Settings.loads(content)
+            settings = Settings(self._settings_definition())
             settings.values = self.conan_config.settings_defaults
             self._settings = settings
         return self._settings
 
+    def _settings_definition(self):
+        """ The parsed settings.yml is kept in a pickled snapshot, valid while settings.yml
+        is not modified, so yaml is not imported nor parsed in every command """
+        st = os.stat(self.settings_path)
+        stamp = (st.st_mtime, st.st_size)
+        snapshot_path = os.path.join(self.conan_folder, SETTINGS_SNAPSHOT)
+        try:
+            with open(snapshot_path, "rb") as handle:
+                snapshot_stamp, definition = pickle.load(handle)
+            if snapshot_stamp == stamp:
+                return definition
+        except Exception:  # Missing or corrupted, generate it again
+            pass
+
+        import yaml
+        definition = yaml.load(load(self.settings_path)) or {}
+        try:
+            tmp_path = "%s.%d" % (snapshot_path, os.getpid())
+            with open(tmp_path, "wb") as handle:
+                pickle.dump((stamp, definition), handle, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_path, snapshot_path)
+        except Exception as exc:  # The snapshot is just an optimization
+            logger.warn("Couldn't save settings snapshot: %s" % str(exc))
+        return definition
+
+    def exports_pending(self, conan_reference):
+        """ File with the exported files of a recipe not retrieved yet from its remote """
+        return os.path.join(self.conan(conan_reference), EXPORTS_PENDING)
+
     def export_paths(self, conan_reference):
         ''' Returns all file paths for a conans (relative to conans directory)'''
         return relative_dirs(self.export(conan_reference))
@@ -2,26 +2,18 @@ from conans.client.output import ConanOutput, Color
 import argparse
 from conans.errors import ConanException
 import inspect
-from conans.client.remote_manager import RemoteManager
 from conans.client.userio import UserIO
-from conans.client.rest.auth_manager import ConanApiAuthManager
-from conans.client.rest.rest_client import RestApiClient
 from conans.client.store.localdb import LocalDB
 from conans.util.log import logger
 from conans.model.ref import ConanFileReference
-from conans.client.manager import ConanManager
 from conans.paths import CONANFILE, conan_expand_user
-import requests
-from conans.client.rest.version_checker import VersionCheckerRequester
 from conans import __version__ as CLIENT_VERSION
-from conans.client.conf import MIN_SERVER_COMPATIBLE_VERSION
 from conans.model.version import Version
 from conans.client.migrations import ClientMigrator
 import hashlib
 from conans.util.files import rmdir, load, save_files
 from argparse import RawTextHelpFormatter
 from conans.client.runner import ConanRunner
-from conans.client.remote_registry import RemoteRegistry
 from conans.model.scope import Scopes
 import re
 from conans.search import DiskSearchManager, DiskSearchAdapter
@@ -69,7 +61,12 @@ class Command(object):
         self._client_cache = client_cache
         self._user_io = user_io
         self._runner = runner
-        self._manager = ConanManager(client_cache, user_io, runner, remote_manager, search_manager)
+
+        def instance_manager():
+            from conans.client.manager import ConanManager
+            return ConanManager(client_cache, user_io, runner, remote_manager, search_manager)
+        # Built on first use, commands not needing it (e.g. --help) do not pay its imports
+        self._manager = LazyInstance(instance_manager)
 
     def _parse_args(self, parser):
         parser.add_argument("-r", "--remote", help='look for in the remote storage')
@@ -409,6 +406,10 @@ path to the CMake binary directory, like this:
                             nargs=1, action=Extender)
         parser.add_argument("--scope", "-sc", nargs=1, action=Extender,
                             help='Define scopes for packages')
+        parser.add_argument("--json", "-j", nargs="?", const=True, default=None,
+                            help='export the graph (nodes, edges, package IDs, remotes, '
+                                 'binaries and timings) as JSON lines, to the output or to '
+                                 'the given file')
         args = parser.parse_args(*args)
 
         options = self._get_tuples_list_from_extender_arg(args.options)
@@ -428,7 +429,8 @@ path to the CMake binary directory, like this:
                            check_updates=args.update,
                            filename=args.file,
                            build_order=args.build_order,
-                           scopes=scopes)
+                           scopes=scopes,
+                           json_output=args.json)
 
     def build(self, *args):
         """ calls your project conanfile.py "build" method.
@@ -671,9 +673,13 @@ path to the CMake binary directory, like this:
                                             "with a package recipe")
         parser_pupd.add_argument('reference',  help='package recipe reference')
         parser_pupd.add_argument('remote',  help='name of the remote')
+        parser_exp = subparsers.add_parser('export', help='save the remotes and the package '
+                                           'recipes associated remotes to a file, in the '
+                                           'registry.txt format of previous conan versions')
+        parser_exp.add_argument('file',  help='destination file')
         args = parser.parse_args(*args)
 
-        registry = RemoteRegistry(self._client_cache.registry, self._user_io.out)
+        registry = self._client_cache.remote_registry
         if args.subcommand == "list":
             for r in registry.remotes:
                 self._user_io.out.info("%s: %s" % (r.name, r.url))
@@ -684,7 +690,7 @@ path to the CMake binary directory, like this:
         elif args.subcommand == "update":
             registry.update(args.remote, args.url)
         elif args.subcommand == "list_ref":
-            for ref, remote in registry.refs.items():
+            for ref, remote in sorted(registry.refs.items()):
                 self._user_io.out.info("%s: %s" % (ref, remote))
         elif args.subcommand == "add_ref":
             registry.add_ref(args.reference, args.remote)
@@ -692,6 +698,23 @@ path to the CMake binary directory, like this:
             registry.remove_ref(args.reference)
         elif args.subcommand == "update_ref":
             registry.update_ref(args.reference, args.remote)
+        elif args.subcommand == "export":
+            registry.export(os.path.abspath(args.file))
+
+    def cache(self, *args):
+        """ manage the local cache. With CONAN_TRASH=1 the removed folders are moved to a
+        trash folder, and deleted in background
+        """
+        parser = argparse.ArgumentParser(description=self.cache.__doc__, prog="conan cache")
+        subparsers = parser.add_subparsers(dest='subcommand', help='sub-command help')
+        subparsers.add_parser('purge', help='delete now the folders in the trash, waiting '
+                                            'for the background deletion if running')
+        args = parser.parse_args(*args)
+
+        if args.subcommand == "purge":
+            trash = self._client_cache.trash
+            self._user_io.out.info("Purging %s" % trash.folder)
+            trash.purge()
 
     def _show_help(self):
         """ prints a summary of all commands
@@ -736,7 +759,11 @@ path to the CMake binary directory, like this:
             except IndexError as exc:  # No parameters
                 self._show_help()
                 return False
-            method(args[0][1:])
+            try:
+                method(args[0][1:])
+            finally:
+                # References retrieved before an error are saved too
+                self._client_cache.remote_registry.flush()
         except (KeyboardInterrupt, SystemExit) as exc:
             logger.error(exc)
             errors = True
@@ -753,22 +780,43 @@ path to the CMake binary directory, like this:
         return errors
 
 
-def migrate_and_get_client_cache(base_folder, out, manager, storage_folder=None):
+def migrate_and_get_client_cache(base_folder, out, storage_folder=None):
     # Init paths
     client_cache = ClientCache(base_folder, storage_folder, out)
 
     # Migration system
-    migrator = ClientMigrator(client_cache, Version(CLIENT_VERSION), out, manager)
-    migrator.migrate()
-
-    # Init again paths, migration could change config
-    client_cache = ClientCache(base_folder, storage_folder, out)
+    migrator = ClientMigrator(client_cache, Version(CLIENT_VERSION), out)
+    if migrator.migrate():
+        # Init again paths, migration could change config
+        client_cache = ClientCache(base_folder, storage_folder, out)
     return client_cache
 
 
+class LazyInstance(object):
+    """ Proxy of the object returned by factory(), which is called on first use. For the
+    subsystems that are expensive to import or build (ConanManager, the RemoteManager
+    with the REST and authentication stack, requests, LocalDB) and many commands never use
+    """
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+
+    def __getattr__(self, name):
+        if self._instance is None:
+            self._instance = self._factory()
+        return getattr(self._instance, name)
+
+
 def get_command():
 
     def instance_remote_manager(client_cache):
+        import requests
+        from conans.client.conf import MIN_SERVER_COMPATIBLE_VERSION
+        from conans.client.remote_manager import RemoteManager
+        from conans.client.rest.auth_manager import ConanApiAuthManager
+        from conans.client.rest.rest_client import RestApiClient
+        from conans.client.rest.version_checker import VersionCheckerRequester
+
         requester = requests.Session()
         requester.proxies = client_cache.conan_config.proxies
         # Verify client version against remotes
@@ -799,22 +847,12 @@ def get_command():
 
     try:
         # To capture exceptions in conan.conf parsing
-        client_cache = ClientCache(user_folder, None, out)
-        # obtain a temp ConanManager instance to execute the migrations
-        remote_manager = instance_remote_manager(client_cache)
-
-        # Get a DiskSearchManager
-        search_adapter = DiskSearchAdapter()
-        search_manager = DiskSearchManager(client_cache, search_adapter)
-        manager = ConanManager(client_cache, user_io, ConanRunner(), remote_manager, search_manager)
-
-        client_cache = migrate_and_get_client_cache(user_folder, out, manager)
+        client_cache = migrate_and_get_client_cache(user_folder, out)
     except Exception as e:
         out.error(str(e))
         sys.exit(True)
 
-    # Get the new command instance after migrations have been done
-    remote_manager = instance_remote_manager(client_cache)
+    remote_manager = LazyInstance(lambda: instance_remote_manager(client_cache))
 
     # Get a search manager
     search_adapter = DiskSearchAdapter()
@@ -2,24 +2,42 @@
 point, which could be both a user conanfile or an installed one
 """
 from conans.model.requires import Requirements
-from collections import namedtuple
-from conans.model.ref import PackageReference
 from conans.model.info import ConanInfo
 from conans.errors import ConanException, format_conanfile_exception
 from conans.client.output import ScopedOutput
 import time
 from conans.util.log import logger
-from collections import defaultdict
+from collections import OrderedDict
 
 
-class Node(namedtuple("Node", "conan_ref conanfile")):
+class Node(object):
     """ The Node of the dependencies graph is defined by:
     ref: ConanFileReference, if it is a user space one, user=channel=none
     conanfile: the loaded conanfile object withs its values
+    Nodes are compared by identity, the same reference can be in the graph more than once
+    (private requirements). The graph itself works with the integer ids of the nodes
     """
+    __slots__ = ("conan_ref", "conanfile")
+
+    def __init__(self, conan_ref, conanfile):
+        self.conan_ref = conan_ref
+        self.conanfile = conanfile
+
+    def __iter__(self):
+        """ so it can be unpacked: conan_ref, conanfile = node
+        """
+        yield self.conan_ref
+        yield self.conanfile
+
     def __repr__(self):
         return "%s => %s" % (repr(self.conan_ref), repr(self.conanfile)[:100].replace("\n", " "))
 
+    @property
+    def package_reference(self):
+        """ the PackageReference of the node, computed once its info has been propagated
+        """
+        return self.conanfile.info.package_reference(self.conan_ref)
+
     def __cmp__(self, other):
         if other is None:
             return -1
@@ -47,55 +65,93 @@ class Node(namedtuple("Node", "conan_ref conanfile")):
     def __ge__(self, other):
         return self.__cmp__(other) in [0, 1]
 
+    # __cmp__ would be used for ==, but nodes with the same reference are different nodes
+    def __eq__(self, other):
+        return self is other
+
+    def __ne__(self, other):
+        return self is not other
+
+    __hash__ = object.__hash__
+
+
+# Flags of the edges of the graph, computed from the requirement when the edge is added
+PRIVATE = 1
+DEV = 2
+
 
 class DepsGraph(object):
-    """ DAG of dependencies
+    """ DAG of dependencies. Nodes get an integer id when added, and the edges are
+    stored as adjacency lists of ids, so the graph queries don't need to hash nodes
+    or to inspect the conanfiles requirements
     """
     def __init__(self):
         self.nodes = set()
-        self._neighbors = defaultdict(set)
-        self._inverse_neighbors = defaultdict(set)
+        self._nodes = []  # [node], indexed by id
+        self._ids = {}  # {node: id}
+        self._neighbors = []  # [[id]], indexed by id
+        self._inverse_neighbors = []  # [[id]], indexed by id
+        self._edge_flags = {}  # {(src_id, dst_id): PRIVATE | DEV}
 
     def add_node(self, node):
+        if node in self._ids:
+            return
+        self._ids[node] = len(self._nodes)
+        self._nodes.append(node)
+        self._neighbors.append([])
+        self._inverse_neighbors.append([])
         self.nodes.add(node)
 
-    def add_edge(self, src, dst):
-        assert src in self.nodes and dst in self.nodes
-        self._neighbors[src].add(dst)
-        self._inverse_neighbors[dst].add(src)
+    def add_edge(self, src, dst, private=False, dev=False):
+        assert src in self._ids and dst in self._ids
+        src_id, dst_id = self._ids[src], self._ids[dst]
+        edge = (src_id, dst_id)
+        if edge not in self._edge_flags:
+            self._neighbors[src_id].append(dst_id)
+            self._inverse_neighbors[dst_id].append(src_id)
+        self._edge_flags[edge] = (PRIVATE if private else 0) | (DEV if dev else 0)
+
+    def node_ids(self):
+        """ return [(id, node)] in the order the nodes were added
+        """
+        return list(enumerate(self._nodes))
+
+    def edges(self):
+        """ return [(src_id, dst_id, private, dev)] of all the edges
+        """
+        return [(src, dst, bool(flags & PRIVATE), bool(flags & DEV))
+                for (src, dst), flags in sorted(self._edge_flags.items())]
+
+    def _to_nodes(self, ids):
+        nodes = self._nodes
+        return [nodes[i] for i in ids]
 
     def neighbors(self, node):
         """ return all connected nodes (directionally) to the parameter one
         """
-        return self._neighbors[node]
+        return self._to_nodes(self._neighbors[self._ids[node]])
 
     def inverse_neighbors(self, node):
         """ return all the nodes which has param node has dependency
         """
-        return self._inverse_neighbors[node]
+        return self._to_nodes(self._inverse_neighbors[self._ids[node]])
+
+    def _public_neighbors(self, node_id):
+        flags = self._edge_flags
+        return [n for n in self._neighbors[node_id] if not flags[(node_id, n)] & PRIVATE]
 
     def public_neighbors(self, node):
         """ return nodes with direct reacheability by public dependencies
         """
-        neighbors = self.neighbors(node)
-        _, conanfile = node
-
-        public_requires = [r.conan_reference for r in conanfile.requires.values() if not r.private]
-        result = [n for n in neighbors if n.conan_ref in public_requires]
-        return result
+        return self._to_nodes(self._public_neighbors(self._ids[node]))
 
     def private_inverse_neighbors(self, node):
         """ return nodes connected to a given one (inversely), by a private requirement
         """
-        neighbors = self.inverse_neighbors(node)
-        result = []
-        for n in neighbors:
-            _, conanfile = n
-            for req in conanfile.requires.values():
-                if req.conan_reference == node.conan_ref:
-                    if req.private:
-                        result.append(n)
-        return result
+        node_id = self._ids[node]
+        flags = self._edge_flags
+        return self._to_nodes(n for n in self._inverse_neighbors[node_id]
+                              if flags[(n, node_id)] & PRIVATE)
 
     def __repr__(self):
         return "\n".join(["Nodes:\n    ",
@@ -118,10 +174,9 @@ class DepsGraph(object):
                 neighbors = self.neighbors(node)
                 direct_reqs = []  # of PackageReference
                 indirect_reqs = set()   # of PackageReference, avoid duplicates
-                for nref, nconan in neighbors:
-                    package_id = nconan.info.package_id()
-                    package_reference = PackageReference(nref, package_id)
-                    direct_reqs.append(package_reference)
+                for neighbor in neighbors:
+                    nref, nconan = neighbor
+                    direct_reqs.append(neighbor.package_reference)
                     indirect_reqs.update(nconan.info.requires.refs())
                     conanfile.options.propagate_downstream(nref, nconan.info.full_options)
                     # Might be never used, but update original requirement, just in case
@@ -143,68 +198,70 @@ class DepsGraph(object):
                 conanfile.conan_info()
         return ordered
 
-    def ordered_closure(self, node, flat):
-        closure = set()
-        current = self.neighbors(node)
+    @staticmethod
+    def _closure(initial, expand):
+        """ all the node ids reachable from the initial ones, including them
+        param expand: function returning the ids to visit from a given one
+        """
+        closure = set(initial)
+        current = list(closure)
         while current:
-            new_current = set()
-            for n in current:
-                closure.add(n)
-                new_neighs = self.public_neighbors(n)
-                to_add = set(new_neighs).difference(current)
-                new_current.update(to_add)
+            new_current = []
+            for node_id in current:
+                for n in expand(node_id):
+                    if n not in closure:
+                        closure.add(n)
+                        new_current.append(n)
             current = new_current
+        return closure
 
-        result = [n for n in flat if n in closure]
+    def ordered_closure(self, node, flat):
+        closure = self._closure(self._neighbors[self._ids[node]], self._public_neighbors)
+        ids = self._ids
+        result = [n for n in flat if ids[n] in closure]
         return result
 
     def _inverse_closure(self, references):
-        closure = set()
-        current = [n for n in self.nodes if str(n.conan_ref) in references or "ALL" in references]
-        closure.update(current)
-        while current:
-            new_current = set()
-            for n in current:
-                closure.add(n)
-                new_neighs = self.inverse_neighbors(n)
-                to_add = set(new_neighs).difference(current)
-                new_current.update(to_add)
-            current = new_current
-        return closure
+        initial = [i for i, n in enumerate(self._nodes)
+                   if str(n.conan_ref) in references or "ALL" in references]
+        return self._closure(initial, self._inverse_neighbors.__getitem__)
 
     def build_order(self, references):
         levels = self.inverse_levels()
         closure = self._inverse_closure(references)
+        ids = self._ids
         result = []
         for level in reversed(levels):
-            new_level = [n.conan_ref for n in level if (n in closure and n.conan_ref)]
+            new_level = [n.conan_ref for n in level if (ids[n] in closure and n.conan_ref)]
             if new_level:
                 result.append(new_level)
         return result
 
+    def _levels(self, neighbors, inverse_neighbors):
+        """ Kahn's topological sort, grouping in the same level all the nodes whose
+        neighbors are already in previous levels
+        """
+        pending = [len(n) for n in neighbors]
+        current = [i for i, count in enumerate(pending) if not count]
+        result = []
+        while current:
+            result.append(sorted(self._to_nodes(current)))
+            new_current = []
+            for node_id in current:
+                for n in inverse_neighbors[node_id]:
+                    pending[n] -= 1
+                    if not pending[n]:
+                        new_current.append(n)
+            current = new_current
+        return result or [[]]
+
     def by_levels(self):
         """ order by node degree. The first level will be the one which nodes dont have
         dependencies. Second level will be with nodes that only have dependencies to
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
         """
-        current_level = []
-        result = [current_level]
-        opened = self.nodes.copy()
-        while opened:
-            current = opened.copy()
-            for o in opened:
-                o_neighs = self._neighbors[o]
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
-                    current.discard(o)
-            current_level.sort()
-            # now initialize new level
-            opened = current
-            if opened:
-                current_level = []
-                result.append(current_level)
-        return result
+        return self._levels(self._neighbors, self._inverse_neighbors)
 
     def inverse_levels(self):
         """ order by node degree. The first level will be the one which nodes dont have
@@ -212,71 +269,36 @@ class DepsGraph(object):
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
         """
-        current_level = []
-        result = [current_level]
-        opened = self.nodes.copy()
-        while opened:
-            current = opened.copy()
-            for o in opened:
-                o_neighs = self._inverse_neighbors[o]
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
-                    current.discard(o)
-            current_level.sort()
-            # now initialize new level
-            opened = current
-            if opened:
-                current_level = []
-                result.append(current_level)
-
-        return result
+        return self._levels(self._inverse_neighbors, self._neighbors)
 
     def private_nodes(self, built_private_nodes):
         """ computes a list of nodes living in the private zone of the deps graph,
         together with the list of nodes that privately require it
         """
-        closure = set()
-        nodes_by_level = self.by_levels()
-        open_nodes = nodes_by_level[-1]
-        closure.update(open_nodes)
-        while open_nodes:
-            new_open_nodes = set()
-            for node in open_nodes:
-                if node in built_private_nodes:
-                    neighbors = self.public_neighbors(node)
-                else:
-                    neighbors = self.neighbors(node)
-                new_open_nodes.update(set(neighbors).difference(closure))
-                closure.update(neighbors)
-            open_nodes = new_open_nodes
-
-        private_nodes = self.nodes.difference(closure)
-        result = []
-        for node in private_nodes:
-            result.append(node)
-        return result
+        ids = self._ids
+        built_private_ids = set(ids[n] for n in built_private_nodes)
+        roots = [ids[n] for n in self.by_levels()[-1]]
+
+        def expand(node_id):
+            if node_id in built_private_ids:
+                return self._public_neighbors(node_id)
+            return self._neighbors[node_id]
+
+        closure = self._closure(roots, expand)
+        return [n for i, n in enumerate(self._nodes) if i not in closure]
 
     def non_dev_nodes(self, root):
         if not root.conanfile.scope.dev:
             # Optimization. This allow not to check it for most packages, which dev=False
             return None
-        open_nodes = set([root])
-        result = set()
-        expanded = set()
-        while open_nodes:
-            new_open_nodes = set()
-            for node in open_nodes:
-                neighbors = self.neighbors(node)
-                requires = node.conanfile.requires
-                for n in neighbors:
-                    requirement = requires[n.conan_ref.name]
-                    if not requirement.dev and n not in expanded:
-                        result.add(n.conan_ref.name)
-                        new_open_nodes.add(n)
-                        expanded.add(n)
-
-            open_nodes = new_open_nodes
-        return result
+        flags = self._edge_flags
+
+        def expand(node_id):
+            return [n for n in self._neighbors[node_id] if not flags[(node_id, n)] & DEV]
+
+        root_id = self._ids[root]
+        closure = self._closure(expand(root_id), expand)
+        return set(self._nodes[i].conan_ref.name for i in closure)
 
 
 class DepsBuilder(object):
@@ -289,6 +311,9 @@ class DepsBuilder(object):
         self._retriever = retriever
         self._output = output
         self._loader = loader
+        # Accumulated seconds of each phase of the last graph computation
+        self.timings = OrderedDict((phase, 0.0) for phase in ("fetch", "load", "configure",
+                                                              "propagate"))
 
     def get_graph_updates_info(self, deps_graph):
         """
@@ -303,6 +328,8 @@ class DepsBuilder(object):
         param conan_ref: ConanFileReference for installed conanfile or path to user one
                          might be None for user conanfile.py or .txt
         """
+        for phase in self.timings:
+            self.timings[phase] = 0.0
         dep_graph = DepsGraph()
         # compute the conanfile entry point for this dependency graph
         root_node = Node(conan_ref, conanfile)
@@ -316,7 +343,8 @@ class DepsBuilder(object):
         logger.debug("Deps-builder: Time to load deps %s" % (time.time() - t1))
         t1 = time.time()
         dep_graph.propagate_info()
-        logger.debug("Deps-builder: Propagate info %s" % (time.time() - t1))
+        self.timings["propagate"] = time.time() - t1
+        logger.debug("Deps-builder: Propagate info %s" % self.timings["propagate"])
         return dep_graph
 
     def _load_deps(self, node, down_reqs, dep_graph, public_deps, down_ref, down_options,
@@ -360,7 +388,7 @@ class DepsBuilder(object):
                                         "    To change it, override it in your base requirements"
                                         % (conanref, require.conan_reference,
                                            previous_node.conan_ref, previous_node.conan_ref))
-                dep_graph.add_edge(node, previous_node)
+                dep_graph.add_edge(node, previous_node, require.private, require.dev)
                 # RECURSION!
                 self._load_deps(previous_node, new_reqs, dep_graph, public_deps, conanref,
                                 new_options.copy(), new_loop_ancestors)
@@ -370,6 +398,7 @@ class DepsBuilder(object):
         requirement values, cause they can be overriden by downstream requires
         param settings: dict of settings values => {"os": "windows"}
         """
+        t1 = time.time()
         try:
             conanfile.requires.output = self._output
             if hasattr(conanfile, "config"):
@@ -396,18 +425,24 @@ class DepsBuilder(object):
             msg = format_conanfile_exception(str(conanref or "Conanfile"),
                                              "config, config_options or configure", e)
             raise ConanException(msg)
+        finally:
+            self.timings["configure"] += time.time() - t1
         return new_down_reqs, new_options
 
     def _create_new_node(self, current_node, dep_graph, requirement, public_deps, name_req):
         """ creates and adds a new node to the dependency graph
         """
+        t1 = time.time()
         conanfile_path = self._retriever.get_recipe(requirement.conan_reference)
+        t2 = time.time()
         output = ScopedOutput(str(requirement.conan_reference), self._output)
         dep_conanfile = self._loader.load_conan(conanfile_path, output)
+        self.timings["fetch"] += t2 - t1
+        self.timings["load"] += time.time() - t2
         if dep_conanfile:
             new_node = Node(requirement.conan_reference, dep_conanfile)
             dep_graph.add_node(new_node)
-            dep_graph.add_edge(current_node, new_node)
+            dep_graph.add_edge(current_node, new_node, requirement.private, requirement.dev)
             if not requirement.private:
                 public_deps[name_req] = new_node
             # RECURSION!
@@ -0,0 +1,129 @@
+""" Content addressed cache of the files downloaded by the recipes with tools.download, so
+the same upstream sources are downloaded once, whatever the reference, user or channel of
+the recipe that retrieves them
+"""
+import os
+import re
+
+from conans.util.env_reader import get_env
+from conans.util.files import copy_file, mkdir, _generic_algorithm_sum
+from conans.util.log import logger
+
+_HEX = re.compile(r"[0-9a-fA-F]+\Z")
+
+
+def get_download_cache():
+    """ The download cache is enabled defining CONAN_DOWNLOAD_CACHE, the folder of the cache,
+    that can be shared by different users conan folders. CONAN_DOWNLOAD_CACHE_SIZE is the
+    maximum size in MB, 10GB by default
+    """
+    folder = get_env("CONAN_DOWNLOAD_CACHE", None)
+    if not folder:
+        return None
+    max_size = get_env("CONAN_DOWNLOAD_CACHE_SIZE", 10240) * 1024 * 1024
+    return DownloadCache(folder, max_size)
+
+
+class DownloadCache(object):
+    """ Files are stored by their checksum, so the same file retrieved from different urls is
+    stored once. Downloads without a checksum are not cached, the contents of an url can
+    change and the cache could not detect it. The least recently used files are evicted
+    when the size limit is exceeded
+    """
+
+    def __init__(self, folder, max_size):
+        self._folder = folder
+        self._max_size = max_size
+
+    @staticmethod
+    def _key(checksums):
+        """ param checksums: {algorithm: signature}
+        return: the cache file name, None if there is no valid checksum
+        """
+        for algorithm in ("sha256", "sha1", "md5"):
+            signature = checksums.get(algorithm)
+            if signature:
+                if not _HEX.match(signature):  # It is a file name
+                    return None
+                return "%s-%s" % (algorithm, signature.lower())
+        return None
+
+    def download(self, url, filename, checksums, download):
+        """ retrieves url into filename from the cache, or calling download(url, filename)
+        and storing the result
+        param checksums: {algorithm: signature} of the file, can be empty, then it is just
+                         downloaded. download() must check them, so wrong files are never
+                         stored
+        """
+        key = self._key(checksums)
+        if key is None:
+            download(url, filename)
+            return
+        cached = os.path.join(self._folder, key)
+        if self._retrieve(cached, filename, checksums):
+            logger.debug("Download cache hit %s: %s" % (url, cached))
+            return
+
+        download(url, filename)
+        mkdir(self._folder)
+        # Other processes might be using the cache, the new file appears atomically
+        temp = "%s.%d.tmp" % (cached, os.getpid())
+        copy_file(filename, temp)
+        try:
+            os.rename(temp, cached)
+        except OSError:  # Windows, already stored by other process
+            os.remove(temp)
+        self._evict()
+
+    def _retrieve(self, cached, filename, checksums):
+        """ copies the cached file into filename and checks it. Corrupted entries are removed
+        return: False if the file is not cached, or it was not valid
+        """
+        if not os.path.isfile(cached):
+            return False
+        try:
+            os.utime(cached, None)  # Most recently used
+            copy_file(cached, filename)
+        except (IOError, OSError) as e:  # Evicted meanwhile by other process
+            logger.debug("Download cache entry %s not retrieved: %s" % (cached, str(e)))
+            self._remove(filename)
+            return False
+        for algorithm, signature in checksums.items():
+            if signature and _generic_algorithm_sum(filename, algorithm) != signature.lower():
+                logger.warn("Download cache entry %s corrupted, removing it" % cached)
+                self._remove(cached)
+                self._remove(filename)
+                return False
+        return True
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """ removes the least recently used files while the cache is over its size limit
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self._folder):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self._folder, name)
+            try:
+                st = os.stat(path)
+            except OSError:  # Removed by other process
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self._max_size:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
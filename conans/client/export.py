@@ -2,9 +2,8 @@
 to the local store, as an initial step before building or uploading to remotes
 """
 
-import shutil
 import os
-from conans.util.files import save, load, rmdir
+from conans.util.files import save, load, rmdir, mkdir, copy_files
 from conans.paths import CONAN_MANIFEST, CONANFILE, DIRTY_FILE
 from conans.errors import ConanException
 from conans.model.manifest import FileTreeManifest
@@ -18,10 +17,11 @@ def export_conanfile(output, paths, file_patterns, origin_folder, conan_ref, sho
 
     previous_digest = _init_export_folder(destination_folder)
 
-    _export(file_patterns, origin_folder, destination_folder, output)
+    files = _export(file_patterns, origin_folder, destination_folder, output)
 
-    digest = FileTreeManifest.create(destination_folder)
-    save(os.path.join(destination_folder, CONAN_MANIFEST), str(digest))
+    # The digest is computed from the origin files, the stored ones are not hashed again
+    digest = FileTreeManifest.create_from_files(files)
+    _update_export_folder(files, digest, previous_digest, destination_folder)
 
     if previous_digest and previous_digest.file_sums == digest.file_sums:
         digest = previous_digest
@@ -31,6 +31,7 @@ def export_conanfile(output, paths, file_patterns, origin_folder, conan_ref, sho
         output.success('A new %s version was exported' % CONANFILE)
         output.info('Folder: %s' % destination_folder)
         modified_recipe = True
+    save(os.path.join(destination_folder, CONAN_MANIFEST), str(digest))
 
     source = paths.source(conan_ref, short_paths)
     dirty = os.path.join(source, DIRTY_FILE)
@@ -54,21 +55,27 @@ def export_conanfile(output, paths, file_patterns, origin_folder, conan_ref, sho
 
 
 def _init_export_folder(destination_folder):
+    """ creates the export folder if necessary. The existing one is not removed, the
+    changes of the new export will be applied to it
+    return: the manifest of the stored export, None if it is not there
+    """
     previous_digest = None
     try:
-        if os.path.exists(destination_folder):
-            if os.path.exists(os.path.join(destination_folder, CONAN_MANIFEST)):
-                manifest_content = load(os.path.join(destination_folder, CONAN_MANIFEST))
-                previous_digest = FileTreeManifest.loads(manifest_content)
-            # Maybe here we want to invalidate cache
-            rmdir(destination_folder)
-        os.makedirs(destination_folder)
+        manifest_path = os.path.join(destination_folder, CONAN_MANIFEST)
+        if os.path.exists(manifest_path):
+            try:
+                previous_digest = FileTreeManifest.loads(load(manifest_path))
+            except Exception:  # Corrupted, the stored files cannot be trusted
+                rmdir(destination_folder)
+        mkdir(destination_folder)
     except Exception as e:
         raise ConanException("Unable to create folder %s\n%s" % (destination_folder, str(e)))
     return previous_digest
 
 
 def _export(file_patterns, origin_folder, destination_folder, output):
+    """ return: {relative name in the export folder: origin file} of the files to export
+    """
     file_patterns = file_patterns or []
     try:
         os.unlink(os.path.join(origin_folder, CONANFILE + 'c'))
@@ -76,9 +83,43 @@ def _export(file_patterns, origin_folder, destination_folder, output):
         pass
 
     copier = FileCopier(origin_folder, destination_folder)
+    files = {}
     for pattern in file_patterns:
-        copier(pattern)
+        for src, dst in copier.select(pattern):
+            files[os.path.relpath(dst, destination_folder).replace("\\", "/")] = src
     package_output = ScopedOutput("%s export" % output.scope, output)
     copier.report(package_output)
 
-    shutil.copy2(os.path.join(origin_folder, CONANFILE), destination_folder)
+    files[CONANFILE] = os.path.join(origin_folder, CONANFILE)
+    return files
+
+
+def _update_export_folder(files, digest, previous_digest, destination_folder):
+    """ applies to the export folder just the delta from its previous contents: the files
+    no longer exported are removed, and the new and modified ones are copied. The files of
+    the previous manifest with the same md5 and size are not copied again
+    """
+    previous_sums = previous_digest.file_sums if previous_digest else {}
+    for root, _, filenames in os.walk(destination_folder, topdown=False):
+        relative_path = os.path.relpath(root, destination_folder)
+        for f in filenames:
+            name = os.path.normpath(os.path.join(relative_path, f)).replace("\\", "/")
+            if name not in files and name != CONAN_MANIFEST:
+                os.remove(os.path.join(root, f))
+        if root != destination_folder and not os.listdir(root):
+            os.rmdir(root)
+
+    modified = []
+    for name, src in files.items():
+        dst = os.path.join(destination_folder, name)
+        md5 = digest.file_sums.get(name)
+        if md5 is None or md5 != previous_sums.get(name) or not _same_size(src, dst):
+            modified.append((src, dst))
+    copy_files(modified)
+
+
+def _same_size(src, dst):
+    try:
+        return os.path.getsize(src) == os.path.getsize(dst)
+    except OSError:
+        return False
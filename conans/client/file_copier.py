@@ -1,8 +1,22 @@
 import os
 import fnmatch
-import shutil
+import re
+import time
 from collections import defaultdict
 
+from conans.util.files import copy_files
+
+try:
+    scandir = os.scandir
+except AttributeError:
+    try:  # Python < 3.5 with the scandir backport installed
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+# Coarsest mtime resolution of the filesystems, in seconds (FAT)
+_MTIME_RESOLUTION = 2
+
 
 def report_copied_files(copied, output, warn=False):
     ext_files = defaultdict(list)
@@ -24,7 +38,8 @@ class FileCopier(object):
     imports: package folder -> user folder
     export: user folder -> store "export" folder
     """
-    def __init__(self, root_source_folder, root_destination_folder):
+    def __init__(self, root_source_folder, root_destination_folder, link=False,
+                 skip_unchanged=False):
         """
         Takes the base folders to copy resources src -> dst. These folders names
         will not be used in the relative names while copying
@@ -32,10 +47,17 @@ class FileCopier(object):
                                   store build folder
         param root_destination_folder: The base folder to copy things to, typicall the
                                        store package folder
+        param link: hard link the files instead of copying them when possible. Only for
+                    sources that are never modified, as the packages in the store
+        param skip_unchanged: do not copy again the files already in the destination with
+                              the same size and mtime
         """
         self._base_src = root_source_folder
         self._base_dst = root_destination_folder
+        self._link = link
+        self._skip_unchanged = skip_unchanged
         self._copied = []
+        self._listings = {}  # {src_folder: (walk_time, [(folder, mtime)], [files])}
 
     def report(self, output, warn=False):
         report_copied_files(self._copied, output, warn)
@@ -53,39 +75,142 @@ class FileCopier(object):
                          lib dir
         return: list of copied files
         """
+        files = self.select(pattern, dst, src, keep_path)
+        copy_files(files, self._link, self._skip_unchanged)
+        return [abs_dst_name for _, abs_dst_name in files]
+
+    def select(self, pattern, dst="", src="", keep_path=True):
+        """ same parameters as __call__, but the files are not copied
+        return: list of (src, dst) absolute names of the files that would be copied
+        """
         # Check for ../ patterns and allow them
         reldir = os.path.abspath(os.path.join(self._base_src, pattern))
         if self._base_src.startswith(os.path.dirname(reldir)):  # ../ relative dir
             self._base_src = os.path.dirname(reldir)
             pattern = os.path.basename(reldir)
 
-        copied_files = []
         src = os.path.join(self._base_src, src)
         dst = os.path.join(self._base_dst, dst)
-        for root, subfolders, files in os.walk(src, followlinks=True):
-            basename = os.path.basename(root)
-            # Skip git or svn subfolders
-            if basename in [".git", ".svn"]:
-                subfolders[:] = []
-                continue
-            if basename == "test_package":  # DO NOT export test_package/build folder
-                try:
-                    subfolders.remove("build")
-                except:
-                    pass
-
-            relative_path = os.path.relpath(root, src)
-            for f in files:
-                relative_name = os.path.normpath(os.path.join(relative_path, f))
-                if fnmatch.fnmatch(relative_name, pattern):
-                    abs_src_name = os.path.join(root, f)
-                    filename = relative_name if keep_path else f
-                    abs_dst_name = os.path.normpath(os.path.join(dst, filename))
-                    try:
-                        os.makedirs(os.path.dirname(abs_dst_name))
-                    except:
-                        pass
-                    shutil.copy2(abs_src_name, abs_dst_name)
-                    copied_files.append(abs_dst_name)
-                    self._copied.append(relative_name)
-        return copied_files
+        match = _compile(pattern)
+        files = []
+        for relative_name, normalized_name, abs_src_name in self._files(src):
+            if match(normalized_name):
+                filename = relative_name if keep_path else os.path.basename(relative_name)
+                abs_dst_name = os.path.normpath(os.path.join(dst, filename))
+                files.append((abs_src_name, abs_dst_name))
+                self._copied.append(relative_name)
+        return files
+
+    def scan(self, folder):
+        """ walks the folder, so the following copies from it or from any of its subfolders
+        reuse that listing instead of walking their trees again
+        """
+        self._files(folder)
+
+    def _files(self, src):
+        """ The files of the src folder, as [(relative_name, normcased name, absolute path)].
+        The tree is walked just once for all the patterns copied from the same folder, and
+        the listing is reused while the mtimes of its directories don't change (no file
+        has been added, removed or renamed)
+        """
+        src = os.path.normpath(src)
+        files = self._valid_listing(src)
+        if files is not None:
+            return files
+        # The listing of a scanned parent folder contains the files of src, unless src is
+        # in a folder skipped by the walk of the parent
+        parent, child = os.path.dirname(src), src
+        while parent != child:
+            files = self._valid_listing(parent)
+            if files is not None:
+                relative_src = os.path.relpath(src, parent)
+                if _skipped(relative_src):
+                    break
+                prefix = relative_src + os.sep
+                size = len(prefix)
+                return [(relative_name[size:], os.path.normcase(relative_name[size:]), abs_name)
+                        for relative_name, _, abs_name in files
+                        if relative_name.startswith(prefix)]
+            parent, child = os.path.dirname(parent), parent
+        walk_time = time.time()
+        folders, files = _walk(src)
+        self._listings[src] = walk_time, folders, files
+        return files
+
+    def _valid_listing(self, src):
+        """ the listing is valid if its folders have not been modified since the walk. A
+        folder modified just before the walk, within the mtime resolution, could be modified
+        again without changing its mtime, its listing is not reused
+        """
+        listing = self._listings.get(src)
+        if listing is not None:
+            walk_time, folders, files = listing
+            try:
+                if all(mtime < walk_time - _MTIME_RESOLUTION and os.stat(folder).st_mtime == mtime
+                       for folder, mtime in folders):
+                    return files
+            except OSError:
+                pass
+            del self._listings[src]
+        return None
+
+
+_compiled_patterns = {}
+
+
+def _compile(pattern):
+    """ returns the match function of a precompiled fnmatch pattern
+    """
+    try:
+        return _compiled_patterns[pattern]
+    except KeyError:
+        regex = re.compile(fnmatch.translate(os.path.normcase(pattern)))
+        _compiled_patterns[pattern] = regex.match
+        return regex.match
+
+
+def _skipped(relative_path):
+    """ if the relative path is in a folder that _walk() skips
+    """
+    names = relative_path.split(os.sep)
+    return any(name in (".git", ".svn") or
+               (name == "build" and i > 0 and names[i - 1] == "test_package")
+               for i, name in enumerate(names))
+
+
+def _walk(src):
+    """ walks the src folder, following links, and skipping git and svn folders and the
+    test_package/build folder, which must not be exported
+    return: ([(folder, mtime)], [(relative_name, normcased name, absolute path)])
+    """
+    folders = []
+    files = []
+    if os.path.basename(src) in (".git", ".svn") or not os.path.isdir(src):
+        return folders, files
+    pending = [("", src)]
+    while pending:
+        relative_path, folder = pending.pop()
+        try:
+            folders.append((folder, os.stat(folder).st_mtime))
+            entries = _scandir(folder)
+        except OSError:
+            continue
+        skip_build = os.path.basename(folder) == "test_package"
+        for name, is_dir in entries:
+            relative_name = os.path.join(relative_path, name) if relative_path else name
+            abs_name = os.path.join(folder, name)
+            if is_dir:
+                if name in (".git", ".svn") or (skip_build and name == "build"):
+                    continue
+                pending.append((relative_name, abs_name))
+            else:
+                files.append((relative_name, os.path.normcase(relative_name), abs_name))
+    return folders, files
+
+
+def _scandir(folder):
+    """ return [(name, is_dir)] of the folder entries, following links
+    """
+    if scandir is not None:
+        return [(entry.name, entry.is_dir()) for entry in scandir(folder)]
+    return [(name, os.path.isdir(os.path.join(folder, name))) for name in os.listdir(folder)]
@@ -0,0 +1,64 @@
+import json
+
+from conans.model.ref import ConanFileReference
+from conans.paths import package_exists
+
+
+class GraphExporter(object):
+    """ Exports the dependencies graph in a machine readable format: JSON lines, one record
+    per line, written as they are computed, so large graphs are never materialized as a
+    whole. Records, in this order:
+
+    {"type": "timings", "fetch": 0.1, "load": 0.2, "configure": 0.01, "propagate": 0.02}
+    {"type": "node", "id": 1, "reference": "Hello/0.1@lasote/stable", "package_id": "...",
+     "remote": "default", "binary": "cached", "update": 0}
+    {"type": "edge", "src": 0, "dst": 1, "private": false, "dev": false}
+
+    Nodes are written by levels, dependencies first. "binary" is "cached" if the package
+    binary is in the local cache, "missing" otherwise. "update" is only present if updates
+    were checked
+    """
+
+    def __init__(self, write, paths, registry):
+        """ param write: callable that receives every line of the export
+        """
+        self._write = write
+        self._paths = paths
+        self._registry = registry
+
+    def _record(self, record):
+        self._write(json.dumps(record, sort_keys=True))
+
+    def export(self, deps_graph, project_reference, timings, graph_updates_info=None):
+        timings_record = {"type": "timings"}
+        timings_record.update(timings)
+        self._record(timings_record)
+
+        ids = {node: node_id for node_id, node in deps_graph.node_ids()}
+        for level in deps_graph.by_levels():
+            for node in level:
+                self._record(self._node_record(ids[node], node, project_reference,
+                                               graph_updates_info))
+
+        for src, dst, private, dev in deps_graph.edges():
+            self._record({"type": "edge", "src": src, "dst": dst, "private": private,
+                          "dev": dev})
+
+    def _node_record(self, node_id, node, project_reference, graph_updates_info):
+        conan_ref, conanfile = node
+        record = {"type": "node", "id": node_id}
+        if not isinstance(conan_ref, ConanFileReference):
+            record["reference"] = project_reference
+            return record
+
+        package_reference = node.package_reference
+        remote = self._registry.get_ref(conan_ref)
+        short_paths = "check" if conanfile.short_paths else False
+        package_folder = self._paths.package(package_reference, short_paths)
+        record.update({"reference": str(conan_ref),
+                       "package_id": package_reference.package_id,
+                       "remote": remote.name if remote else None,
+                       "binary": "cached" if package_exists(package_folder) else "missing"})
+        if graph_updates_info:
+            record["update"] = graph_updates_info.get(conan_ref)
+        return record
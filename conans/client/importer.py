@@ -1,7 +1,8 @@
 import os
 import fnmatch
-from conans.model.ref import PackageReference
+from collections import defaultdict
 from conans.client.file_copier import FileCopier
+from conans.util.env_reader import get_env
 
 
 class FileImporter(object):
@@ -41,38 +42,66 @@ class FileImporter(object):
             conan_ref, conan_file = node
             if not conan_ref:
                 continue
-            package_id = conan_file.info.package_id()
-            package_reference = PackageReference(conan_ref, package_id)
+            package_reference = node.package_reference
             short_paths = "check" if conan_file.short_paths else False
             package_folders[conan_file.name] = self._paths.package(package_reference, short_paths)
         return package_folders
 
-    def _get_paths(self, conan_name_pattern):
-        """ returns all the base paths of the dependencies matching the
-        root_package pattern
+    def _get_copies(self):
+        """ return: [(pattern, dst, src, package_folder)], in the order of the requests and
+        the packages of each request sorted by name, so when several copies write the same
+        file, the last one wins
         """
-        result_paths = []
-        folders = self._get_folders()
-        for name, path in folders.items():
-            if fnmatch.fnmatch(name, conan_name_pattern):
-                result_paths.append(path)
-        return result_paths
+        folders = sorted(self._get_folders().items())
+        copies = []
+        for pattern, dst_folder, src_folder, conan_name_pattern in self._copies:
+            for name, package_folder in folders:
+                if fnmatch.fnmatch(name, conan_name_pattern):
+                    copies.append((pattern, dst_folder, src_folder, package_folder))
+        return copies
 
     def execute(self):
-        """ Execute the stored requested copies, using a FileCopier as helper
+        """ Execute the stored requested copies, using a FileCopier as helper. Every
+        package folder is walked once for all the copies from it, and the files already
+        imported and not changed are not copied again
         return: set of copied files
         """
         root_src_folder = self._paths.store
-        file_copier = FileCopier(root_src_folder, self._dst_folder)
+        # Packages in the store are never modified, they can be hard linked if requested
+        link = get_env("CONAN_IMPORTS_HARDLINK", False)
+        file_copier = FileCopier(root_src_folder, self._dst_folder, link=link,
+                                 skip_unchanged=True)
+        copies = self._get_copies()
+        package_src_folders = defaultdict(set)
+        for _, _, src_folder, package_folder in copies:
+            package_src_folders[package_folder].add(os.path.normpath(src_folder))
+        for package_folder, src_folders in package_src_folders.items():
+            if len(src_folders) > 1 and not any(os.path.isabs(src) for src in src_folders):
+                file_copier.scan(os.path.join(package_folder, _common_folder(src_folders)))
+
         copied_files = set()
-        for pattern, dst_folder, src_folder, conan_name_pattern in self._copies:
+        for pattern, dst_folder, src_folder, package_folder in copies:
             if os.path.isabs(dst_folder):
                 real_dst_folder = dst_folder
             else:
                 real_dst_folder = os.path.normpath(os.path.join(self._dst_folder, dst_folder))
-            matching_paths = self._get_paths(conan_name_pattern)
-            for matching_path in matching_paths:
-                real_src_folder = os.path.join(matching_path, src_folder)
-                files = file_copier(pattern, real_dst_folder, real_src_folder)
-                copied_files.update(files)
+            real_src_folder = os.path.join(package_folder, src_folder)
+            files = file_copier(pattern, real_dst_folder, real_src_folder)
+            copied_files.update(files)
         return copied_files
+
+
+def _common_folder(folders):
+    """ the deepest folder containing all the given relative folders
+    """
+    common = None
+    for folder in folders:
+        parts = [] if folder == "." else folder.split(os.sep)
+        if common is None:
+            common = parts
+        else:
+            index = 0
+            while index < min(len(common), len(parts)) and common[index] == parts[index]:
+                index += 1
+            common = common[:index]
+    return os.path.join(*common) if common else ""
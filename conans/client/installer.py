@@ -5,8 +5,7 @@ import fnmatch
 import shutil
 
 from conans.paths import CONANINFO, BUILD_INFO, package_exists, build_exists
-from conans.util.files import save, rmdir
-from conans.model.ref import PackageReference
+from conans.util.files import save
 from conans.util.log import logger
 from conans.errors import ConanException, format_conanfile_exception
 from conans.client.packager import create_package
@@ -16,6 +15,23 @@ from conans.client.output import ScopedOutput
 from conans.model.env_info import EnvInfo
 from conans.client.file_copier import report_copied_files
 from conans.client.source import config_source
+from conans.client.build_sync import sync_folder
+from conans.util.env_reader import get_env
+
+
+def _build_sync_mode():
+    """ CONAN_BUILD_SYNC defines how the sources are copied to the build folders:
+    not defined: the build folder is removed and all the sources copied for every build
+    "copy": the build folder is kept and only new or modified sources are copied
+    "link": same as "copy", but hard linking the sources. tools.replace_in_file, tools.patch
+            and save() replace the links they modify, other writers (the build) MUST NOT
+            modify the sources
+    """
+    mode = get_env("CONAN_BUILD_SYNC", "")
+    if mode not in ("", "copy", "link"):
+        raise ConanException("Invalid CONAN_BUILD_SYNC value '%s', "
+                             "possible values are 'copy' and 'link'" % mode)
+    return mode
 
 
 def init_package_info(deps_graph, paths):
@@ -26,8 +42,7 @@ def init_package_info(deps_graph, paths):
     for node in deps_graph.nodes:
         conan_ref, conan_file = node
         if conan_ref:
-            package_id = conan_file.info.package_id()
-            package_reference = PackageReference(conan_ref, package_id)
+            package_reference = node.package_reference
             package_folder = paths.package(package_reference, conan_file.short_paths)
             conan_file.package_folder = package_folder
             conan_file.cpp_info = CppInfo(package_folder)
@@ -71,8 +86,7 @@ class ConanInstaller(object):
                 continue
 
             if conan_ref:
-                package_id = conanfile.info.package_id()
-                package_reference = PackageReference(conan_ref, package_id)
+                package_reference = node.package_reference
                 build_forced = self._build_forced(conan_ref, build_mode, conanfile)
                 self._out.info("%s: Checking if package with private requirements "
                                "has pre-built binary" % str(conan_ref))
@@ -148,8 +162,8 @@ class ConanInstaller(object):
     def _build_node(self, conan_ref, conan_file, build_mode):
         # Compute conan_file package from local (already compiled) or from remote
         output = ScopedOutput(str(conan_ref), self._out)
-        package_id = conan_file.info.package_id()
-        package_reference = PackageReference(conan_ref, package_id)
+        package_reference = conan_file.info.package_reference(conan_ref)
+        package_id = package_reference.package_id
 
         conan_ref = package_reference.conan
         package_folder = self._paths.package(package_reference, conan_file.short_paths)
@@ -177,14 +191,16 @@ class ConanInstaller(object):
             if not force_build and not build_mode:
                 output.info("Building package from source as defined by build_policy='missing'")
             try:
-                rmdir(build_folder, conan_file.short_paths)
-                rmdir(package_folder)
+                if not _build_sync_mode():  # Synced build folders are reused
+                    self._paths.remove_folder(build_folder, conan_file.short_paths)
+                self._paths.remove_folder(package_folder)
             except Exception as e:
                 raise ConanException("%s\n\nCouldn't remove folder, might be busy or open\n"
                                      "Close any app using it, and retry" % str(e))
             if force_build:
                 output.warn('Forced build from source')
 
+            self._remote_proxy.get_recipe_sources(conan_ref)
             self._build_package(export_folder, src_folder, build_folder, package_folder,
                                 conan_file, output)
 
@@ -250,25 +266,33 @@ Package configuration:
         code
         """
         output.info('Building your package in %s' % build_folder)
-        if not build_exists(build_folder):
+
+        def check_max_path_len(src, files):
+            if platform.system() != "Windows":
+                return []
+            filtered_files = []
+            for the_file in files:
+                source_path = os.path.join(src, the_file)
+                # Without storage path, just relative
+                rel_path = os.path.relpath(source_path, src_folder)
+                dest_path = os.path.normpath(os.path.join(build_folder, rel_path))
+                # it is NOT that "/" is counted as "\\" so it counts double
+                # seems a bug in python, overflows paths near the limit of 260,
+                if len(dest_path) >= 249:
+                    filtered_files.append(the_file)
+                    output.warn("Filename too long, file excluded: %s" % dest_path)
+            return filtered_files
+
+        sync_mode = _build_sync_mode()
+        if sync_mode:
+            config_source(export_folder, src_folder, conan_file, output)
+            output.info('Syncing sources to build folder')
+            copied = sync_folder(src_folder, build_folder, link=(sync_mode == "link"),
+                                 ignore=check_max_path_len)
+            output.info('%d new or modified source files' % copied)
+        elif not build_exists(build_folder):
             config_source(export_folder, src_folder, conan_file, output)
             output.info('Copying sources to build folder')
-
-            def check_max_path_len(src, files):
-                if platform.system() != "Windows":
-                    return []
-                filtered_files = []
-                for the_file in files:
-                    source_path = os.path.join(src, the_file)
-                    # Without storage path, just relative
-                    rel_path = os.path.relpath(source_path, src_folder)
-                    dest_path = os.path.normpath(os.path.join(build_folder, rel_path))
-                    # it is NOT that "/" is counted as "\\" so it counts double
-                    # seems a bug in python, overflows paths near the limit of 260,
-                    if len(dest_path) >= 249:
-                        filtered_files.append(the_file)
-                        output.warn("Filename too long, file excluded: %s" % dest_path)
-                return filtered_files
             shutil.copytree(src_folder, build_folder, symlinks=True, ignore=check_max_path_len)
         os.chdir(build_folder)
         conan_file._conanfile_directory = build_folder
@@ -1,5 +1,7 @@
 import os
+import sys
 import time
+import six
 from collections import OrderedDict
 
 from conans.paths import (CONANFILE, CONANINFO, CONANFILE_TXT, BUILD_INFO, build_exists)
@@ -24,9 +26,8 @@ from conans.model.build_info import DepsCppInfo, CppInfo
 from conans.client import packager
 from conans.client.detect import detected_os
 from conans.client.package_copier import PackageCopier
-from conans.client.output import ScopedOutput
+from conans.client.output import ScopedOutput, ConanOutput
 from conans.client.proxy import ConanProxy
-from conans.client.remote_registry import RemoteRegistry
 from conans.client.file_copier import report_copied_files
 from conans.model.scope import Scopes
 from conans.client.client_cache import ClientCache
@@ -183,20 +184,37 @@ class ConanManager(object):
         conanfile.info.scope = self._current_scopes
         conanfile.cpp_info = CppInfo(current_path)
         conanfile.env_info = EnvInfo(current_path)
-        registry = RemoteRegistry(self._client_cache.registry, self._user_io.out)
+        registry = self._client_cache.remote_registry
         return (builder, deps_graph, project_reference, registry, conanfile,
                 remote_proxy, loader)
 
     def info(self, reference, current_path, remote=None, options=None, settings=None,
              info=None, filename=None, update=False, check_updates=False, scopes=None,
-             build_order=None):
+             build_order=None, json_output=None):
         """ Fetch and build all dependencies for the given reference
         @param reference: ConanFileReference or path to user space conanfile
         @param current_path: where the output files will be saved
         @param remote: install only from that remote
         @param options: list of tuples: [(optionname, optionvalue), (optionname, optionvalue)...]
         @param settings: list of tuples: [(settingname, settingvalue), (settingname, value)...]
+        @param json_output: True to export the graph as JSON lines to the output, or the
+                            path of the file to write them
         """
+        if json_output is True and not build_order:
+            # Only the JSON lines go to the output, so it can be parsed. The progress
+            # messages (retrieving recipes, warnings...) go to stderr
+            json_stream = self._user_io.out.redirect(sys.stderr)
+            try:
+                self._info(reference, current_path, remote, options, settings, info, filename,
+                           update, check_updates, scopes, build_order, json_stream)
+            finally:
+                self._user_io.out.redirect(json_stream)
+        else:
+            self._info(reference, current_path, remote, options, settings, info, filename,
+                       update, check_updates, scopes, build_order, json_output)
+
+    def _info(self, reference, current_path, remote, options, settings, info, filename,
+              update, check_updates, scopes, build_order, json_output):
         objects = self._get_graph(reference, current_path, remote, options, settings, filename,
                                   update, check_updates, None, scopes)
         (builder, deps_graph, project_reference, registry, _, _, _) = objects
@@ -209,10 +227,32 @@ class ConanManager(object):
             graph_updates_info = builder.get_graph_updates_info(deps_graph)
         else:
             graph_updates_info = {}
+        if json_output:
+            self._export_graph(json_output, current_path, builder, deps_graph,
+                               project_reference, registry, graph_updates_info)
+            return
         Printer(self._user_io.out).print_info(deps_graph, project_reference,
                                               info, registry, graph_updates_info,
                                               remote)
 
+    def _export_graph(self, json_output, current_path, builder, deps_graph, project_reference,
+                      registry, graph_updates_info):
+        """ param json_output: the stream or the file name to write the JSON lines
+        """
+        from conans.client.graph_exporter import GraphExporter
+
+        def export(write):
+            exporter = GraphExporter(write, self._client_cache, registry)
+            exporter.export(deps_graph, project_reference, builder.timings, graph_updates_info)
+
+        if not isinstance(json_output, six.string_types):
+            export(ConanOutput(json_output).writeln)
+        else:
+            json_path = os.path.join(current_path, json_output)
+            with open(json_path, "w") as json_file:
+                export(lambda line: json_file.write(line + "\n"))
+            self._user_io.out.info("Graph exported to %s" % json_path)
+
     def _read_profile(self, profile_name):
         if profile_name:
             try:
@@ -328,6 +368,8 @@ If not:
         conanfile = self._loader().load_conan(conan_file_path, output)
         src_folder = self._client_cache.source(reference, conanfile.short_paths)
         export_folder = self._client_cache.export(reference)
+        remote_proxy = ConanProxy(self._client_cache, self._user_io, self._remote_manager, None)
+        remote_proxy.get_recipe_sources(reference)
         config_source(export_folder, src_folder, conanfile, output, force)
 
     def package(self, reference, package_id):
@@ -485,6 +527,8 @@ If not:
         @param channel: Destination channel
         @param remote: install only from that remote
         """
+        remote_proxy = ConanProxy(self._client_cache, self._user_io, self._remote_manager, None)
+        remote_proxy.get_recipe_sources(reference)
         copier = PackageCopier(self._client_cache, self._user_io)
         if not package_ids:
             packages = self._client_cache.packages(reference)
@@ -57,10 +57,17 @@ class ManifestManager(object):
                                  "some file hash doesn't match manifest"
                                  % (str(reference)))
 
-    def check_recipe(self, conan_reference, remote):
+    def check_recipe(self, conan_reference, remote, deferred=()):
+        """ deferred: exported files whose retrieval was deferred, they are checked when
+        retrieved
+        """
         manifests = self._client_cache.conan_manifests(conan_reference)
         read_manifest, expected_manifest = manifests
         remote = "local cache" if not remote else "%s:%s" % (remote.name, remote.url)
+        if read_manifest is not None:
+            for name in set(deferred) - set(expected_manifest.file_sums):
+                if name in read_manifest.file_sums:
+                    expected_manifest.file_sums[name] = read_manifest.file_sums[name]
         self._match_manifests(read_manifest, expected_manifest, conan_reference)
 
         path = self._paths.digestfile_conanfile(conan_reference)
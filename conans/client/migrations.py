@@ -3,13 +3,13 @@ from conans.util.files import load, save
 from conans.model.version import Version
 import os
 from conans.client.conf import default_settings_yml
+from conans.client.remote_registry import RemoteRegistry
 
 
 class ClientMigrator(Migrator):
 
-    def __init__(self, client_cache, current_version, out, manager):
+    def __init__(self, client_cache, current_version, out):
         self.client_cache = client_cache
-        self.manager = manager
         super(ClientMigrator, self).__init__(client_cache.conan_folder, client_cache.store,
                                              current_version, out)
 
@@ -60,3 +60,15 @@ compiler:
 build_type: [None, Debug, Release]
 """
             self._update_settings_yml(old_settings)
+
+        if old_version < Version("0.15"):
+            self._migrate_registry_refs()
+
+    def _migrate_registry_refs(self):
+        if not os.path.exists(self.client_cache.registry):
+            return
+        self.out.warn("Migration: Moving the remote registry references to %s"
+                      % self.client_cache.registry_db)
+        registry = RemoteRegistry(self.client_cache.registry, self.out,
+                                  self.client_cache.registry_db)
+        registry.migrate_refs()
@@ -46,6 +46,12 @@ class ConanOutput(object):
         self._color = color
         self.werror_active = False
 
+    def redirect(self, stream):
+        """ changes the stream written from now on, returning the previous one
+        """
+        previous, self._stream = self._stream, stream
+        return previous
+
     def is_terminal(self):
         return hasattr(self._stream, "isatty") and self._stream.isatty()
 
@@ -1,5 +1,4 @@
 from conans.client.output import Color
-from conans.model.ref import PackageReference
 from conans.model.ref import ConanFileReference
 from collections import OrderedDict
 
@@ -32,11 +31,9 @@ class Printer(object):
             self._out.writeln("    %s %s" % (repr(ref), from_text), Color.BRIGHT_CYAN)
         self._out.writeln("Packages", Color.BRIGHT_YELLOW)
         for node in sorted(deps_graph.nodes):
-            ref, conanfile = node
-            if not ref:
+            if not node.conan_ref:
                 continue
-            ref = PackageReference(ref, conanfile.info.package_id())
-            self._out.writeln("    %s" % repr(ref), Color.BRIGHT_CYAN)
+            self._out.writeln("    %s" % repr(node.package_reference), Color.BRIGHT_CYAN)
         self._out.writeln("")
 
     def print_info(self, deps_graph, project_reference, _info, registry, graph_updates_info=None,
@@ -1,12 +1,28 @@
+import os
 from conans.client.output import ScopedOutput
-from conans.util.files import path_exists, rmdir
+from conans.util.files import path_exists, rmdir, save, load
+from conans.util.env_reader import get_env
 from conans.model.ref import PackageReference
 from conans.errors import (ConanException, ConanConnectionError, ConanOutdatedClient,
                            NotFoundException)
-from conans.client.remote_registry import RemoteRegistry
 from conans.util.log import logger
 from conans.paths import package_exists, CONANFILE
 from conans.client.loader import ConanFileLoader
+from contextlib import contextmanager
+from conans.util.locks import acquire_lock
+
+
+@contextmanager
+def _retrieval_lock(lock_path, output):
+    """ Interprocess lock, so only one process downloads the same recipe or package """
+    lock = acquire_lock(lock_path, blocking=False)
+    if lock is None:
+        output.info("Waiting for other process retrieving it...")
+        lock = acquire_lock(lock_path)
+    try:
+        yield
+    finally:
+        lock.release()
 
 
 class ConanProxy(object):
@@ -19,7 +35,7 @@ class ConanProxy(object):
         self._client_cache = client_cache
         self._out = user_io.out
         self._remote_manager = remote_manager
-        self._registry = RemoteRegistry(self._client_cache.registry, self._out)
+        self._registry = self._client_cache.remote_registry
         self._remote_name = remote_name
         self._update = update
         self._check_updates = check_updates or update  # Update forces check
@@ -36,6 +52,15 @@ class ConanProxy(object):
         output = ScopedOutput(str(package_reference.conan), self._out)
         package_folder = self._client_cache.package(package_reference, short_paths=short_paths)
 
+        # Concurrent processes wait for the first one retrieving it, and then reuse it
+        with _retrieval_lock(self._client_cache.package_lock(package_reference), output):
+            installed = self._get_package(package_reference, package_folder, force_build,
+                                          output)
+
+        self.handle_package_manifest(package_reference, installed)
+        return installed
+
+    def _get_package(self, package_reference, package_folder, force_build, output):
         # Check current package status
         if package_exists(package_folder):
             if self._check_updates:
@@ -63,8 +88,6 @@ class ConanProxy(object):
             else:
                 installed = self._retrieve_remote_package(package_reference, package_folder,
                                                           output)
-
-        self.handle_package_manifest(package_reference, installed)
         return installed
 
     def handle_package_manifest(self, package_reference, installed):
@@ -82,55 +105,125 @@ class ConanProxy(object):
             rmdir(self._client_cache.source(conan_reference), True)
             current_remote, _ = self._get_remote(conan_reference)
             output.info("Retrieving from remote '%s'..." % current_remote.name)
-            self._remote_manager.get_recipe(conan_reference, export_path, current_remote)
+            self._get_recipe(conan_reference, export_path, current_remote)
             if self._update:
                 output.info("Updated!")
             else:
                 output.info("Installed!")
 
-        # check if it is in disk
+        # check if it is in disk, or wait for other process retrieving it
         conanfile_path = self._client_cache.conanfile(conan_reference)
-        path_exist = path_exists(conanfile_path, self._client_cache.store)
-
-        if path_exist:
-            if self._check_updates:
-                ret = self.update_available(conan_reference)
-                if ret != 0:  # Found and not equal
-                    remote, ref_remote = self._get_remote(conan_reference)
-                    if ret == 1:
-                        if not self._update:
-                            if remote != ref_remote:  # Forced new remote
-                                output.warn("There is a new conanfile in '%s' remote. "
-                                            "Execute 'install -u -r %s' to update it."
-                                            % (remote.name, remote.name))
+        with _retrieval_lock(self._client_cache.recipe_lock(conan_reference), output):
+            path_exist = path_exists(conanfile_path, self._client_cache.store)
+            if path_exist:
+                if self._check_updates:
+                    ret = self.update_available(conan_reference)
+                    if ret != 0:  # Found and not equal
+                        remote, ref_remote = self._get_remote(conan_reference)
+                        if ret == 1:
+                            if not self._update:
+                                if remote != ref_remote:  # Forced new remote
+                                    output.warn("There is a new conanfile in '%s' remote. "
+                                                "Execute 'install -u -r %s' to update it."
+                                                % (remote.name, remote.name))
+                                else:
+                                    output.warn("There is a new conanfile in '%s' remote. "
+                                                "Execute 'install -u' to update it."
+                                                % remote.name)
+                                output.warn("Refused to install!")
                             else:
-                                output.warn("There is a new conanfile in '%s' remote. "
-                                            "Execute 'install -u' to update it."
-                                            % remote.name)
-                            output.warn("Refused to install!")
-                        else:
-                            if remote != ref_remote:
-                                # Delete packages, could be non coherent with new remote
-                                rmdir(self._client_cache.packages(conan_reference))
-                            _refresh()
-                    elif ret == -1:
-                        if not self._update:
-                            output.info("Current conanfile is newer "
-                                        "than %s's one" % remote.name)
-                        else:
-                            output.error("Current conanfile is newer than %s's one. "
-                                         "Run 'conan remove %s' and run install again "
-                                         "to replace it." % (remote.name, conan_reference))
+                                if remote != ref_remote:
+                                    # Delete packages, could be non coherent with new remote
+                                    rmdir(self._client_cache.packages(conan_reference))
+                                _refresh()
+                        elif ret == -1:
+                            if not self._update:
+                                output.info("Current conanfile is newer "
+                                            "than %s's one" % remote.name)
+                            else:
+                                output.error("Current conanfile is newer than %s's one. "
+                                             "Run 'conan remove %s' and run install again "
+                                             "to replace it." % (remote.name, conan_reference))
 
-        else:
-            self._retrieve_recipe(conan_reference, output)
+            else:
+                self._retrieve_recipe(conan_reference, output)
 
         if self._manifest_manager:
             remote = self._registry.get_ref(conan_reference)
-            self._manifest_manager.check_recipe(conan_reference, remote)
+            deferred = self._deferred_exports(conan_reference)
+            self._manifest_manager.check_recipe(conan_reference, remote, deferred)
 
         return conanfile_path
 
+    def get_recipe_sources(self, conan_reference):
+        """ With CONAN_LAZY_EXPORTS, the exported files of the recipes are not retrieved with
+        them, only if the packages have to be built from sources, or the recipe is uploaded or
+        copied. Retrieves them if there are files in the recipe manifest missing in the local cache
+        """
+        manifest_path = self._client_cache.digestfile_conanfile(conan_reference)
+        if not path_exists(manifest_path, self._client_cache.store):
+            return
+
+        if not self._missing_exports(conan_reference):
+            return
+        output = ScopedOutput(str(conan_reference), self._out)
+        with _retrieval_lock(self._client_cache.recipe_lock(conan_reference), output):
+            if not self._missing_exports(conan_reference):  # Retrieved by other process
+                return
+            remote = self._registry.get_ref(conan_reference)
+            if not remote:
+                raise ConanException("%s exported files are missing, and the recipe doesn't "
+                                     "have a remote to retrieve them" % str(conan_reference))
+            output.info("Retrieving exported files from remote '%s'..." % remote.name)
+            export_path = self._client_cache.export(conan_reference)
+            self._remote_manager.get_recipe_sources(conan_reference, export_path, remote)
+            self._save_deferred_exports(conan_reference, None)
+
+    def _get_recipe(self, conan_reference, export_path, remote):
+        """ retrieves the recipe. With CONAN_LAZY_EXPORTS, without its exported files, unless
+        they contain python modules, as the recipe can import them and they are needed to load it
+        """
+        if not get_env("CONAN_LAZY_EXPORTS", False):
+            result = self._remote_manager.get_recipe(conan_reference, export_path, remote)
+            self._save_deferred_exports(conan_reference, None)
+            return result
+
+        result = self._remote_manager.get_recipe(conan_reference, export_path, remote,
+                                                 exports=False)
+        missing = self._missing_exports(conan_reference)
+        if any(name.endswith(".py") for name in missing):
+            self._remote_manager.get_recipe_sources(conan_reference, export_path, remote)
+            missing = None
+        self._save_deferred_exports(conan_reference, missing)
+        return result
+
+    def _deferred_exports(self, conan_reference):
+        """ the exported files whose retrieval was deferred, the manifest checks them
+        when they are retrieved
+        """
+        path = self._client_cache.exports_pending(conan_reference)
+        if not os.path.exists(path):
+            return set()
+        return set(load(path).splitlines())
+
+    def _save_deferred_exports(self, conan_reference, names):
+        path = self._client_cache.exports_pending(conan_reference)
+        if names:
+            save(path, "\n".join(sorted(names)))
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def _missing_exports(self, conan_reference):
+        """ the files of the recipe manifest not in the export folder
+        """
+        try:
+            manifest = self._client_cache.load_manifest(conan_reference)
+        except Exception:  # Corrupted, it will be reported by the command using it
+            return set()
+        exported = set(name.replace("\\", "/")
+                       for name in self._client_cache.export_paths(conan_reference))
+        return set(manifest.file_sums) - exported
+
     def update_available(self, conan_reference):
         """Returns 0 if the conanfiles are equal, 1 if there is an update and -1 if
         the local is newer than the remote"""
@@ -154,7 +247,7 @@ class ConanProxy(object):
         def _retrieve_from_remote(remote):
             output.info("Trying with '%s'..." % remote.name)
             export_path = self._client_cache.export(conan_reference)
-            result = self._remote_manager.get_recipe(conan_reference, export_path, remote)
+            result = self._get_recipe(conan_reference, export_path, remote)
             self._registry.set_ref(conan_reference, remote)
             return result
 
@@ -190,6 +283,7 @@ class ConanProxy(object):
         """
         remote, ref_remote = self._get_remote(conan_reference)
 
+        self.get_recipe_sources(conan_reference)
         result = self._remote_manager.upload_conan(conan_reference, remote)
         if not ref_remote:
             self._registry.set_ref(conan_reference, remote)
@@ -264,7 +358,9 @@ class ConanProxy(object):
         assert(isinstance(package_ids, list))
         remote, _ = self._get_remote(reference)
         export_path = self._client_cache.export(reference)
+        rmdir(export_path)  # The downloads append to the existing files
         self._remote_manager.get_recipe(reference, export_path, remote)
+        self._save_deferred_exports(reference, None)
         conanfile_path = self._client_cache.conanfile(reference)
         loader = ConanFileLoader(None, None, None, None)
         conanfile = loader.load_class(conanfile_path)
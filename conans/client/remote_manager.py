@@ -1,3 +1,4 @@
+import gzip
 import os
 import shutil
 import tarfile
@@ -7,11 +8,11 @@ import traceback
 from requests.exceptions import ConnectionError
 
 from conans.errors import ConanException, ConanConnectionError
-from conans.util.files import tar_extract, rmdir, relative_dirs
+from conans.util.env_reader import get_env
+from conans.util.files import tar_extract, rmdir, load
+from conans.model.manifest import FileTreeManifest
 from conans.util.log import logger
 from conans.paths import PACKAGE_TGZ_NAME, CONANINFO, CONAN_MANIFEST, CONANFILE, EXPORT_TGZ_NAME
-from conans.util.files import gzopen_without_timestamps
-from conans.util.files import touch
 
 
 class RemoteManager(object):
@@ -87,21 +88,44 @@ class RemoteManager(object):
         returns (ConanDigest, remote_name)"""
         return self._call_remote(remote, "get_package_digest", package_reference)
 
-    def get_recipe(self, conan_reference, dest_folder, remote):
+    def get_recipe(self, conan_reference, dest_folder, remote, exports=True):
         """
         Read the conans from remotes
         Will iterate the remotes to find the conans unless remote was specified
+        With exports=False the exported files tgz is not downloaded, it is only necessary to
+        build the packages from sources, get_recipe_sources() retrieves it
 
         returns (dict relative_filepath:abs_path , remote_name)"""
-        zipped_files = self._call_remote(remote, "get_recipe", conan_reference, dest_folder)
-        files = unzip_and_get_files(zipped_files, dest_folder, EXPORT_TGZ_NAME)
+        def filter_function(urls):
+            if exports:
+                return urls
+            return {name: url for name, url in urls.items() if name != EXPORT_TGZ_NAME}
+
+        zipped_files = self._call_remote(remote, "get_recipe", conan_reference, dest_folder,
+                                         filter_function)
+        files = unzip_and_get_files(zipped_files, dest_folder, EXPORT_TGZ_NAME,
+                                    _extraction_mtime(dest_folder))
         # Make sure that the source dir is deleted
         rmdir(self._client_cache.source(conan_reference), True)
-        for dirname, _, filenames in os.walk(dest_folder):
-            for fname in filenames:
-                touch(os.path.join(dirname, fname))
-#       TODO: Download only the CONANFILE file and only download the rest of files
-#       in install if needed (not found remote package)
+        return files
+
+    def get_recipe_sources(self, conan_reference, export_folder, remote):
+        """ Retrieves the exported files of a recipe previously retrieved with get_recipe(),
+        and checks them against the recipe manifest
+
+        returns (dict relative_filepath:abs_path , remote_name)"""
+        def filter_function(urls):
+            return {name: url for name, url in urls.items() if name == EXPORT_TGZ_NAME}
+
+        zipped_files = self._call_remote(remote, "get_recipe", conan_reference, export_folder,
+                                         filter_function)
+        files = unzip_and_get_files(zipped_files, export_folder, EXPORT_TGZ_NAME,
+                                    _extraction_mtime(export_folder))
+
+        read_manifest, expected_manifest = self._client_cache.conan_manifests(conan_reference)
+        if read_manifest is None or read_manifest.file_sums != expected_manifest.file_sums:
+            raise ConanException("%s exported files retrieved from '%s' don't match the "
+                                 "recipe manifest" % (str(conan_reference), remote.name))
         return files
 
     def get_package(self, package_reference, dest_folder, remote):
@@ -111,12 +135,8 @@ class RemoteManager(object):
 
         returns (dict relative_filepath:abs_path , remote_name)"""
         zipped_files = self._call_remote(remote, "get_package", package_reference, dest_folder)
-        files = unzip_and_get_files(zipped_files, dest_folder, PACKAGE_TGZ_NAME)
-        # Issue #214 https://github.com/conan-io/conan/issues/214
-        for dirname, _, filenames in os.walk(dest_folder):
-            for fname in filenames:
-                touch(os.path.join(dirname, fname))
-
+        files = unzip_and_get_files(zipped_files, dest_folder, PACKAGE_TGZ_NAME,
+                                    _extraction_mtime(dest_folder))
         return files
 
     def search(self, remote, pattern=None, ignorecase=True):
@@ -184,28 +204,60 @@ def compress_export_files(files, export_base_path, output):
     return
 
 
+class _BufferedWriter(object):
+    """ groups the small writes of a TarFile (header, contents chunks and padding of every
+    member) into writes of about buffer_size bytes, so the gzip compressor is called for big
+    blocks of data instead of for every one of them
+    """
+    def __init__(self, fileobj, buffer_size=1024 * 1024):
+        self._fileobj = fileobj
+        self._buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+        self._offset = 0
+
+    def write(self, data):
+        self._buffer.append(data)
+        self._buffered += len(data)
+        self._offset += len(data)
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        if self._buffer:
+            self._fileobj.write(b"".join(self._buffer))
+            del self._buffer[:]
+            self._buffered = 0
+
+
 def compress_files(files, name, excluded, dest_dir):
     """Compress the package and returns the new dict (name => content) of files,
-    only with the conanXX files and the compressed file"""
+    only with the conanXX files and the compressed file.
+    The members are written sorted by name and without times, so the same files always
+    produce the same tgz"""
 
-    # FIXME, better write to disk sequentially and not keep tgz contents in memory
     tgz_path = os.path.join(dest_dir, name)
     with open(tgz_path, "wb") as tgz_handle:
-        # tgz_contents = BytesIO()
-        tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
-
-        def addfile(name, abs_path, tar):
-            info = tarfile.TarInfo(name=name)
-            info.size = os.stat(abs_path).st_size
-            info.mode = os.stat(abs_path).st_mode
+        # Same as gzopen_without_timestamps(), but buffering the writes to the gzip file
+        gzip_file = gzip.GzipFile(name, "w", 9, tgz_handle, mtime=0)
+        buffered = _BufferedWriter(gzip_file)
+        tgz = tarfile.TarFile.taropen(name, "w", buffered)
+        for filename, abs_path in sorted(files.items()):
+            if filename in excluded:
+                continue
+            st = os.stat(abs_path)
+            info = tarfile.TarInfo(name=filename)
+            info.size = st.st_size
+            info.mode = st.st_mode
             with open(abs_path, 'rb') as file_handler:
-                tar.addfile(tarinfo=info, fileobj=file_handler)
-
-        for filename, abs_path in files.items():
-            if filename not in excluded:
-                addfile(filename, abs_path, tgz)
-
+                tgz.addfile(tarinfo=info, fileobj=file_handler)
         tgz.close()
+        buffered.flush()
+        gzip_file.close()
+
         ret = {}
         for e in excluded:
             if e in files:
@@ -216,22 +268,40 @@ def compress_files(files, name, excluded, dest_dir):
     return ret
 
 
-def unzip_and_get_files(files, destination_dir, tgz_name):
+def _extraction_mtime(folder):
+    """ The extracted files get the current time, as if they were just built, so build systems
+    do not consider them older than the consumer files depending on them.
+    Issue #214 https://github.com/conan-io/conan/issues/214
+    With CONAN_PRESERVE_MTIMES they get the time the recipe or package was created, stored
+    in its manifest, as the tgz files do not store the times of the files
+    """
+    if get_env("CONAN_PRESERVE_MTIMES", False):
+        try:
+            return FileTreeManifest.loads(load(os.path.join(folder, CONAN_MANIFEST))).time
+        except Exception:
+            pass
+    return time.time()
+
+
+def unzip_and_get_files(files, destination_dir, tgz_name, mtime=None):
     '''Moves all files from package_files, {relative_name: tmp_abs_path}
-    to destination_dir, unzipping the "tgz_name" if found'''
+    to destination_dir, unzipping the "tgz_name" if found
+    param mtime: timestamp of the extracted files, the stored in the tgz if None
+    return: list of the relative names of the retrieved files'''
 
     tgz_file = files.pop(tgz_name, None)
+    retrieved = list(files)
     if tgz_file:
-        uncompress_file(tgz_file, destination_dir)
+        retrieved.extend(uncompress_file(tgz_file, destination_dir, mtime))
         os.remove(tgz_file)
 
-    return relative_dirs(destination_dir)
+    return retrieved
 
 
-def uncompress_file(src_path, dest_folder):
+def uncompress_file(src_path, dest_folder, mtime=None):
     try:
         with open(src_path, 'rb') as file_handler:
-            tar_extract(file_handler, dest_folder)
+            return tar_extract(file_handler, dest_folder, mtime)
     except Exception as e:
         error_msg = "Error while downloading/extracting files to %s\n%s\n" % (dest_folder, str(e))
         # try to remove the files
@@ -2,7 +2,9 @@ import os
 from conans.errors import ConanException
 from conans.util.files import load, save
 from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
 import fasteners
+from conans.client.store.registrydb import RegistryDB, REGISTRY_DB
 
 
 default_remotes = """conan.io https://server.conan.io
@@ -14,10 +16,28 @@ Remote = namedtuple("Remote", "name url")
 class RemoteRegistry(object):
     """ conan_ref: remote
     remote is (name, url)
+
+    Remotes are stored in the registry text file, parsed once and kept in memory (it is
+    only read again if it is modified (mtime) by another process). The references remotes,
+    that can be hundreds of thousands, are stored in the RegistryDB sqlite database, in
+    refs_db file. set_ref() calls, very frequent while installing, are kept pending and
+    stored all together in flush(), called at the end of the command.
     """
-    def __init__(self, filename, output):
+    def __init__(self, filename, output, refs_db=None):
         self._filename = filename
         self._output = output
+        self._lock_file = filename + ".lock"
+        self._refs_db_file = refs_db or os.path.join(os.path.dirname(filename), REGISTRY_DB)
+        self._refs_db = None
+        self._stat = None  # (mtime, size) of the file when parsed
+        self._remotes = None
+        self._pending_refs = {}  # {str(conan_reference): remote_name} not stored yet
+
+    @property
+    def _db(self):
+        if self._refs_db is None:
+            self._refs_db = RegistryDB(self._refs_db_file)
+        return self._refs_db
 
     def _parse(self, contents):
         remotes = OrderedDict()
@@ -46,18 +66,80 @@ class RemoteRegistry(object):
         text = os.linesep.join(lines)
         return text
 
-    def _load(self):
+    def _file_stat(self):
         try:
-            contents = load(self._filename)
-        except:
-            self._output.warn("Remotes registry file missing, creating default one in %s"
-                              % self._filename)
-            contents = default_remotes
-            save(self._filename, contents)
-        return self._parse(contents)
+            st = os.stat(self._filename)
+        except OSError:
+            return None
+        return st.st_mtime, st.st_size
+
+    def _read(self):
+        """ Parses the file if changed since last read. Returns the cached remotes.
+        Lock must be held"""
+        stat = self._file_stat()
+        if stat is None or stat != self._stat:
+            try:
+                contents = load(self._filename)
+            except:
+                self._output.warn("Remotes registry file missing, creating default one in %s"
+                                  % self._filename)
+                contents = default_remotes
+                save(self._filename, contents)
+                stat = self._file_stat()
+            remotes, refs = self._parse(contents)
+            if refs:
+                # Old format (or written by an old client), references go to the database
+                self._db.set_refs_remotes(refs)
+                self._save(remotes)
+            else:
+                self._remotes = remotes
+                self._stat = stat
+        return self._remotes
 
-    def _save(self, remotes, refs):
-        save(self._filename, self._to_string(remotes, refs))
+    def _load(self):
+        """ For read-only accesses, the lock is only needed when the file has to be read """
+        if self._remotes is not None and self._file_stat() == self._stat:
+            return self._remotes
+        with fasteners.InterProcessLock(self._lock_file):
+            return self._read()
+
+    def _save(self, remotes):
+        """ Atomic write, readers never see a partial file. Lock must be held """
+        tmp_filename = self._filename + ".tmp"
+        save(tmp_filename, self._to_string(remotes, {}))
+        try:
+            os.rename(tmp_filename, self._filename)
+        except OSError:  # Windows does not replace existing files
+            os.remove(self._filename)
+            os.rename(tmp_filename, self._filename)
+        self._remotes = remotes
+        self._stat = self._file_stat()
+
+    @contextmanager
+    def _modify(self):
+        """ Locked read-modify-write of a fresh copy of the remotes. The block can raise
+        to cancel the modification """
+        with fasteners.InterProcessLock(self._lock_file):
+            remotes = OrderedDict(self._read())
+            yield remotes
+            self._save(remotes)
+
+    def flush(self):
+        """ Stores the pending references, if any, in a single transaction """
+        if self._pending_refs:
+            self._db.set_refs_remotes(self._pending_refs)
+            self._pending_refs = {}
+
+    def migrate_refs(self):
+        """ Moves the references in the registry file (old format) to the database """
+        with fasteners.InterProcessLock(self._lock_file):
+            self._stat = None
+            self._read()
+
+    def export(self, filename):
+        """ Saves remotes and references in the registry text format of previous versions """
+        refs = self.refs
+        save(filename, self._to_string(self._load(), refs))
 
     @property
     def default_remote(self):
@@ -68,97 +150,90 @@ class RemoteRegistry(object):
 
     @property
     def remotes(self):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            remotes, _ = self._load()
-            return [Remote(ref, remote) for ref, remote in remotes.items()]
+        remotes = self._load()
+        return [Remote(ref, remote) for ref, remote in remotes.items()]
 
     @property
     def refs(self):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            _, refs = self._load()
-            return refs
+        self._load()  # Old format refs moved to the database
+        refs = self._db.get_refs_remotes()
+        refs.update(self._pending_refs)
+        return refs
 
     def remote(self, name):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            remotes, _ = self._load()
-            try:
-                return Remote(name, remotes[name])
-            except KeyError:
-                raise ConanException("No remote '%s' defined in remotes in file %s"
-                                     % (name, self._filename))
+        remotes = self._load()
+        try:
+            return Remote(name, remotes[name])
+        except KeyError:
+            raise ConanException("No remote '%s' defined in remotes in file %s"
+                                 % (name, self._filename))
+
+    def _get_ref_remote(self, conan_reference):
+        try:
+            return self._pending_refs[conan_reference]
+        except KeyError:
+            return self._db.get_ref_remote(conan_reference)
 
     def get_ref(self, conan_reference):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            remotes, refs = self._load()
-            remote_name = refs.get(str(conan_reference))
-            try:
-                return Remote(remote_name, remotes[remote_name])
-            except:
-                return None
+        remotes = self._load()
+        remote_name = self._get_ref_remote(str(conan_reference))
+        try:
+            return Remote(remote_name, remotes[remote_name])
+        except:
+            return None
 
     def remove_ref(self, conan_reference, quiet=False):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            conan_reference = str(conan_reference)
-            remotes, refs = self._load()
-            try:
-                del refs[conan_reference]
-                self._save(remotes, refs)
-            except:
-                if not quiet:
-                    self._output.warn("Couldn't delete '%s' from remote registry"
-                                      % conan_reference)
+        conan_reference = str(conan_reference)
+        self._load()
+        pending = self._pending_refs.pop(conan_reference, None)
+        if not self._db.remove_ref_remote(conan_reference) and pending is None and not quiet:
+            self._output.warn("Couldn't delete '%s' from remote registry"
+                              % conan_reference)
 
     def set_ref(self, conan_reference, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            conan_reference = str(conan_reference)
-            remotes, refs = self._load()
-            refs[conan_reference] = remote.name
-            self._save(remotes, refs)
+        """ Delayed until flush() """
+        conan_reference = str(conan_reference)
+        self._load()
+        if self._get_ref_remote(conan_reference) != remote.name:
+            self._pending_refs[conan_reference] = remote.name
 
     def add_ref(self, conan_reference, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            conan_reference = str(conan_reference)
-            remotes, refs = self._load()
-            if conan_reference in refs:
-                raise ConanException("%s already exists. Use update" % conan_reference)
-            if remote not in remotes:
-                raise ConanException("%s not in remotes" % remote)
-            refs[conan_reference] = remote
-            self._save(remotes, refs)
+        conan_reference = str(conan_reference)
+        remotes = self._load()
+        if self._get_ref_remote(conan_reference) is not None:
+            raise ConanException("%s already exists. Use update" % conan_reference)
+        if remote not in remotes:
+            raise ConanException("%s not in remotes" % remote)
+        self._db.set_refs_remotes({conan_reference: remote})
 
     def update_ref(self, conan_reference, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            conan_reference = str(conan_reference)
-            remotes, refs = self._load()
-            if conan_reference not in refs:
-                raise ConanException("%s does not exist. Use add" % conan_reference)
-            if remote not in remotes:
-                raise ConanException("%s not in remotes" % remote)
-            refs[conan_reference] = remote
-            self._save(remotes, refs)
+        conan_reference = str(conan_reference)
+        remotes = self._load()
+        if self._get_ref_remote(conan_reference) is None:
+            raise ConanException("%s does not exist. Use add" % conan_reference)
+        if remote not in remotes:
+            raise ConanException("%s not in remotes" % remote)
+        self._pending_refs.pop(conan_reference, None)
+        self._db.set_refs_remotes({conan_reference: remote})
 
     def add(self, remote_name, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            remotes, refs = self._load()
+        with self._modify() as remotes:
             if remote_name in remotes:
                 raise ConanException("Remote %s already exist in remotes (use update to modify)"
                                      % remote_name)
             remotes[remote_name] = remote
-            self._save(remotes, refs)
 
     def remove(self, remote_name):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            remotes, refs = self._load()
+        with self._modify() as remotes:
             if remote_name not in remotes:
                 raise ConanException("%s not found in remotes" % remote_name)
             del remotes[remote_name]
-            refs = {k: v for k, v in refs.items() if v != remote_name}
-            self._save(remotes, refs)
+        self._pending_refs = {ref: remote for ref, remote in self._pending_refs.items()
+                              if remote != remote_name}
+        self._db.remove_remote_refs(remote_name)
 
     def update(self, remote_name, remote):
-        with fasteners.InterProcessLock(self._filename + ".lock"):
-            remotes, refs = self._load()
+        with self._modify() as remotes:
             if remote_name not in remotes:
                 raise ConanException("%s not found in remotes" % remote_name)
             remotes[remote_name] = remote
-            self._save(remotes, refs)
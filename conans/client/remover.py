@@ -2,9 +2,9 @@ import os
 
 from conans.errors import ConanException
 from conans.util.log import logger
+from conans.util.locks import remove_lock
 from conans.model.ref import PackageReference
 from conans.paths import SYSTEM_REQS
-from conans.util.files import rmdir
 from conans.model.ref import ConanFileReference
 
 
@@ -15,7 +15,7 @@ class DiskRemover(object):
     def _remove(self, path, conan_ref, msg=""):
         try:
             logger.debug("Removing folder %s" % path)
-            rmdir(path, short_paths=True)
+            self._paths.remove_folder(path, short_paths=True)
         except OSError as e:
             raise ConanException("%s: Unable to remove %s\n\t%s" % (repr(conan_ref), msg, str(e)))
 
@@ -27,11 +27,36 @@ class DiskRemover(object):
         except OSError as e:
             raise ConanException("Unable to remove %s %s\n\t%s" % (repr(conan_ref), msg, str(e)))
 
+    def _remove_lock(self, path, conan_ref):
+        """ removes a lock file, or folder of lock files, and its empty parent folders. The
+        ones held by other processes are kept
+        """
+        if os.path.isdir(path):
+            for name in os.listdir(path):
+                remove_lock(os.path.join(path, name))
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+        else:
+            remove_lock(path)
+        locks_root = self._paths.recipe_lock(conan_ref)
+        for _ in conan_ref:  # locks/name/version/user/channel.lock
+            locks_root = os.path.dirname(locks_root)
+        folder = os.path.dirname(path)
+        while folder.startswith(locks_root + os.sep):
+            try:  # Take advantage that os.rmdir does not delete non-empty dirs
+                os.rmdir(folder)
+            except OSError:
+                break
+            folder = os.path.dirname(folder)
+
     def remove(self, conan_ref):
         self.remove_src(conan_ref)
         self.remove_builds(conan_ref)
         self.remove_packages(conan_ref)
         self._remove(self._paths.conan(conan_ref), conan_ref)
+        self._remove_lock(self._paths.recipe_lock(conan_ref), conan_ref)
 
     def remove_src(self, conan_ref):
         self._remove(self._paths.source(conan_ref), conan_ref, "src folder")
@@ -54,12 +79,14 @@ class DiskRemover(object):
                 self._remove(os.path.join(path, package), conan_ref, "package folder:%s" % package)
             self._remove(path, conan_ref, "packages")
             self._remove_file(self._paths.system_reqs(conan_ref), conan_ref, SYSTEM_REQS)
+            self._remove_lock(self._paths.package_locks(conan_ref), conan_ref)
         else:
             for id_ in ids_filter:  # remove just the specified packages
                 package_ref = PackageReference(conan_ref, id_)
                 self._remove(self._paths.package(package_ref), conan_ref, "package:%s" % id_)
                 self._remove_file(self._paths.system_reqs_package(package_ref),
                                   conan_ref, "%s/%s" % (id_, SYSTEM_REQS))
+                self._remove_lock(self._paths.package_lock(package_ref), conan_ref)
 
 
 class ConanRemover(object):
@@ -142,8 +142,8 @@ class ConanApiAuthManager(object):
         return self._rest_client.get_package_digest(package_reference)
 
     @input_credentials_if_unauthorized
-    def get_recipe(self, conan_reference, dest_folder):
-        return self._rest_client.get_recipe(conan_reference, dest_folder)
+    def get_recipe(self, conan_reference, dest_folder, filter_function=None):
+        return self._rest_client.get_recipe(conan_reference, dest_folder, filter_function)
 
     @input_credentials_if_unauthorized
     def get_package(self, package_reference, dest_folder):
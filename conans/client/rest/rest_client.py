@@ -107,8 +107,11 @@ class RestApiClient(object):
         contents = {key: decode_text(value) for key, value in dict(contents).items()}
         return FileTreeManifest.loads(contents[CONAN_MANIFEST])
 
-    def get_recipe(self, conan_reference, dest_folder):
-        """Gets a dict of filename:contents from conans"""
+    def get_recipe(self, conan_reference, dest_folder, filter_function=None):
+        """Gets a dict of filename:contents from conans
+        param filter_function: receives the {filename: url} of the recipe files and returns
+                               the ones to download, all of them by default
+        """
         # Get the conanfile snapshot first
         url = "%s/conans/%s/download_urls" % (self._remote_api_url, "/".join(conan_reference))
         urls = self._get_json(url)
@@ -116,7 +119,8 @@ class RestApiClient(object):
         if CONANFILE not in list(urls.keys()):
             raise NotFoundException("Conan '%s' doesn't have a %s!" % (conan_reference, CONANFILE))
 
-        # TODO: Get fist an snapshot and compare files and download only required?
+        if filter_function:
+            urls = filter_function(urls)
         file_paths = self.download_files_to_folder(urls, dest_folder, self._output)
         return file_paths
 
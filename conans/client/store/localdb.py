@@ -1,6 +1,7 @@
 from conans.client.store.sqlite import SQLiteDB
 from conans.errors import ConanException
 
+LOCALDB = ".conan.db"
 USER_TABLE = "users"  # conan retrocompatibility
 REMOTES_USER_TABLE = "users_remotes"
 
@@ -0,0 +1,84 @@
+from conans.client.store.sqlite import SQLiteDB
+from conans.errors import ConanException
+
+REGISTRY_DB = "registry.db"
+REFS_REMOTES_TABLE = "refs_remotes"
+
+
+class RegistryDB(SQLiteDB):
+    """ The remotes associated to the package recipes references, in its own file, not with
+    the credentials of the LocalDB
+    """
+
+    def __init__(self, dbfile):
+        self.dbfile = dbfile
+        super(RegistryDB, self).__init__(dbfile)
+        self.connect()
+        self.init()
+
+    def init(self):
+        SQLiteDB.init(self)
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("create table if not exists %s "
+                           "(reference TEXT PRIMARY KEY, remote TEXT)" % REFS_REMOTES_TABLE)
+            cursor.execute("create index if not exists %s_remote on %s (remote)"
+                           % (REFS_REMOTES_TABLE, REFS_REMOTES_TABLE))
+        except Exception as e:
+            message = "Could not initialize remote registry sqlite database"
+            raise ConanException(message, e)
+        finally:
+            if cursor:
+                cursor.close()
+
+    def get_ref_remote(self, conan_reference):
+        """Remote name associated to the reference (string), None if not associated"""
+        try:
+            statement = self.connection.cursor()
+            statement.execute("select remote from %s where reference=?" % REFS_REMOTES_TABLE,
+                              (conan_reference, ))
+            rs = statement.fetchone()
+            return rs[0] if rs else None
+        except Exception:
+            raise ConanException("Couldn't read remote registry\n Try removing '%s' file"
+                                 % self.dbfile)
+
+    def get_refs_remotes(self):
+        """Returns {reference: remote_name} of all the references"""
+        try:
+            statement = self.connection.cursor()
+            statement.execute("select reference, remote from %s" % REFS_REMOTES_TABLE)
+            return dict(statement.fetchall())
+        except Exception:
+            raise ConanException("Couldn't read remote registry\n Try removing '%s' file"
+                                 % self.dbfile)
+
+    def set_refs_remotes(self, refs):
+        """refs is a {reference: remote_name} dict, stored in a single transaction"""
+        try:
+            with self.connection:
+                self.connection.executemany("INSERT OR REPLACE INTO %s (reference, remote) "
+                                            "VALUES (?, ?)" % REFS_REMOTES_TABLE,
+                                            list(refs.items()))
+        except Exception as e:
+            raise ConanException("Could not store remote registry %s" % str(e))
+
+    def remove_ref_remote(self, conan_reference):
+        """Returns False if the reference was not associated to any remote"""
+        try:
+            with self.connection:
+                cursor = self.connection.execute("DELETE FROM %s WHERE reference=?"
+                                                 % REFS_REMOTES_TABLE, (conan_reference, ))
+            return cursor.rowcount > 0
+        except Exception as e:
+            raise ConanException("Could not store remote registry %s" % str(e))
+
+    def remove_remote_refs(self, remote_name):
+        """Removes all the references associated to a remote"""
+        try:
+            with self.connection:
+                self.connection.execute("DELETE FROM %s WHERE remote=?" % REFS_REMOTES_TABLE,
+                                        (remote_name, ))
+        except Exception as e:
+            raise ConanException("Could not store remote registry %s" % str(e))
@@ -0,0 +1,141 @@
+""" Deletion of big folders (builds, packages) in background: they are moved to a trash
+folder in the store, which is atomic and fast, and a detached process deletes them, so the
+user doesn't wait for it
+"""
+import os
+import subprocess
+import sys
+import threading
+import uuid
+
+import fasteners
+
+from conans.errors import ConanException
+from conans.util.files import rmdir, mkdir
+from conans.util.log import logger
+
+
+class Trash(object):
+
+    def __init__(self, folder):
+        """ param folder: the trash folder, it has to be in the same filesystem as the
+                          removed folders, so they can be moved there
+        """
+        self._folder = folder
+
+    @property
+    def folder(self):
+        return self._folder
+
+    def _lock(self):
+        return fasteners.InterProcessLock(self._folder + ".lock")
+
+    def remove(self, path, short_paths=False):
+        """ moves the path to the trash and starts the background deletion. If it cannot be
+        moved (other filesystem, files in use in Windows...) it is removed here
+        """
+        if not os.path.exists(path):
+            return
+        mkdir(self._folder)
+        trashed = os.path.join(self._folder, uuid.uuid4().hex)
+        try:
+            os.rename(path, trashed)
+        except OSError as e:
+            logger.debug("Cannot move %s to the trash, removing it: %s" % (path, str(e)))
+            rmdir(path, short_paths)
+            return
+        # A reaper holding the lock checks the trash again after releasing it, so it will
+        # delete this one too. Otherwise, a new reaper is needed
+        lock = self._lock()
+        if lock.acquire(blocking=False):
+            lock.release()
+            self._start_reaper()
+
+    def purge(self):
+        """ deletes the trash contents now, waiting for the background deletion if running
+        """
+        self._reap(blocking=True)
+        remaining = self._entries()
+        if remaining:
+            raise ConanException("Cannot remove from the trash %s: %s"
+                                 % (self._folder, ", ".join(sorted(remaining))))
+
+    def reap(self):
+        """ deletes the trash contents, unless other process is doing it. Entry point of the
+        background process
+        """
+        self._reap(blocking=False)
+
+    def _reap(self, blocking):
+        failed = set()
+        while True:
+            lock = self._lock()
+            if not lock.acquire(blocking=blocking):
+                return  # The process holding it will check the trash after releasing it
+            try:
+                failed.update(self._empty(failed))
+            finally:
+                lock.release()
+            # Things moved to the trash while the lock was held, their remove() didn't
+            # start a reaper
+            if not set(self._entries()).difference(failed):
+                return
+
+    def _entries(self):
+        try:
+            return os.listdir(self._folder)
+        except OSError:
+            return []
+
+    def _empty(self, skip=()):
+        """ return: the names that could not be removed
+        """
+        failed = []
+        for name in self._entries():
+            if name in skip:
+                continue
+            # Windows short paths folders are pointed by the .conan_link of the trashed one
+            try:
+                rmdir(os.path.join(self._folder, name), short_paths=True)
+            except OSError as e:  # Files in use, they will be removed by later reapers
+                logger.debug("Cannot remove %s from the trash: %s" % (name, str(e)))
+                failed.append(name)
+        return failed
+
+    def _start_reaper(self):
+        if getattr(sys, "frozen", False):  # Not a python interpreter, cannot run -c
+            thread = threading.Thread(target=self.reap)
+            thread.daemon = True  # Not finished ones will be deleted by later reapers
+            thread.start()
+            return
+
+        import conans
+        env = dict(os.environ)
+        conans_path = os.path.dirname(os.path.dirname(os.path.abspath(conans.__file__)))
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (conans_path, env.get("PYTHONPATH"))
+                                            if p)
+        if sys.platform == "win32":
+            code = "from conans.client.trash import Trash; Trash(%r).reap()" % self._folder
+            flags = 0x00000008 | 0x00000200  # Detached, new process group
+            self._run_detached(code, env, creationflags=flags)
+        else:
+            # Double fork, the reaper is adopted by init and this process waits only for the
+            # intermediate one, so no zombies are left. In its own session, it is not killed
+            # with the terminal of conan
+            code = ("import os\n"
+                    "if os.fork() == 0:\n"
+                    "    os.setsid()\n"
+                    "    from conans.client.trash import Trash\n"
+                    "    Trash(%r).reap()\n" % self._folder)
+            process = self._run_detached(code, env)
+            if process:
+                process.wait()
+
+    @staticmethod
+    def _run_detached(code, env, **kwargs):
+        with open(os.devnull, "r+b") as devnull:
+            try:
+                return subprocess.Popen([sys.executable, "-c", code], stdin=devnull,
+                                        stdout=devnull, stderr=devnull, env=env, **kwargs)
+            except OSError as e:
+                logger.error("Cannot start the trash deletion process: %s" % str(e))
@@ -17,10 +17,13 @@ class Migrator(object):
         self.out = out
 
     def migrate(self):
+        """ Returns True if migrations were needed (version changed) """
         old_version = self._load_old_version()
         if old_version != self.current_version:
             self._make_migrations(old_version)
             self._update_version_file()
+            return True
+        return False
 
     def _make_migrations(self, old_version):
         raise NotImplementedError("Implement in subclass")
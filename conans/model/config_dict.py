@@ -1,5 +1,4 @@
 from conans.errors import ConanException
-import yaml
 from conans.model.values import Values
 
 
@@ -28,6 +27,10 @@ class ConfigItem(object):
         self._name = name
         self._value = None
         self._cls = cls
+        self._shared = False  # _definition is shared with copies, copy it before modifying
+        # Children were returned, they can be modified through those references without
+        # this item knowing, so copies cannot share them
+        self._exposed = False
         self._definition = {}
         if isinstance(definition, dict):
             # recursive
@@ -41,17 +44,28 @@ class ConfigItem(object):
             self._definition = sorted([str(v) for v in definition])
 
     def copy(self):
-        """ deepcopy, recursive
+        """ copy-on-write, the definition is shared until one of the copies modifies it
         """
         cls = type(self)
         result = cls({}, name=self._name, cls=self._cls)
         result._value = self._value
-        if self.is_final:
-            result._definition = self._definition[:]
-        else:
+        if self._exposed and isinstance(self._definition, dict):
             result._definition = {k: v.copy() for k, v in self._definition.items()}
+        else:
+            result._definition = self._definition
+            result._shared = self._shared = True
         return result
 
+    def _own(self):
+        """ Makes the definition private before modifying it, or returning a child that
+        could be modified. Children are (lazily) copied too, not the whole tree """
+        if self._shared:
+            if isinstance(self._definition, dict):
+                self._definition = {k: v.copy() for k, v in self._definition.items()}
+            elif self._definition != "ANY":
+                self._definition = self._definition[:]
+            self._shared = False
+
     @property
     def is_final(self):
         return not isinstance(self._definition, dict)
@@ -90,6 +104,7 @@ class ConfigItem(object):
     def remove(self, values):
         if not isinstance(values, (list, tuple, set)):
             values = [values]
+        self._own()
         for v in values:
             v = str(v)
             if isinstance(self._definition, dict):
@@ -105,11 +120,13 @@ class ConfigItem(object):
             raise ConanException(undefined_field(self._name, item, None, self._value))
         if self._value is None:
             raise ConanException(undefined_value(self._name))
+        self._own()
         return self._definition[self._value]
 
     def __getattr__(self, item):
         item = str(item)
         sub_config_dict = self._get_child(item)
+        self._exposed = True
         return getattr(sub_config_dict, item)
 
     def __setattr__(self, item, value):
@@ -122,8 +139,11 @@ class ConfigItem(object):
 
     def __getitem__(self, value):
         value = str(value)
+        self._own()
         try:
-            return self._definition[value]
+            result = self._definition[value]
+            self._exposed = True
+            return result
         except:
             raise ConanException(bad_value_msg(self._name, value, self.values_range))
 
@@ -170,23 +190,39 @@ class ConfigDict(object):
         self._name = name  # settings, settings.compiler
         self._parent_value = parent_value  # gcc, x86
         cls = type(self)
+        self._shared = False  # _data is shared with copies, copy it before modifying
+        # Items were returned, they can be modified through those references without this
+        # dict knowing, so copies cannot share them
+        self._exposed = False
         self._data = {str(k): ConfigItem(v, "%s.%s" % (name, k), cls)
                       for k, v in definition.items()}
 
     def copy(self):
-        """ deepcopy, recursive
+        """ copy-on-write, the items are shared until one of the copies modifies them, so
+        copying is O(1) instead of O(definition size)
         """
         cls = type(self)
         result = cls({}, name=self._name, parent_value=self._parent_value)
-        for k, v in self._data.items():
-            result._data[k] = v.copy()
+        if self._exposed:  # Only the items are copied, each one copy-on-write
+            result._data = {k: v.copy() for k, v in self._data.items()}
+        else:
+            result._data = self._data
+            result._shared = self._shared = True
         return result
 
+    def _own(self):
+        """ Makes the items private before modifying them, or returning one that could be
+        modified. Only this level is copied, deeper levels are copied when accessed """
+        if self._shared:
+            self._data = {k: v.copy() for k, v in self._data.items()}
+            self._shared = False
+
     @classmethod
     def loads(cls, text):
         name = cls.__name__.lower()
         if name == "packageoptions":
             name = "options"
+        import yaml  # Slow to import, only needed when loading
         return cls(yaml.load(text) or {})
 
     def validate(self):
@@ -201,12 +237,14 @@ class ConfigDict(object):
     def remove(self, item):
         if not isinstance(item, (list, tuple, set)):
             item = [item]
+        self._own()
         for it in item:
             it = str(it)
             self._data.pop(it, None)
 
     def clear(self):
         self._data = {}
+        self._shared = False
 
     def _check_field(self, field):
         if field not in self._data:
@@ -216,11 +254,14 @@ class ConfigDict(object):
     def __getattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
+        self._own()
+        self._exposed = True
         return self._data[field]
 
     def __delattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
+        self._own()
         del self._data[field]
 
     def __setattr__(self, field, value):
@@ -228,6 +269,7 @@ class ConfigDict(object):
             return super(ConfigDict, self).__setattr__(field, value)
 
         self._check_field(field)
+        self._own()
         self._data[field].value = value
 
     @property
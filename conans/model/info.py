@@ -3,7 +3,7 @@ from conans.model.ref import PackageReference
 from conans.errors import ConanException
 from conans.util.config_parser import ConfigParser
 from conans.util.files import load
-from conans.model.values import Values
+from conans.model.values import Values, new_version
 from conans.model.options import OptionsValues
 from conans.model.scope import Scopes
 
@@ -28,6 +28,11 @@ class RequirementInfo(object):
             self.version = self.full_version.stable()
         self.user = self.channel = self.package_id = None
 
+    def __setattr__(self, attr, value):
+        super(RequirementInfo, self).__setattr__(attr, value)
+        # Stamps the modification, so the RequirementsInfo digest is computed again
+        super(RequirementInfo, self).__setattr__("_version", new_version())
+
     def dumps(self):
         return "/".join([n for n in [self.name, self.version, self.user, self.channel,
                                      self.package_id] if n])
@@ -75,6 +80,7 @@ class RequirementsInfo(object):
         # {PackageReference: RequirementInfo}
         self._non_devs_requirements = non_devs_requirements
         self._data = {r: RequirementInfo(str(r)) for r in requires}
+        self._sha = None  # (versions, digest)
 
     def clear(self):
         self._data = {}
@@ -110,6 +116,10 @@ class RequirementsInfo(object):
 
     @property
     def sha(self):
+        # The versions of the requirements are unique, they also identify the set of them
+        versions = sorted(r._version for r in self._data.values())
+        if self._sha is not None and self._sha[0] == versions:
+            return self._sha[1]
         result = []
         # Remove requirements without a name, i.e. indirect transitive requirements
         data = {k: v for k, v in self._data.items() if v.name}
@@ -121,7 +131,9 @@ class RequirementsInfo(object):
                 non_dev = key.conan.name in self._non_devs_requirements
                 if non_dev:
                     result.append(data[key].sha)
-        return sha1('\n'.join(result).encode())
+        digest = sha1('\n'.join(result).encode())
+        self._sha = (versions, digest)
+        return digest
 
     def dumps(self):
         result = []
@@ -240,7 +252,8 @@ class ConanInfo(object):
 
     def package_id(self):
         """ The package_id of a conans is the sha1 of its specific requirements,
-        options and settings
+        options and settings. It is computed once, later modifications of the info
+        do not change it
         """
         computed_id = getattr(self, "_package_id", None)
         if computed_id:
@@ -252,6 +265,16 @@ class ConanInfo(object):
         self._package_id = sha1('\n'.join(result).encode())
         return self._package_id
 
+    def package_reference(self, conan_ref):
+        """ The PackageReference of this package, built only once
+        """
+        package_id = self.package_id()
+        computed = getattr(self, "_package_reference", None)
+        if computed is None or computed.conan != conan_ref:
+            computed = PackageReference(conan_ref, package_id)
+            self._package_reference = computed
+        return computed
+
     def serialize(self):
         conan_info_json = {"settings": self.settings.serialize(),
                            "full_settings": self.full_settings.serialize(),
@@ -36,26 +36,33 @@ class FileTreeManifest(object):
         """ Walks a folder and create a TreeDigest for it, reading file contents
         from disk, and capturing current time
         """
-        file_dict = {}
-        for root, _, files in os.walk(folder):
+        files = {}
+        for root, _, filenames in os.walk(folder):
             relative_path = os.path.relpath(root, folder)
-            for f in files:
-                abs_path = os.path.join(root, f)
+            for f in filenames:
                 rel_path = os.path.normpath(os.path.join(relative_path, f))
-                rel_path = rel_path.replace("\\", "/")
-                file_dict[rel_path] = md5sum(abs_path)
+                files[rel_path] = os.path.join(root, f)
+        return cls.create_from_files(files)
 
-        date = calendar.timegm(time.gmtime())
+    @classmethod
+    def create_from_files(cls, files):
+        """ creates the TreeDigest of the files that a folder would contain, without
+        copying them there
+        param files: {relative path in the folder: absolute path of the file to read}
+        """
         from conans.paths import CONAN_MANIFEST, CONANFILE
-        file_dict.pop(PACKAGE_TGZ_NAME, None)  # Exclude the PACKAGE_TGZ_NAME
-        file_dict.pop(EXPORT_TGZ_NAME, None)  # Exclude the EXPORT_TGZ_NAME
-        file_dict.pop(CONAN_MANIFEST, None)  # Exclude the MANIFEST itself
-        file_dict.pop(CONANFILE + "c", None)  # Exclude the CONANFILE.pyc
-        file_dict.pop(".DS_Store", None)  # Exclude tmp in mac
-
-        file_dict = {key: value for key, value in file_dict.items()
-                     if not key.startswith("__pycache__")}
+        excluded = (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME,  # Exclude the tgz files
+                    CONAN_MANIFEST,  # Exclude the MANIFEST itself
+                    CONANFILE + "c",  # Exclude the CONANFILE.pyc
+                    ".DS_Store")  # Exclude tmp in mac
+        file_dict = {}
+        for rel_path, abs_path in files.items():
+            rel_path = rel_path.replace("\\", "/")
+            if rel_path in excluded or rel_path.startswith("__pycache__"):
+                continue
+            file_dict[rel_path] = md5sum(abs_path)
 
+        date = calendar.timegm(time.gmtime())
         return cls(date, file_dict)
 
     def __eq__(self, other):
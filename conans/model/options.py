@@ -146,6 +146,7 @@ class OptionsValues(object):
     def __init__(self):
         self._options = Values()
         self._reqs_options = {}  # {name("Boost": Values}
+        self._sha = None  # (versions, non_dev_requirements, digest)
 
     def __getitem__(self, item):
         return self._reqs_options.setdefault(item, Values())
@@ -238,6 +239,15 @@ class OptionsValues(object):
         return result
 
     def sha(self, non_dev_requirements):
+        # The Values can be replaced or shared, so their versions are checked every time
+        versions = (self._options._version,
+                    tuple(sorted((k, v._version) for k, v in self._reqs_options.items())))
+        if non_dev_requirements is not None:
+            non_dev_requirements = frozenset(non_dev_requirements)
+        if self._sha is not None:
+            cached_versions, cached_non_dev, digest = self._sha
+            if cached_versions == versions and cached_non_dev == non_dev_requirements:
+                return digest
         result = []
         result.append(self._options.sha)
         if non_dev_requirements is None:  # Not filtering
@@ -248,7 +258,9 @@ class OptionsValues(object):
                 non_dev = key in non_dev_requirements
                 if non_dev:
                     result.append(self._reqs_options[key].sha)
-        return sha1('\n'.join(result).encode())
+        digest = sha1('\n'.join(result).encode())
+        self._sha = (versions, non_dev_requirements, digest)
+        return digest
 
     def serialize(self):
         ret = {}
@@ -4,8 +4,25 @@ from conans.errors import ConanException, InvalidNameException
 from conans.model.version import Version
 
 
+# References are immutable, so the parsed ones are interned and shared. The caches are
+# just cleared when they grow too much
+_MAX_INTERNED = 10000
+_valid_names = set()
+_interned_refs = {}  # {(text, validate): ConanFileReference}
+_interned_package_refs = {}  # {text: PackageReference}
+
+
+def _intern(cache, key, value):
+    if len(cache) >= _MAX_INTERNED:
+        cache.clear()
+    cache[key] = value
+    return value
+
+
 def validate_conan_name(name):
     """Check for name compliance with pattern rules"""
+    if name in _valid_names:
+        return name
     try:
         if name == '*' and ConanFileReference.wildcard_is_allowed:
             return name
@@ -24,6 +41,9 @@ def validate_conan_name(name):
                           " dot and dash" % (name, ConanFileReference.min_chars,
                                              ConanFileReference.max_chars)
             raise InvalidNameException(message)
+        if len(_valid_names) >= _MAX_INTERNED:
+            _valid_names.clear()
+        _valid_names.add(name)
         return name
     except AttributeError:
         raise InvalidNameException('Empty name provided', None)
@@ -55,10 +75,23 @@ class ConanFileReference(namedtuple("ConanFileReference", "name version user cha
         version = Version(version)
         return super(cls, ConanFileReference).__new__(cls, name, version, user, channel)
 
+    @classmethod
+    def trusted(cls, name, version, user, channel):
+        """ Builds a reference from fields that the code itself has already validated,
+        skipping the validation. Never for external input, as the folders of a storage, that
+        can contain anything
+        """
+        return tuple.__new__(cls, (name, Version(version), user, channel))
+
     @staticmethod
     def loads(text, validate=True):
         """ Parses a text string to generate a ConanFileReference object
         """
+        key = (text, validate)
+        try:
+            return _interned_refs[key]
+        except KeyError:
+            pass
         text = ConanFileReference.whitespace_pattern.sub("", text)
         tokens = ConanFileReference.sep_pattern.split(text)
         try:
@@ -69,10 +102,15 @@ class ConanFileReference(namedtuple("ConanFileReference", "name version user cha
         except IndexError:
             raise ConanException("Wrong package recipe reference %s\nWrite something like "
                                  "OpenCV/1.0.6@phil/stable" % text)
-        return ConanFileReference(name, version, user, channel, validate)
+        ref = ConanFileReference(name, version, user, channel, validate)
+        return _intern(_interned_refs, key, ref)
 
     def __repr__(self):
-        return "%s/%s@%s/%s" % (self.name, self.version, self.user, self.channel)
+        try:
+            return self._text
+        except AttributeError:
+            self._text = "%s/%s@%s/%s" % self
+            return self._text
 
     def package_ref(self, conan_info):
         package_id = conan_info.package_id(self)
@@ -86,6 +124,11 @@ class PackageReference(namedtuple("PackageReference", "conan package_id")):
 
     @staticmethod
     def loads(text):
+        try:
+            return _interned_package_refs[text]
+        except KeyError:
+            pass
+        key = text
         text = text.strip()
         tmp = text.split(":")
         try:
@@ -93,7 +136,11 @@ class PackageReference(namedtuple("PackageReference", "conan package_id")):
             package_id = tmp[1].strip()
         except IndexError:
             raise ConanException("Wrong package reference  %s" % text)
-        return PackageReference(conan, package_id)
+        return _intern(_interned_package_refs, key, PackageReference(conan, package_id))
 
     def __repr__(self):
-        return "%s:%s" % (self.conan, self.package_id)
+        try:
+            return self._text
+        except AttributeError:
+            self._text = "%s:%s" % self
+            return self._text
@@ -18,6 +18,7 @@ class Settings(ConfigDict):
         else:
             constraint_def = {str(k): v for k, v in constraint_def.items()}
 
+        self._own()
         fields_to_remove = []
         for field, config_item in self._data.items():
             if field not in constraint_def:
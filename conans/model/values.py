@@ -1,27 +1,57 @@
+import itertools
+
 from conans.util.sha import sha1
 from conans.errors import ConanException
 import six
 
 
+_versions = itertools.count()
+
+
+def new_version():
+    """ a number never returned before, that stamps the current state of an object of the
+    info model (Values, OptionsValues, RequirementsInfo), to memoize its digest
+    """
+    return next(_versions)
+
+
 class Values(object):
     def __init__(self, value="values"):
         self._value = str(value)
         self._dict = {}  # {key: Values()}
         self._modified = {}  # {"compiler.version.arch": (old_value, old_reference)}
+        # Children are modified through references (info.settings.compiler.version = "4.9"),
+        # so they stamp a new version in their parents too
+        self._parent = None
+        self._version = new_version()
+        self._sha = None  # (version, digest)
 
     def __getattr__(self, attr):
         if attr not in self._dict:
             return None
         return self._dict[attr]
 
+    def _mutated(self):
+        version = new_version()
+        node = self
+        while node is not None:
+            node._version = version
+            node = node._parent
+
+    def _set_child(self, attr, child):
+        child._parent = self
+        self._dict[attr] = child
+
     def clear(self):
         self._dict.clear()
         self._value = ""
+        self._mutated()
 
     def __setattr__(self, attr, value):
         if attr[0] == "_":
             return super(Values, self).__setattr__(attr, value)
-        self._dict[attr] = Values(value)
+        self._set_child(attr, Values(value))
+        self._mutated()
 
     def copy(self):
         """ deepcopy, recursive
@@ -29,7 +59,7 @@ class Values(object):
         cls = type(self)
         result = cls(self._value)
         for k, v in self._dict.items():
-            result._dict[k] = v.copy()
+            result._set_child(k, v.copy())
         return result
 
     @property
@@ -105,7 +135,8 @@ class Values(object):
             if k in self._dict:
                 self._dict[k].update(v)
             else:
-                self._dict[k] = v.copy()
+                self._set_child(k, v.copy())
+        self._mutated()
 
     def propagate_upstream(self, other, down_ref, own_ref, output, package_name):
         if not other:
@@ -152,6 +183,8 @@ class Values(object):
 
     @property
     def sha(self):
+        if self._sha is not None and self._sha[0] == self._version:
+            return self._sha[1]
         result = []
         for (name, value) in self.as_list(list_all=False):
             # It is important to discard None values, so migrations in settings can be done
@@ -159,4 +192,6 @@ class Values(object):
             # that doesn't change the final sha
             if value != "None":
                 result.append("%s=%s" % (name, value))
-        return sha1('\n'.join(result).encode())
+        digest = sha1('\n'.join(result).encode())
+        self._sha = (self._version, digest)
+        return digest
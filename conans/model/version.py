@@ -9,13 +9,34 @@ class Version(str):
     def __new__(cls, content):
         return str.__new__(cls, content.strip())
 
+    # str subclasses cannot have non-empty __slots__, so the parsed tokens and the comparison
+    # key are computed once and kept in the instance __dict__
+    def _parse(self):
+        tokens = tuple(int(item) if item.isdigit() else item for item in re.split('[.-]', self))
+        # Strings sort before integers, and a missing item between them, so that
+        # 1.2.rc1 < 1.2 < 1.2.0
+        key = tuple((2, item) if isinstance(item, int) else (0, item) for item in tokens)
+        self._tokens = tokens
+        self._key = key + ((1, ), )
+
     @property
     def as_list(self):
-        result = []
-        tokens = re.split('[.-]', self)
-        for item in tokens:
-            result.append(int(item) if item.isdigit() else item)
-        return result
+        try:
+            return list(self._tokens)
+        except AttributeError:
+            self._parse()
+            return list(self._tokens)
+
+    @property
+    def key(self):
+        """ the comparison key of the version, a tuple, so comparing versions is a plain
+        tuple comparison
+        """
+        try:
+            return self._key
+        except AttributeError:
+            self._parse()
+            return self._key
 
     def major(self, fill=True):
         self_list = self.as_list
@@ -50,42 +71,26 @@ class Version(str):
                 return False
         return True
 
-    def __cmp__(self, other):
-        if other is None:
-            return 1
+    @staticmethod
+    def _other_key(other):
         if not isinstance(other, Version):
             other = Version(other)
+        return other.key
 
-        other_list = other.as_list
-        for ind, el in enumerate(self.as_list):
-            if ind + 1 > len(other_list):
-                if isinstance(el, int):
-                    return 1
-                return -1
-            if not isinstance(el, int) and isinstance(other_list[ind], int):
-                # Version compare with 1.4.rc2
-                return -1
-            elif not isinstance(other_list[ind], int) and isinstance(el, int):
-                return 1
-            elif el == other_list[ind]:
-                continue
-            elif el > other_list[ind]:
-                return 1
-            else:
-                return -1
-        if len(other_list) > len(self.as_list):
-            return -1
-        else:
-            return 0
+    def __cmp__(self, other):
+        if other is None:
+            return 1
+        key, other_key = self.key, self._other_key(other)
+        return (key > other_key) - (key < other_key)
 
     def __gt__(self, other):
-        return self.__cmp__(other) == 1
+        return other is None or self.key > self._other_key(other)
 
     def __lt__(self, other):
-        return self.__cmp__(other) == -1
+        return other is not None and self.key < self._other_key(other)
 
     def __le__(self, other):
-        return self.__cmp__(other) in [0, -1]
+        return other is not None and self.key <= self._other_key(other)
 
     def __ge__(self, other):
-        return self.__cmp__(other) in [0, 1]
+        return other is None or self.key >= self._other_key(other)
@@ -28,6 +28,9 @@ BUILD_INFO_YCM = '.ycm_extra_conf.py'
 CONANINFO = "conaninfo.txt"
 SYSTEM_REQS = "system_reqs.txt"
 DIRTY_FILE = ".conan_dirty"
+BUILD_SYNC_MANIFEST = ".conan_sync"
+EXPORTS_PENDING = ".conan_exports_pending"
+TRASH_FOLDER = ".trash"
 
 PACKAGE_TGZ_NAME = "conan_package.tgz"
 EXPORT_TGZ_NAME = "conan_export.tgz"
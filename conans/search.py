@@ -6,7 +6,7 @@ from fnmatch import translate
 from conans.errors import ConanException, NotFoundException
 from conans.model.info import ConanInfo
 from conans.model.ref import PackageReference, ConanFileReference
-from conans.paths import CONANINFO
+from conans.paths import CONANINFO, TRASH_FOLDER
 from conans.util.log import logger
 
 
@@ -78,6 +78,7 @@ class DiskSearchManager(SearchManagerABC):
             pattern = re.compile(pattern, re.IGNORECASE) if ignorecase else re.compile(pattern)
 
         subdirs = self._adapter.list_folder_subdirs(basedir=self._paths.store, level=4)
+        subdirs = [subdir for subdir in subdirs if not subdir.startswith(TRASH_FOLDER + "/")]
 
         if not pattern:
             return sorted([ConanFileReference(*folder.split("/")) for folder in subdirs])
@@ -7,12 +7,17 @@ from datetime import timedelta
 import os
 import random
 import string
-from conans.errors import ConanException
+from conans.errors import ConanException, AuthenticationException
 from conans.util.files import save, mkdir
 from six.moves.configparser import ConfigParser, NoSectionError
 from conans.paths import SimplePaths, conan_expand_user
 from conans.server.store.disk_adapter import ServerDiskAdapter
 from conans.server.store.file_manager import FileManager
+from conans.server.store.caching_file_manager import CachingFileManager
+from conans.server.store.object_store_adapter import ServerObjectStoreAdapter
+from conans.search import DiskSearchManager
+from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
+from conans.server.crypto.jwt.hmac_updown_manager import HMACUpDownAuthManager
 from conans.util.log import logger
 from conans.server.conf.default_server_conf import default_server_conf
 
@@ -31,7 +36,15 @@ class ConanServerConfigParser(ConfigParser):
         self.config_filename = os.path.join(self.conan_folder, 'server.conf')
         self._loaded = False
         self.env_config = {"updown_secret": get_env("CONAN_UPDOWN_SECRET", None, environment),
+                           "updown_signature": get_env("CONAN_UPDOWN_SIGNATURE", None, environment),
                            "store_adapter": get_env("CONAN_STORE_ADAPTER", None, environment),
+                           "s3_bucket": get_env("CONAN_S3_BUCKET", None, environment),
+                           "s3_host": get_env("CONAN_S3_HOST", None, environment),
+                           "upstream_url": get_env("CONAN_UPSTREAM_URL", None, environment),
+                           "upstream_ttl": get_env("CONAN_UPSTREAM_TTL", None, environment),
+                           "upstream_user": get_env("CONAN_UPSTREAM_USER", None, environment),
+                           "upstream_password": get_env("CONAN_UPSTREAM_PASSWORD", None,
+                                                        environment),
                            "authorize_timeout": get_env("CONAN_AUTHORIZE_TIMEOUT", None, environment),
                            "disk_storage_path": get_env("CONAN_STORAGE_PATH", storage_folder, environment),
                            "jwt_secret": get_env("CONAN_JWT_SECRET", None, environment),
@@ -169,10 +182,69 @@ class ConanServerConfigParser(ConfigParser):
                                  "in server.conf or set CONAN_UPDOWN_SECRET env value.")
         return self._get_conf_server_string("updown_secret")
 
+    @property
+    def updown_signature(self):
+        """Scheme for signing the upload/download urls, "jwt" (default) or "hmac" """
+        try:
+            tmp = self._get_conf_server_string("updown_signature")
+        except ConanException:  # Old server.conf files
+            tmp = None
+        return (tmp or "jwt").lower()
+
     @property
     def store_adapter(self):
         return self._get_conf_server_string("store_adapter")
 
+    @property
+    def s3_bucket(self):
+        """Bucket of the "s3" store adapter"""
+        try:
+            return self._get_conf_server_string("s3_bucket") or None
+        except ConanException:
+            return None
+
+    @property
+    def s3_host(self):
+        """Host of a S3 compatible storage. None (empty) for Amazon S3"""
+        try:
+            return self._get_conf_server_string("s3_host") or None
+        except ConanException:
+            return None
+
+    @property
+    def upstream_url(self):
+        """Remote url (e.g. https://central:9300) of the upstream server. If defined, this
+        server works as a pull-through mirror of it"""
+        try:
+            return self._get_conf_server_string("upstream_url") or None
+        except ConanException:
+            return None
+
+    @property
+    def upstream_ttl(self):
+        """Seconds a mirrored artifact is served without checking the upstream manifest.
+        None (empty) never checks it again"""
+        try:
+            tmp = self._get_conf_server_string("upstream_ttl")
+        except ConanException:
+            tmp = None
+        return int(tmp) if tmp else None
+
+    @property
+    def upstream_user(self):
+        """User to log in the upstream server, None (empty) for anonymous access"""
+        try:
+            return self._get_conf_server_string("upstream_user") or None
+        except ConanException:
+            return None
+
+    @property
+    def upstream_password(self):
+        try:
+            return self._get_conf_server_string("upstream_password") or None
+        except ConanException:
+            return None
+
     def _get_conf_server_string(self, keyname):
         if self.env_config[keyname]:
             return self.env_config[keyname]
@@ -196,9 +268,75 @@ class ConanServerConfigParser(ConfigParser):
             return timedelta(minutes=tmp)
 
 
-def get_file_manager(config, public_url=None, updown_auth_manager=None):
+def get_updown_auth_manager(config):
+    signature = config.updown_signature
+    if signature == "jwt":
+        manager_class = JWTUpDownAuthManager
+    elif signature == "hmac":
+        manager_class = HMACUpDownAuthManager
+    else:
+        raise ConanException("Invalid 'updown_signature' value: '%s'. Change it in server.conf "
+                             "to one of the available options: 'jwt', 'hmac'" % signature)
+    return manager_class(config.updown_secret, config.authorize_timeout)
+
+
+def get_upstream_client(upstream_url, user=None, password=None, requester=None):
+    from conans.client.rest.rest_client import RestApiClient
+    if requester is None:
+        import requests
+        requester = requests
+    # No output, the client is only used for retrieving and it handles a None output
+    client = RestApiClient(None, requester)
+    client.remote_url = upstream_url.rstrip("/")
+    if user:
+        return _AuthenticatedClient(client, user, password)
+    return client
+
+
+class _AuthenticatedClient(object):
+    """ RestApiClient of the upstream server that logs in with the configured credentials
+    before the first call, and again when the token is rejected (expired)
+    """
+    def __init__(self, client, user, password):
+        self._client = client
+        self._user = user
+        self._password = password
+
+    def _login(self):
+        self._client.token = self._client.authenticate(self._user, self._password)
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def call(*args, **kwargs):
+            if self._client.token is None:
+                self._login()
+            try:
+                return method(*args, **kwargs)
+            except AuthenticationException:
+                self._login()
+                return method(*args, **kwargs)
+        return call
+
+
+def get_object_store(config):
+    from conans.server.store.object_store import S3ObjectStore
+    if not config.s3_bucket:
+        raise ConanException("'s3_bucket' setting is needed for the 's3' store adapter. Please, "
+                             "write a value in server.conf or set CONAN_S3_BUCKET env value.")
+    return S3ObjectStore(config.s3_bucket, config.s3_host)
+
+
+def get_file_manager(config, public_url=None, updown_auth_manager=None, upstream_client=None,
+                     object_store=None):
     store_adapter = config.store_adapter
-    if store_adapter == "disk":
+    if object_store is not None or store_adapter == "s3":
+        object_store = object_store or get_object_store(config)
+        # Storage paths are just the root of the object keys
+        adapter = ServerObjectStoreAdapter(object_store, config.disk_storage_path,
+                                           config.authorize_timeout)
+        paths = SimplePaths(config.disk_storage_path)
+    elif store_adapter == "disk":
         public_url = public_url or config.public_url
         disk_controller_url = "%s/%s" % (public_url, "files")
         if not updown_auth_manager:
@@ -209,5 +347,19 @@ def get_file_manager(config, public_url=None, updown_auth_manager=None):
         # Want to develop new adapter? create a subclass of
         # conans.server.store.file_manager.ServerStorageAdapter and implement the abstract methods
         raise Exception("Store adapter not implemented! Change 'store_adapter' "
-                        "variable in server.conf file to one of the available options: 'disk' ")
+                        "variable in server.conf file to one of the available options: "
+                        "'disk', 's3' ")
+
+    if upstream_client is None and config.upstream_url:
+        upstream_client = get_upstream_client(config.upstream_url, config.upstream_user,
+                                              config.upstream_password)
+    if upstream_client is not None:
+        if not isinstance(adapter, ServerDiskAdapter):
+            raise ConanException("Pull-through mirror (upstream_url) needs the 'disk' "
+                                 "store adapter")
+        return CachingFileManager(paths, adapter, upstream_client, config.upstream_ttl)
     return FileManager(paths, adapter)
+
+
+def get_search_manager(file_manager):
+    return DiskSearchManager(file_manager.paths, file_manager.search_adapter)
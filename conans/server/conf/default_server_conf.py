@@ -11,7 +11,7 @@ port: 9300
 public_port:
 host_name: localhost
 
-# Choose file adapter, "disk" for disk storage
+# Choose file adapter, "disk" for disk storage, "s3" for Amazon S3 or compatible storages
 # Authorize timeout are seconds the client has to upload/download files until authorization expires
 store_adapter: disk
 authorize_timeout: 1800
@@ -21,6 +21,23 @@ authorize_timeout: 1800
 disk_storage_path: ~/.conan_server/data
 disk_authorize_timeout: 1800
 updown_secret: {updown_secret}
+# Signature of the upload/download urls: "jwt" or "hmac" (lighter to validate)
+updown_signature: jwt
+
+# Just for s3 storage adapter. Files are transferred directly to/from the bucket with
+# presigned urls. Credentials are read from AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY
+# s3_bucket: mybucket
+# s3_host for S3 compatible storages (empty for Amazon S3)
+# s3_host: minio.local:9000
+
+# Pull-through mirror: recipes and packages not found in this server are retrieved
+# from the upstream server url and stored. upstream_ttl are the seconds before checking
+# again the upstream for changes (empty: never)
+# upstream_url: https://myconanserver:9300
+# upstream_ttl: 3600
+# Credentials for the upstream server (empty: anonymous)
+# upstream_user: mirror
+# upstream_password: mypass
 
 
 [write_permissions]
@@ -0,0 +1,50 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import jwt
+
+
+class HMACUpDownAuthManager(object):
+    """Lightweight alternative to JWTUpDownAuthManager for the signed file urls.
+    The token is the urlsafe base64 of the resource fields plus a HMAC-SHA256 of it, so it
+    is validated with a single hmac and without JWT header/claims parsing.
+    Same interface and same raised exceptions than JWTUpDownAuthManager"""
+
+    def __init__(self, secret, expire_time):
+        """expire_time is a timedelta
+           secret is a string with the secret encoding key"""
+        self.secret = secret if isinstance(secret, bytes) else secret.encode("utf-8")
+        self.expire_time = expire_time
+
+    def _sign(self, payload):
+        return hmac.new(self.secret, payload, hashlib.sha256).hexdigest().encode("ascii")
+
+    def get_token_for(self, resource_path, username, filesize=None):
+        """Generates a signed token for the resource, username is only for trace support"""
+        expiration = int(time.time() + self.expire_time.total_seconds()) \
+            if self.expire_time else None
+        fields = json.dumps([resource_path, filesize, username, expiration])
+        payload = base64.urlsafe_b64encode(fields.encode("utf-8"))
+        return payload + b"." + self._sign(payload)
+
+    def get_resource_info(self, token):
+        """Returns (resource_path, filesize, username) from the token.
+        Can raise jwt.ExpiredSignature and jwt.DecodeError"""
+        if not isinstance(token, bytes):
+            token = token.encode("utf-8")
+        try:
+            payload, signature = token.rsplit(b".", 1)
+        except ValueError:
+            raise jwt.DecodeError("Not enough segments")
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise jwt.DecodeError("Signature verification failed")
+        try:
+            fields = base64.urlsafe_b64decode(payload).decode("utf-8")
+            resource_path, filesize, username, expiration = json.loads(fields)
+        except (TypeError, ValueError):
+            raise jwt.DecodeError("Invalid payload")
+        if expiration is not None and expiration < time.time():
+            raise jwt.ExpiredSignature("Signature has expired")
+        return resource_path, filesize, username
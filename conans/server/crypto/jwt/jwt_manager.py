@@ -1,5 +1,8 @@
 from datetime import datetime
+import hashlib
+import time
 import jwt
+from conans.util.lru import LRUCache
 
 
 class JWTManager(object):
@@ -7,11 +10,13 @@ class JWTManager(object):
         Handles the JWT token generation and encryption.
     """
 
-    def __init__(self, secret, expire_time):
+    def __init__(self, secret, expire_time, cache_size=1024):
         """expire_time is a timedelta
-           secret is a string with the secret encoding key"""
+           secret is a string with the secret encoding key
+           cache_size is the max number of verified tokens kept, 0 disables the cache"""
         self.secret = secret
         self.expire_time = expire_time
+        self._verified = LRUCache(cache_size) if cache_size else None
 
     def get_token_for(self, profile_fields=None):
         """Generates a token with the provided fields.
@@ -26,5 +31,18 @@ class JWTManager(object):
     def get_profile(self, token):
         """Gets the user from credentials object. None if no credentials.
         Can raise jwt.ExpiredSignature and jwt.DecodeError"""
-        profile = jwt.decode(token, self.secret)
-        return profile
+        if self._verified is None:
+            return jwt.decode(token, self.secret)
+
+        # Tokens are verified once, and reused until its own expiration
+        key = hashlib.sha1(token if isinstance(token, bytes) else token.encode()).digest()
+        cached = self._verified.get(key)
+        if cached is not None:
+            profile, expiration = cached
+            if expiration is None or time.time() < expiration:
+                return dict(profile)
+            self._verified.pop(key)
+
+        profile = jwt.decode(token, self.secret)  # Raises if expired
+        self._verified.put(key, (profile, profile.get("exp")))
+        return dict(profile)
@@ -11,9 +11,11 @@ Replace this module with other that keeps the interface or super class.
 
 
 from abc import ABCMeta, abstractmethod
+from collections import defaultdict
 from conans.errors import ForbiddenException, InternalErrorException,\
     AuthenticationException
 from conans.model.ref import ConanFileReference
+from conans.util.lru import LRUCache
 
 #  ############################################
 #  ############ ABSTRACT CLASSES ##############
@@ -101,15 +103,35 @@ class BasicAuthorizer(Authorizer):
     Reads permissions from the config file (server.cfg)
     """
 
-    def __init__(self, read_permissions, write_permissions):
+    def __init__(self, read_permissions, write_permissions, cache_size=4096):
         """List of tuples with conanrefernce and users:
 
         [(conan_reference, "user, user, user"),
          (conan_reference2, "user3, user, user")] """
 
+        self._cache_size = cache_size
         self.read_permissions = read_permissions
         self.write_permissions = write_permissions
 
+    @property
+    def read_permissions(self):
+        return self._read_permissions
+
+    @read_permissions.setter
+    def read_permissions(self, rules):
+        """Assigning new rules (e.g. server config reload) discards the compiled ones"""
+        self._read_permissions = rules
+        self._read_rules = _CompiledRules(rules, self._cache_size)
+
+    @property
+    def write_permissions(self):
+        return self._write_permissions
+
+    @write_permissions.setter
+    def write_permissions(self, rules):
+        self._write_permissions = rules
+        self._write_rules = _CompiledRules(rules, self._cache_size)
+
     def check_read_conan(self, username, conan_reference):
         """
         username: User that request to read the conans
@@ -118,7 +140,7 @@ class BasicAuthorizer(Authorizer):
         if conan_reference.user == username:
             return
 
-        self._check_any_rule_ok(username, self.read_permissions, conan_reference)
+        self._check_any_rule_ok(username, self._read_rules, conan_reference)
 
     def check_write_conan(self, username, conan_reference):
         """
@@ -128,7 +150,7 @@ class BasicAuthorizer(Authorizer):
         if conan_reference.user == username:
             return True
 
-        self._check_any_rule_ok(username, self.write_permissions, conan_reference)
+        self._check_any_rule_ok(username, self._write_rules, conan_reference)
 
     def check_delete_conan(self, username, conan_reference):
         """
@@ -158,48 +180,63 @@ class BasicAuthorizer(Authorizer):
         """
         self.check_write_package(username, package_reference)
 
-    def _check_any_rule_ok(self, username, rules, *args, **kwargs):
-        for rule in rules:
-            # raises if don't
-            ret = self._check_rule_ok(username, rule, *args, **kwargs)
-            if ret:  # A rule is applied ok, if not apply keep looking
-                return True
+    def _check_any_rule_ok(self, username, rules, conan_reference):
+        if rules.allowed(username, conan_reference):
+            return True
         if username:
             raise ForbiddenException("Permission denied")
         else:
             raise AuthenticationException()
 
-    def _check_rule_ok(self, username, rule, conan_reference):
-        """Checks if a rule specified in config file applies to current conans
-        reference and current user"""
-        try:
-            rule_ref = ConanFileReference.loads(rule[0])
-        except Exception:
-            # TODO: Log error
-            raise InternalErrorException("Invalid server configuration. "
-                                         "Contact the administrator.")
-        authorized_users = rule[1].split(",")
-        if len(authorized_users) < 1:
-            raise InternalErrorException("Invalid server configuration. "
-                                         "Contact the administrator.")
-
-        # Check if rule apply conan_reference
-        if self._check_ref_apply_for_rule(rule_ref, conan_reference):
-            if authorized_users[0] == "*" or username in authorized_users:
-                return True  # Ok, applies and match username
-            else:
-                if username:
-                    raise ForbiddenException("Permission denied")
-                else:
-                    raise AuthenticationException()
 
+class _CompiledRules(object):
+    """Permission rules parsed once and indexed by (name, user) of the rule reference,
+    with "*" buckets for the wildcards. The first rule (in config file order) that applies
+    to a reference decides, so the candidates of the buckets are evaluated by rule position.
+    Decisions are memoized by (username, conan_reference)"""
+
+    def __init__(self, rules, cache_size):
+        self._buckets = defaultdict(list)
+        for index, rule in enumerate(rules):
+            try:
+                rule_ref = ConanFileReference.loads(rule[0])
+                authorized_users = rule[1].split(",")
+            except Exception:
+                # TODO: Log error
+                # Keep it so the error raises only if the rule is reached, as it is checked
+                self._buckets[("*", "*")].append((index, None, None, None))
+                continue
+            name, version, user, channel = rule_ref
+            self._buckets[(name, user)].append((index, version, channel, authorized_users))
+        self._decisions = LRUCache(cache_size)
+
+    def allowed(self, username, conan_reference):
+        """True if the first rule applying to conan_reference authorizes username,
+        False if it doesn't or no rule applies"""
+        key = (username, conan_reference)
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = self._decide(username, conan_reference)
+            self._decisions.put(key, decision)
+        return decision
+
+    def _candidates(self, conan_reference):
+        name, user = conan_reference.name, conan_reference.user
+        keys = set([(name, user), (name, "*"), ("*", user), ("*", "*")])
+        candidates = []
+        for key in keys:
+            candidates.extend(self._buckets.get(key, ()))
+        candidates.sort(key=lambda candidate: candidate[0])
+        return candidates
+
+    def _decide(self, username, conan_reference):
+        for _, version, channel, authorized_users in self._candidates(conan_reference):
+            if authorized_users is None:
+                raise InternalErrorException("Invalid server configuration. "
+                                             "Contact the administrator.")
+            if ((version != "*" and version != conan_reference.version) or
+                    (channel != "*" and channel != conan_reference.channel)):
+                continue
+            # Rule applies to conan_reference, it decides
+            return authorized_users[0] == "*" or username in authorized_users
         return False
-
-    def _check_ref_apply_for_rule(self, rule_ref, conan_reference):
-        """Checks if a conans reference specified in config file applies to current conans
-        reference"""
-        name, version, user, channel = rule_ref
-        return not((name != "*" and name != conan_reference.name) or
-                   (version != "*" and version != conan_reference.version) or
-                   (user != "*" and user != conan_reference.user) or
-                   (channel != "*" and channel != conan_reference.channel))
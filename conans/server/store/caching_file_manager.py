@@ -0,0 +1,184 @@
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from conans.errors import NotFoundException, ConanException
+from conans.model.manifest import FileTreeManifest
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import CONAN_MANIFEST
+from conans.server.store.file_manager import FileManager
+from conans.util.files import load, rmdir, mkdir, save
+from conans.util.log import logger
+from conans.util.lru import LRUCache
+
+# Folder of the recipe storage with a file for its export and package folders retrieved from
+# upstream, the ones without it were uploaded to the mirror. Outside those folders, so the
+# marks are not served with their files nor listed as packages
+UPSTREAM_MARKS = ".upstream"
+
+
+class CachingFileManager(FileManager):
+    '''FileManager for a pull-through mirror server. When a recipe or package is requested
+    and it is not in the local storage, it is fetched from the upstream remote with a
+    RestApiClient, stored, and served from the local storage from then on.
+
+    Local copies are revalidated against the upstream manifest once their ttl (seconds)
+    expires (None: never revalidate). The artifacts uploaded directly to the mirror are
+    never revalidated, nor replaced by the upstream ones. Concurrent misses for the same
+    artifact are coalesced, only one thread retrieves it while the others wait for it'''
+
+    def __init__(self, paths, storage_adapter, upstream_client, ttl=None, cache_size=10000):
+        super(CachingFileManager, self).__init__(paths, storage_adapter)
+        self._upstream = upstream_client
+        self.ttl = ttl
+        # {reference: time of last check against upstream}, the evicted ones are validated again
+        self._validated = LRUCache(cache_size)
+        self._locks = {}  # {reference: [lock, number of threads using it]}
+        self._locks_lock = threading.Lock()
+
+    # ############ SNAPSHOTS
+    def get_recipe(self, conan_reference):
+        self._pull_recipe(conan_reference)
+        return super(CachingFileManager, self).get_recipe(conan_reference)
+
+    def get_conanfile_snapshot(self, reference):
+        self._pull_recipe(reference)
+        return super(CachingFileManager, self).get_conanfile_snapshot(reference)
+
+    def get_package_snapshot(self, package_reference):
+        self._pull_package(package_reference)
+        return super(CachingFileManager, self).get_package_snapshot(package_reference)
+
+    # ############ DOWNLOAD URLS
+    def get_download_conanfile_urls(self, reference, files_subset=None, user=None):
+        self._pull_recipe(reference)
+        return super(CachingFileManager, self).get_download_conanfile_urls(reference,
+                                                                           files_subset, user)
+
+    def get_download_package_urls(self, package_reference, files_subset=None, user=None):
+        self._pull_package(package_reference)
+        return super(CachingFileManager, self).get_download_package_urls(package_reference,
+                                                                         files_subset, user)
+
+    # ############ UPLOAD URLS
+    def get_upload_conanfile_urls(self, reference, filesizes, user):
+        _remove_upstream_mark(self.paths.export(reference), self.paths.conan(reference))
+        return super(CachingFileManager, self).get_upload_conanfile_urls(reference, filesizes,
+                                                                         user)
+
+    def get_upload_package_urls(self, package_reference, filesizes, user):
+        _remove_upstream_mark(self.paths.package(package_reference),
+                              self.paths.conan(package_reference.conan))
+        return super(CachingFileManager, self).get_upload_package_urls(package_reference,
+                                                                       filesizes, user)
+
+    # ############ UPSTREAM RETRIEVAL
+    def _pull_recipe(self, reference):
+        assert isinstance(reference, ConanFileReference)
+        self._pull(reference, self.paths.export(reference), self.paths.conan(reference),
+                   self._upstream.get_conan_digest, self._upstream.get_recipe)
+
+    def _pull_package(self, package_reference):
+        assert isinstance(package_reference, PackageReference)
+        self._pull(package_reference, self.paths.package(package_reference),
+                   self.paths.conan(package_reference.conan),
+                   self._upstream.get_package_digest, self._upstream.get_package)
+
+    def _pull(self, reference, folder, tmp_parent, get_digest, retrieve):
+        if self._is_fresh(reference, folder, tmp_parent):
+            return
+
+        with self._lock(reference):
+            # Other thread could have already retrieved it while waiting
+            if self._is_fresh(reference, folder, tmp_parent):
+                return
+            manifest_path = os.path.join(folder, CONAN_MANIFEST)
+            if os.path.exists(manifest_path):
+                try:
+                    remote_manifest = get_digest(reference)
+                except NotFoundException:
+                    # Removed from upstream, the mirror keeps serving its copy
+                    logger.info("Mirrored %s not found in upstream" % str(reference))
+                    self._validated.put(reference, time.time())
+                    return
+                except ConanException as exc:
+                    logger.error("Upstream not available, serving %s from local storage: %s"
+                                 % (str(reference), str(exc)))
+                    return
+                if remote_manifest == FileTreeManifest.loads(load(manifest_path)):
+                    self._validated.put(reference, time.time())
+                    return
+
+            logger.debug("Retrieving %s from upstream" % str(reference))
+            self._retrieve(reference, folder, tmp_parent, retrieve)
+            self._validated.put(reference, time.time())
+
+    def _is_fresh(self, reference, folder, conan_folder):
+        if not os.path.exists(os.path.join(folder, CONAN_MANIFEST)):
+            return False
+        if self.ttl is None:
+            return True
+        if not os.path.exists(_upstream_mark(folder, conan_folder)):  # Uploaded here
+            return True
+        # Existing in storage but not validated yet (e.g. server restart), validate it
+        validated = self._validated.get(reference)
+        return validated is not None and time.time() - validated < self.ttl
+
+    def _retrieve(self, reference, folder, tmp_parent, retrieve):
+        """ Downloads to a temporary folder in the reference one, so no partial
+        artifact is ever served, and then replaces the destination one. The previous one
+        is moved aside and deleted after the replacement, so the readers not taking the
+        lock find the folder in place"""
+        mkdir(tmp_parent)
+        tmp_folder = tempfile.mkdtemp(dir=tmp_parent, prefix=".upstream_")
+        old_folder = os.path.join(tmp_parent, ".replaced_%s" % uuid.uuid4().hex)
+        try:
+            retrieve(reference, tmp_folder)
+            if os.path.exists(folder):
+                os.rename(folder, old_folder)
+            else:
+                mkdir(os.path.dirname(folder))
+            save(_upstream_mark(folder, tmp_parent), "")
+            os.rename(tmp_folder, folder)
+        except NotFoundException:
+            # Not in upstream either, do not leave empty reference folders in storage
+            rmdir(tmp_folder)
+            conan_reference = getattr(reference, "conan", reference)
+            self._storage_adapter.delete_empty_dirs([conan_reference])
+            raise
+        finally:
+            rmdir(tmp_folder)
+            rmdir(old_folder)
+
+    @contextmanager
+    def _lock(self, reference):
+        """ lock of the reference, removed when no thread is using it
+        """
+        with self._locks_lock:
+            entry = self._locks.get(reference)
+            if entry is None:
+                entry = self._locks[reference] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._locks_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[reference]
+
+
+def _upstream_mark(folder, conan_folder):
+    """ the file marking the export or package folder as retrieved from upstream
+    """
+    return os.path.join(conan_folder, UPSTREAM_MARKS, os.path.relpath(folder, conan_folder))
+
+
+def _remove_upstream_mark(folder, conan_folder):
+    try:
+        os.remove(_upstream_mark(folder, conan_folder))
+    except OSError:
+        pass
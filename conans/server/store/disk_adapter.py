@@ -5,6 +5,7 @@ from conans.errors import NotFoundException
 from conans.util.files import relative_dirs, rmdir, md5sum, decode_text
 from conans.util.files import path_exists
 from conans.paths import SimplePaths
+from conans.search import DiskSearchAdapter
 
 
 class ServerStorageAdapter(object):
@@ -30,6 +31,11 @@ class ServerStorageAdapter(object):
     def delete_empty_dirs(self, deleted_refs):
         raise NotImplementedError()
 
+    @abstractmethod
+    def search_adapter(self):
+        """ SearchAdapterABC able to search in this storage """
+        raise NotImplementedError()
+
 
 class ServerDiskAdapter(ServerStorageAdapter):
     '''Manage access to disk files with common methods required
@@ -111,3 +117,6 @@ class ServerDiskAdapter(ServerStorageAdapter):
                     except OSError:
                         break  # not empty
                 ref_path = os.path.dirname(ref_path)
+
+    def search_adapter(self):
+        return DiskSearchAdapter()
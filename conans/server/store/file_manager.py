@@ -16,6 +16,10 @@ class FileManager(object):
         self.paths = paths
         self._storage_adapter = storage_adapter
 
+    @property
+    def search_adapter(self):
+        return self._storage_adapter.search_adapter()
+
     # ############ SNAPSHOTS
     def get_recipe(self, conan_reference):
         conanfile_path = self.paths.conanfile(conan_reference)
@@ -0,0 +1,73 @@
+'''Object storage backends (S3 like) for the ServerObjectStoreAdapter.'''
+from abc import ABCMeta, abstractmethod
+from conans.errors import NotFoundException
+
+
+class ObjectStore(object):
+    """ Flat key/value storage of files, able to generate presigned urls so clients
+    transfer the contents directly to/from the storage. Keys are "/" separated paths
+    """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def get_download_url(self, key, expires_in):
+        """ Presigned url to GET the object, valid for expires_in seconds """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_upload_url(self, key, size, expires_in):
+        """ Presigned url to PUT the object contents, valid for expires_in seconds """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def list(self, prefix=""):
+        """ Returns {key: md5} of the objects which key starts with prefix """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get(self, key):
+        """ Returns the object contents (bytes). Raises NotFoundException """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def delete(self, keys):
+        raise NotImplementedError()
+
+
+class S3ObjectStore(ObjectStore):
+    """ Amazon S3 or compatible (e.g. MinIO, with host) storage. Credentials are
+    read by boto from the environment (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY) or its
+    config files """
+
+    def __init__(self, bucket_name, host=None):
+        # Optional dependency, only needed if this adapter is used
+        from boto.s3.connection import S3Connection, OrdinaryCallingFormat
+        if host:
+            self._connection = S3Connection(host=host, calling_format=OrdinaryCallingFormat())
+        else:
+            self._connection = S3Connection()
+        self._bucket_name = bucket_name
+        self._bucket = self._connection.get_bucket(bucket_name, validate=False)
+
+    def get_download_url(self, key, expires_in):
+        return self._connection.generate_url(expires_in, "GET", bucket=self._bucket_name,
+                                             key=key)
+
+    def get_upload_url(self, key, size, expires_in):
+        return self._connection.generate_url(expires_in, "PUT", bucket=self._bucket_name,
+                                             key=key)
+
+    def list(self, prefix=""):
+        # Etag is the md5 of the contents for non multipart uploads
+        return {s3_key.name: s3_key.etag.strip('"')
+                for s3_key in self._bucket.list(prefix=prefix)}
+
+    def get(self, key):
+        s3_key = self._bucket.get_key(key)
+        if s3_key is None:
+            raise NotFoundException("")
+        return s3_key.get_contents_as_string()
+
+    def delete(self, keys):
+        if keys:
+            self._bucket.delete_keys(list(keys))
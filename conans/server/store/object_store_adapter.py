@@ -0,0 +1,109 @@
+'''Adapter for access to object storages (S3 like), with presigned urls.'''
+import os
+from conans.errors import NotFoundException
+from conans.search import SearchAdapterABC
+from conans.server.store.disk_adapter import ServerStorageAdapter
+from conans.util.files import decode_text
+
+
+class ServerObjectStoreAdapter(ServerStorageAdapter):
+    '''Manage the conan files stored in an ObjectStore. The download and upload urls are
+    presigned storage urls, so the file transfers don't go through the api server, and
+    the api server keeps no state (several instances can share the storage).
+
+    Paths received are like the disk ones, relative to base_storage_path, which is not
+    a real folder, just the root of the object keys'''
+    def __init__(self, object_store, base_storage_path, expire_time):
+        """
+        :param: expire_time timedelta for the presigned urls"""
+        self._store = object_store
+        self._store_folder = base_storage_path
+        self._expires_in = int(expire_time.total_seconds())
+
+    def _key(self, path):
+        return os.path.relpath(path, self._store_folder).replace("\\", "/")
+
+    def _path(self, key):
+        return os.path.normpath(os.path.join(self._store_folder, key))
+
+    def get_download_urls(self, paths, user=None):
+        '''returns a dict with this structure: {"filepath": "http://..."}
+
+        paths is a list of path files '''
+        assert isinstance(paths, list)
+        return {filepath: self._store.get_download_url(self._key(filepath), self._expires_in)
+                for filepath in paths}
+
+    def get_upload_urls(self, paths_sizes, user=None):
+        '''returns a dict with this structure: {"filepath": "http://..."}
+
+        paths_sizes is a dict of {path: size_in_bytes} '''
+        assert isinstance(paths_sizes, dict)
+        return {filepath: self._store.get_upload_url(self._key(filepath), filesize,
+                                                     self._expires_in)
+                for filepath, filesize in paths_sizes.items()}
+
+    def get_snapshot(self, absolute_path="", files_subset=None):
+        """returns a dict with the filepaths and md5"""
+        prefix = self._key(absolute_path) + "/"
+        objects = self._store.list(prefix)
+        if not objects:
+            raise NotFoundException("")
+        snapshot = {self._path(key): the_md5 for key, the_md5 in objects.items()}
+        if files_subset is not None:
+            subset = set(os.path.normpath(os.path.join(absolute_path, relpath))
+                         for relpath in files_subset)
+            snapshot = {filepath: the_md5 for filepath, the_md5 in snapshot.items()
+                        if filepath in subset}
+        return snapshot
+
+    def delete_folder(self, path):
+        keys = list(self._store.list(self._key(path) + "/").keys())
+        if not keys:
+            raise NotFoundException("")
+        self._store.delete(keys)
+
+    def delete_file(self, path):
+        key = self._key(path)
+        if key not in self._store.list(key):
+            raise NotFoundException("")
+        self._store.delete([key])
+
+    def delete_empty_dirs(self, deleted_refs):
+        """ There are no folders in an object storage """
+        pass
+
+    def search_adapter(self):
+        return ObjectStoreSearchAdapter(self._store, self._store_folder)
+
+
+class ObjectStoreSearchAdapter(SearchAdapterABC):
+    """ Search adapter emulating the folder tree with the object keys """
+
+    def __init__(self, object_store, base_storage_path):
+        self._store = object_store
+        self._store_folder = base_storage_path
+
+    def _key(self, path):
+        key = os.path.relpath(path, self._store_folder).replace("\\", "/")
+        return "" if key == "." else key
+
+    def list_folder_subdirs(self, basedir, level):
+        prefix = self._key(basedir)
+        prefix = prefix + "/" if prefix else ""
+        ret = set()
+        for key in self._store.list(prefix):
+            tokens = key[len(prefix):].split("/")
+            if len(tokens) > level:  # Last token is the file name
+                ret.add("/".join(tokens[:level]))
+        return sorted(ret)
+
+    def path_exists(self, path, basedir=None):
+        key = self._key(path)
+        return key in self._store.list(key)
+
+    def load(self, filepath):
+        return decode_text(self._store.get(self._key(filepath)))
+
+    def join_paths(self, *args):
+        return os.path.join(*args)
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+import unittest
+from datetime import timedelta
+from conans.model.manifest import FileTreeManifest
+from conans.model.ref import ConanFileReference
+from conans.paths import SimplePaths, CONANFILE, CONAN_MANIFEST
+from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
+from conans.server.store.caching_file_manager import CachingFileManager, UPSTREAM_MARKS
+from conans.server.store.disk_adapter import ServerDiskAdapter
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save, load
+
+
+class FakeUpstream(object):
+
+    def __init__(self):
+        self.retrieved = 0
+        self.manifest = FileTreeManifest(123, {CONANFILE: "1"})
+
+    def get_conan_digest(self, _):
+        return self.manifest
+
+    def get_recipe(self, _, dest_folder):
+        time.sleep(0.1)  # Slow network, so concurrent requests are waiting for it
+        self.retrieved += 1
+        save(os.path.join(dest_folder, CONANFILE), "from conans import ConanFile")
+        save(os.path.join(dest_folder, CONAN_MANIFEST), str(self.manifest))
+
+
+class CachingFileManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = temp_folder()
+        updown_auth_manager = JWTUpDownAuthManager("secret", timedelta(seconds=200))
+        adapter = ServerDiskAdapter("http://fake/files", self.store, updown_auth_manager)
+        self.upstream = FakeUpstream()
+        self.file_manager = CachingFileManager(SimplePaths(self.store), adapter,
+                                               self.upstream, ttl=None)
+        self.reference = ConanFileReference.loads("openssl/2.0.1@lasote/testing")
+
+    def coalesce_misses_test(self):
+        threads = [threading.Thread(target=self.file_manager.get_conanfile_snapshot,
+                                    args=(self.reference, )) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.upstream.retrieved, 1)
+        snapshot = self.file_manager.get_conanfile_snapshot(self.reference)
+        self.assertEqual(sorted(snapshot.keys()), [CONANFILE, CONAN_MANIFEST])
+        self.assertEqual(self.upstream.retrieved, 1)
+
+    def revalidate_test(self):
+        self.file_manager.ttl = 0
+        self.file_manager.get_conanfile_snapshot(self.reference)
+        self.file_manager.get_conanfile_snapshot(self.reference)
+        self.assertEqual(self.upstream.retrieved, 1)
+
+        self.upstream.manifest = FileTreeManifest(124, {CONANFILE: "2"})
+        self.file_manager.get_conanfile_snapshot(self.reference)
+        self.assertEqual(self.upstream.retrieved, 2)
+        manifest_path = self.file_manager.paths.digestfile_conanfile(self.reference)
+        self.assertEqual(load(manifest_path), str(self.upstream.manifest))
+
+    def bounded_state_test(self):
+        self.file_manager = CachingFileManager(self.file_manager.paths,
+                                               self.file_manager._storage_adapter,
+                                               self.upstream, ttl=1000, cache_size=1)
+        other = ConanFileReference.loads("zlib/1.2.8@lasote/testing")
+        self.file_manager.get_conanfile_snapshot(self.reference)
+        self.file_manager.get_conanfile_snapshot(other)
+        self.assertEqual(len(self.file_manager._validated), 1)
+        self.assertEqual(self.file_manager._locks, {})
+
+        # The evicted one is validated again, and the replaced folder removed
+        self.upstream.manifest = FileTreeManifest(124, {CONANFILE: "2"})
+        self.file_manager.get_conanfile_snapshot(self.reference)
+        self.assertEqual(self.upstream.retrieved, 3)
+        conan_folder = self.file_manager.paths.conan(self.reference)
+        self.assertEqual(sorted(os.listdir(conan_folder)), [UPSTREAM_MARKS, "export"])
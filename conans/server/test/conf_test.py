@@ -49,6 +49,7 @@ class ServerConfTest(unittest.TestCase):
         self.assertEquals(config.read_permissions, [("*/*@*/*", "*"),
                                                     ("openssl/2.0.1@lasote/testing", "pepe")])
         self.assertEquals(config.users, {"lasote": "defaultpass", "pepe": "pepepass"})
+        self.assertEquals(config.updown_signature, "jwt")
 
         # Now check with environments
         tmp_storage = temp_folder()
@@ -58,6 +59,7 @@ class ServerConfTest(unittest.TestCase):
         self.environ["CONAN_SSL_ENABLED"] = "False"
         self.environ["CONAN_SERVER_PORT"] = "1233"
         self.environ["CONAN_SERVER_USERS"] = "lasote:lasotepass,pepe2:pepepass2"
+        self.environ["CONAN_UPDOWN_SIGNATURE"] = "hmac"
 
         config = ConanServerConfigParser(self.file_path, environment=self.environ)
         self.assertEquals(config.jwt_secret,  "newkey")
@@ -69,3 +71,4 @@ class ServerConfTest(unittest.TestCase):
         self.assertEquals(config.read_permissions, [("*/*@*/*", "*"),
                                                     ("openssl/2.0.1@lasote/testing", "pepe")])
         self.assertEquals(config.users, {"lasote": "lasotepass", "pepe2": "pepepass2"})
+        self.assertEquals(config.updown_signature, "hmac")
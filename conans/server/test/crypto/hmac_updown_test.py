@@ -0,0 +1,27 @@
+import unittest
+from datetime import timedelta
+import time
+import jwt
+from conans.server.crypto.jwt.hmac_updown_manager import HMACUpDownAuthManager
+
+
+class HMACUpDownTest(unittest.TestCase):
+
+    def resource_info_test(self):
+        manager = HMACUpDownAuthManager("123123123qweqwe", timedelta(seconds=1))
+        token = manager.get_token_for("lasote/openssl/1.0/conanfile.py", "lasote", 23)
+        self.assertEquals(manager.get_resource_info(token),
+                          ("lasote/openssl/1.0/conanfile.py", 23, "lasote"))
+        # As it comes in the url query
+        self.assertEquals(manager.get_resource_info(token.decode("ascii")),
+                          ("lasote/openssl/1.0/conanfile.py", 23, "lasote"))
+
+        other = HMACUpDownAuthManager("othersecret", timedelta(seconds=1))
+        self.assertRaises(jwt.DecodeError, other.get_resource_info, token)
+        payload, signature = token.split(b".")
+        self.assertRaises(jwt.DecodeError, manager.get_resource_info, b"a" + payload + b"." +
+                          signature)
+        self.assertRaises(jwt.DecodeError, manager.get_resource_info, "invalid_token")
+
+        time.sleep(2)
+        self.assertRaises(jwt.ExpiredSignature, manager.get_resource_info, token)
@@ -36,3 +36,23 @@ class JwtTest(unittest.TestCase):
         token = manager.get_token_for("lasote")
         self.assertEquals(manager.get_user(token), "lasote")
         self.assertRaises(DecodeError, manager.get_user, "invalid_user")
+
+    def jwt_verified_cache_test(self):
+        manager = JWTManager(self.secret, self.expire_time)
+        profile = {"hello": "world"}
+        token = manager.get_token_for(profile)
+        self.assertEquals(manager.get_profile(token), profile)
+
+        # Cached verification returns the same profile, and it can't be altered from outside
+        cached = manager.get_profile(token)
+        self.assertEquals(cached, profile)
+        cached["hello"] = "changed"
+        self.assertEquals(manager.get_profile(token), profile)
+
+        # A token signed with other secret is not accepted due to the cache
+        other = JWTManager("othersecret", self.expire_time)
+        self.assertRaises(DecodeError, other.get_profile, token)
+
+        # Cached tokens expire too
+        time.sleep(2)
+        self.assertRaises(jwt.ExpiredSignature, manager.get_profile, token)
@@ -136,4 +136,30 @@ class AuthorizerTest(unittest.TestCase):
         self.assertRaises(ForbiddenException,
                           authorizer.check_write_package, "pepe", self.package_reference2)
 
+    def rules_order_test(self):
+        """The first rule that applies decides, whatever the bucket it is indexed in"""
+        read_perms = [("*/*@lasote/*", "pepe"), ("openssl/*@*/*", "juan"), ("*/*@*/*", "*")]
+        authorizer = BasicAuthorizer(read_perms, [])
+        authorizer.check_read_conan("pepe", self.openssl_ref)
+        self.assertRaises(ForbiddenException,
+                          authorizer.check_read_conan, "juan", self.openssl_ref)
+        tmp_ref = ConanFileReference.loads("openssl/2.0.1@alfred/testing")
+        authorizer.check_read_conan("juan", tmp_ref)
+        self.assertRaises(ForbiddenException,
+                          authorizer.check_read_conan, "pepe", tmp_ref)
+        authorizer.check_read_conan("pepe", ConanFileReference.loads("zlib/1.2.8@alfred/testing"))
 
+    def reload_permissions_test(self):
+        read_perms = [(str(self.openssl_ref), "lasote"), ("*/*@*/*", "*")]
+        authorizer = BasicAuthorizer(read_perms, [])
+        self.assertRaises(ForbiddenException,
+                          authorizer.check_read_conan, "pepe", self.openssl_ref)
+        # Decision is cached, asking again gives the same
+        self.assertRaises(ForbiddenException,
+                          authorizer.check_read_conan, "pepe", self.openssl_ref)
+
+        # New rules from config discard the cached decisions
+        authorizer.read_permissions = [(str(self.openssl_ref), "pepe")]
+        authorizer.check_read_conan("pepe", self.openssl_ref)
+        self.assertRaises(ForbiddenException,
+                          authorizer.check_read_conan, "juan", self.openssl_ref2)
@@ -0,0 +1,90 @@
+import hashlib
+import hmac
+import threading
+import time
+
+from bottle import Bottle, request, abort, HTTPResponse
+from six.moves.urllib.parse import urlencode
+
+from conans.errors import NotFoundException
+from conans.server.store.object_store import ObjectStore
+
+
+class FakeObjectStore(ObjectStore):
+    """ In memory ObjectStore for testing. It also serves the presigned urls with a bottle
+    app, validating the signature, expiration and size (uploads) like a real storage.
+    Mount the app in the server app so the TestRequester routes the calls to it:
+
+        root_app.mount("/objectstore/", store.app)
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.objects = {}  # {key: bytes}
+        self._secret = b"fake_object_store_secret"
+        self._lock = threading.Lock()
+        self.app = Bottle()
+        self.app.route("/<key:path>", method="GET", callback=self._serve_get)
+        self.app.route("/<key:path>", method="PUT", callback=self._serve_put)
+
+    # ############ ObjectStore interface
+    def get_download_url(self, key, expires_in):
+        return self._presign("GET", key, expires_in)
+
+    def get_upload_url(self, key, size, expires_in):
+        return self._presign("PUT", key, expires_in, size)
+
+    def list(self, prefix=""):
+        with self._lock:
+            return {key: hashlib.md5(contents).hexdigest()
+                    for key, contents in self.objects.items() if key.startswith(prefix)}
+
+    def get(self, key):
+        with self._lock:
+            try:
+                return self.objects[key]
+            except KeyError:
+                raise NotFoundException("")
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self.objects.pop(key, None)
+
+    # ############ Presigned urls
+    def _signature(self, method, key, expires, size):
+        message = "%s\n%s\n%s\n%s" % (method, key, expires, size)
+        return hmac.new(self._secret, message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def _presign(self, method, key, expires_in, size=None):
+        expires = int(time.time()) + expires_in
+        query = {"expires": expires, "signature": self._signature(method, key, expires, size)}
+        if size is not None:
+            query["size"] = size
+        return "%s/%s?%s" % (self.base_url, key, urlencode(query))
+
+    def _check_signature(self, method, key):
+        expires = request.query.get("expires", "0")
+        size = request.query.get("size", None)
+        expected = self._signature(method, key, expires, size)
+        if not hmac.compare_digest(expected, request.query.get("signature", "")):
+            abort(403, "Invalid signature")
+        if int(expires) < time.time():
+            abort(403, "Expired url")
+        return size
+
+    def _serve_get(self, key):
+        self._check_signature("GET", key)
+        try:
+            contents = self.get(key)
+        except NotFoundException:
+            abort(404, "Not found")
+        return HTTPResponse(contents, headers={"Content-Length": str(len(contents))})
+
+    def _serve_put(self, key):
+        size = self._check_signature("PUT", key)
+        contents = request.body.read()
+        if size is not None and len(contents) != int(size):
+            abort(401, "Size mismatch")
+        with self._lock:
+            self.objects[key] = contents
@@ -1,16 +1,13 @@
 #!/usr/bin/python
 from conans.server.service.authorize import BasicAuthorizer, BasicAuthenticator
 import os
-from conans.server.conf import get_file_manager
+from conans.server.conf import get_file_manager, get_updown_auth_manager, get_search_manager
 from conans.server.rest.server import ConanServer
 from conans.server.crypto.jwt.jwt_credentials_manager import JWTCredentialsManager
-from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
 from conans.util.log import logger
 from conans.util.files import mkdir
 from conans.test.utils.test_files import temp_folder
 from conans.server.migrate import migrate_and_get_server_config
-from conans.search import DiskSearchAdapter, DiskSearchManager
-from conans.paths import SimplePaths
 
 
 TESTING_REMOTE_PRIVATE_USER = "private_user"
@@ -23,7 +20,8 @@ class TestServerLauncher(object):
     def __init__(self, base_path=None, read_permissions=None,
                  write_permissions=None, users=None, base_url=None, plugins=None,
                  server_version=None,
-                 min_client_compatible_version=None):
+                 min_client_compatible_version=None, upstream_client=None,
+                 object_store=None):
 
         plugins = plugins or []
         if not base_path:
@@ -42,13 +40,13 @@ class TestServerLauncher(object):
             TestServerLauncher.port = server_config.port
 
         # Encode and Decode signature for Upload and Download service
-        updown_auth_manager = JWTUpDownAuthManager(server_config.updown_secret,
-                                                   server_config.authorize_timeout)
+        updown_auth_manager = get_updown_auth_manager(server_config)
         self.file_manager = get_file_manager(server_config, public_url=base_url,
-                                             updown_auth_manager=updown_auth_manager)
+                                             updown_auth_manager=updown_auth_manager,
+                                             upstream_client=upstream_client,
+                                             object_store=object_store)
 
-        search_adapter = DiskSearchAdapter()
-        self.search_manager = DiskSearchManager(SimplePaths(server_config.disk_storage_path), search_adapter)
+        self.search_manager = get_search_manager(self.file_manager)
         # Prepare some test users
         if not read_permissions:
             read_permissions = server_config.read_permissions
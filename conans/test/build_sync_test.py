@@ -0,0 +1,67 @@
+import os
+import platform
+import unittest
+from conans.client.build_sync import sync_folder
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save, load
+from conans.tools import replace_in_file, patch
+
+
+class BuildSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.src = temp_folder()
+        self.build = temp_folder()
+        save(os.path.join(self.src, "CMakeLists.txt"), "cmake")
+        save(os.path.join(self.src, "src/hello.cpp"), "hello")
+        save(os.path.join(self.src, "src/bye.cpp"), "bye")
+
+    def incremental_test(self):
+        self.assertEqual(3, sync_folder(self.src, self.build))
+        self.assertEqual("hello", load(os.path.join(self.build, "src/hello.cpp")))
+        save(os.path.join(self.build, "hello.o"), "binary")  # Build product
+
+        # Nothing changed, nothing copied
+        self.assertEqual(0, sync_folder(self.src, self.build))
+
+        # New, modified and removed source files
+        save(os.path.join(self.src, "src/new.cpp"), "new")
+        save(os.path.join(self.src, "src/hello.cpp"), "hello world")
+        os.remove(os.path.join(self.src, "src/bye.cpp"))
+        # Sources patched in the build folder are restored
+        save(os.path.join(self.build, "CMakeLists.txt"), "patched cmake")
+        self.assertEqual(3, sync_folder(self.src, self.build))
+        self.assertEqual("hello world", load(os.path.join(self.build, "src/hello.cpp")))
+        self.assertEqual("new", load(os.path.join(self.build, "src/new.cpp")))
+        self.assertEqual("cmake", load(os.path.join(self.build, "CMakeLists.txt")))
+        self.assertFalse(os.path.exists(os.path.join(self.build, "src/bye.cpp")))
+        self.assertEqual("binary", load(os.path.join(self.build, "hello.o")))
+
+    def link_test(self):
+        if platform.system() == "Windows":
+            return
+        os.symlink("hello.cpp", os.path.join(self.src, "src/link.cpp"))
+        sync_folder(self.src, self.build, link=True)
+        self.assertTrue(os.path.samefile(os.path.join(self.src, "src/hello.cpp"),
+                                         os.path.join(self.build, "src/hello.cpp")))
+        self.assertEqual("hello.cpp", os.readlink(os.path.join(self.build, "src/link.cpp")))
+        self.assertEqual(0, sync_folder(self.src, self.build, link=True))
+
+        # Sources modified in the build folder by the tools do not change the shared ones
+        replace_in_file(os.path.join(self.build, "src/hello.cpp"), "hello", "patched")
+        save(os.path.join(self.build, "src/bye.cpp"), " appended", append=True)
+        patch(self.build, patch_string="""--- a/CMakeLists.txt
++++ b/CMakeLists.txt
+@@ -1 +1 @@
+-cmake
++patched cmake
+""")
+        self.assertEqual("patched", load(os.path.join(self.build, "src/hello.cpp")))
+        self.assertEqual("bye appended", load(os.path.join(self.build, "src/bye.cpp")))
+        self.assertIn("patched cmake", load(os.path.join(self.build, "CMakeLists.txt")))
+        self.assertEqual("hello", load(os.path.join(self.src, "src/hello.cpp")))
+        self.assertEqual("bye", load(os.path.join(self.src, "src/bye.cpp")))
+        self.assertEqual("cmake", load(os.path.join(self.src, "CMakeLists.txt")))
+        # And they are restored by the next sync
+        self.assertEqual(3, sync_folder(self.src, self.build, link=True))
+        self.assertEqual("hello", load(os.path.join(self.build, "src/hello.cpp")))
@@ -0,0 +1,32 @@
+import os
+import unittest
+from conans.client.client_cache import ClientCache, SETTINGS_SNAPSHOT
+from conans.test.tools import TestBufferConanOutput
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save, load
+from conans.client.conf import default_settings_yml
+
+
+class ClientCacheTest(unittest.TestCase):
+
+    def settings_snapshot_test(self):
+        folder = temp_folder()
+        client_cache = ClientCache(folder, None, TestBufferConanOutput())
+        self.assertIn("Windows", client_cache.settings.os.values_range)
+        snapshot = os.path.join(client_cache.conan_folder, SETTINGS_SNAPSHOT)
+        self.assertTrue(os.path.exists(snapshot))
+
+        # Read from the snapshot
+        client_cache = ClientCache(folder, None, TestBufferConanOutput())
+        self.assertIn("Windows", client_cache.settings.os.values_range)
+
+        # Modified settings.yml are parsed again
+        save(client_cache.settings_path, default_settings_yml.replace("Windows,", "MyOS,"))
+        client_cache = ClientCache(folder, None, TestBufferConanOutput())
+        self.assertIn("MyOS", client_cache.settings.os.values_range)
+
+        # Corrupted snapshot is ignored and generated again
+        save(snapshot, "corrupted")
+        client_cache = ClientCache(folder, None, TestBufferConanOutput())
+        self.assertIn("MyOS", client_cache.settings.os.values_range)
+        self.assertNotEqual(load(snapshot), "corrupted")
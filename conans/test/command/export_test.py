@@ -177,6 +177,35 @@ class OpenSSLConan(ConanFile):
         # for f in file_list:
         #    self.assertFalse(os.path.exists(f))
 
+    def test_export_delta(self):
+        reg_path = self.conan.paths.export(self.conan_ref)
+        main = os.path.join(reg_path, "main.cpp")
+        main_stat = os.stat(main)
+        save(os.path.join(reg_path, "conanfile.pyc"), "")
+
+        # Unchanged files are not copied again
+        self.conan.run("export lasote/stable")
+        self.assertIn("The stored package has not changed", self.conan.user_io.out)
+        self.assertEqual(main_stat.st_ino, os.stat(main).st_ino)
+        self.assertEqual(main_stat.st_mtime, os.stat(main).st_mtime)
+
+        # Modified and new files are copied, the removed ones deleted
+        files = cpp_hello_conan_files("Hello0", "0.1")
+        files["hello.cpp"] = "// Modified\n" + files["hello.cpp"]
+        files["data/new.txt"] = "new"
+        files[CONANFILE] = files[CONANFILE].replace("exports = '*'",
+                                                      "exports = '*.cpp', '*.txt'")
+        self.conan.save(files, clean_first=True)
+        self.conan.run("export lasote/stable")
+        self.assertIn("A new conanfile.py version was exported", self.conan.user_io.out)
+        self.assertEqual(main_stat.st_mtime, os.stat(main).st_mtime)
+        self.assertEqual(load(os.path.join(reg_path, "hello.cpp")), files["hello.cpp"])
+        self.assertEqual(sorted(os.listdir(reg_path)),
+                         sorted(["CMakeLists.txt", "conanfile.py", "conanmanifest.txt", "data",
+                                 "hello.cpp", "main.cpp"]))
+        manifest = FileTreeManifest.loads(load(os.path.join(reg_path, CONAN_MANIFEST)))
+        self.assertEqual(manifest.file_sums, FileTreeManifest.create(reg_path).file_sums)
+
     def _create_packages_and_builds(self):
         reg_builds = self.conan.paths.builds(self.conan_ref)
         reg_packs = self.conan.paths.packages(self.conan_ref)
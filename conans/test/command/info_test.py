@@ -1,5 +1,9 @@
+import json
+import os
 import unittest
-from conans.test.tools import TestClient
+from mock import patch
+from six import StringIO
+from conans.test.tools import TestClient, TestServer
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
 from conans.paths import CONANFILE
 import textwrap
@@ -168,3 +172,56 @@ class InfoTest(unittest.TestCase):
                       "[Dev2/0.1@lasote/stable, LibA/0.1@lasote/stable, LibE/0.1@lasote/stable, "
                       "LibF/0.1@lasote/stable], [LibB/0.1@lasote/stable, LibC/0.1@lasote/stable]",
                       self.client.user_io.out)
+
+    def json_test(self):
+        self.client = TestClient()
+        self._create("Hello0", "0.1")
+        self._create("Hello1", "0.1", ["Hello0/0.1@lasote/stable"])
+        self._create("Hello2", "0.1", ["Hello1/0.1@lasote/stable"], export=False)
+
+        self.client.run("info --json")
+        records = [json.loads(line) for line in str(self.client.user_io.out).splitlines()]
+        timings = records[0]
+        self.assertEqual("timings", timings["type"])
+        self.assertEqual(set(["type", "fetch", "load", "configure", "propagate"]),
+                         set(timings))
+        nodes = [r for r in records if r["type"] == "node"]
+        # Dependencies first
+        self.assertEqual(["Hello0/0.1@lasote/stable", "Hello1/0.1@lasote/stable",
+                          "Hello2/0.1@PROJECT"], [n["reference"] for n in nodes])
+        self.assertEqual("missing", nodes[0]["binary"])
+        self.assertIsNone(nodes[0]["remote"])
+        self.assertEqual(40, len(nodes[0]["package_id"]))
+        ids = {n["reference"]: n["id"] for n in nodes}
+        edges = [(r["src"], r["dst"]) for r in records if r["type"] == "edge"]
+        self.assertEqual(sorted([(ids["Hello2/0.1@PROJECT"], ids["Hello1/0.1@lasote/stable"]),
+                                 (ids["Hello1/0.1@lasote/stable"],
+                                  ids["Hello0/0.1@lasote/stable"])]), sorted(edges))
+
+        self.client.run("install --build")
+        self.client.run("info --json=graph.json")
+        with open(os.path.join(self.client.current_folder, "graph.json")) as json_file:
+            records = [json.loads(line) for line in json_file]
+        self.assertEqual(["cached", "cached"],
+                         [r["binary"] for r in records if r.get("package_id")])
+
+    def json_progress_test(self):
+        servers = {"default": TestServer()}
+        self.client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        self._create("Hello0", "0.1")
+        self.client.run("upload Hello0/0.1@lasote/stable")
+        self.client.run("remove Hello0* -f")
+        self._create("Hello1", "0.1", ["Hello0/0.1@lasote/stable"], export=False)
+
+        self.client.user_io.out._buffer = StringIO()
+        stderr = StringIO()
+        with patch("sys.stderr", stderr):
+            self.client.run("info --json")
+        # The output can be parsed, the progress messages went to stderr
+        records = [json.loads(line) for line in str(self.client.user_io.out).splitlines()]
+        self.assertEqual(["Hello0/0.1@lasote/stable", "Hello1/0.1@PROJECT"],
+                         [r["reference"] for r in records if r["type"] == "node"])
+        self.assertIn("Trying with 'default'", stderr.getvalue())
+        # And the output is the normal one again
+        self.client.run("info --json=graph.json")
+        self.assertIn("Graph exported to", self.client.user_io.out)
@@ -1,6 +1,8 @@
 import unittest
 from conans.test.tools import TestClient, TestServer
 from collections import OrderedDict
+import os
+from conans.util.files import load, save
 
 
 class RemoteTest(unittest.TestCase):
@@ -70,3 +72,33 @@ class RemoteTest(unittest.TestCase):
         self.client.run("remote list_ref")
         self.assertIn("Hello/0.1@user/testing: remote0", self.client.user_io.out)
         self.assertIn("Hello1/0.1@user/testing: remote2", self.client.user_io.out)
+
+    def export_test(self):
+        self.client.run("remote add_ref Hello/0.1@user/testing remote0")
+        self.client.run("remote add_ref Hello1/0.1@user/testing remote1")
+        self.client.run("remote export registry_backup.txt")
+        contents = load(os.path.join(self.client.current_folder, "registry_backup.txt"))
+        lines = contents.splitlines()
+        self.assertEqual(lines[:3], ["remote0 %s" % self.servers["remote0"].fake_url,
+                                     "remote1 %s" % self.servers["remote1"].fake_url,
+                                     "remote2 %s" % self.servers["remote2"].fake_url])
+        self.assertEqual(lines[3:], ["",
+                                     "Hello/0.1@user/testing remote0",
+                                     "Hello1/0.1@user/testing remote1"])
+        # References are not in the registry file anymore
+        self.assertNotIn("Hello", load(self.client.paths.registry))
+
+        # An old format registry is migrated
+        save(self.client.paths.registry, contents.replace("Hello1", "Hello2"))
+        self.client.run("remote list_ref")
+        self.assertIn("Hello2/0.1@user/testing: remote1", self.client.user_io.out)
+        self.assertIn("Hello1/0.1@user/testing: remote1", self.client.user_io.out)
+        self.assertNotIn("Hello", load(self.client.paths.registry))
+
+    def refs_not_with_credentials_test(self):
+        self.client.run("remote add_ref Hello/0.1@user/testing remote0")
+        # The credentials database can be removed without losing the references
+        os.remove(self.client.paths.localdb)
+        self.client.run("remote list_ref")
+        self.assertIn("Hello/0.1@user/testing: remote0", self.client.user_io.out)
+        self.assertTrue(os.path.exists(self.client.paths.registry_db))
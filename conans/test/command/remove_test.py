@@ -3,6 +3,8 @@ from conans.test.tools import TestClient, TestBufferConanOutput, TestServer
 from conans.paths import PACKAGES_FOLDER, EXPORT_FOLDER, BUILD_FOLDER, SRC_FOLDER, CONANFILE,\
     CONAN_MANIFEST, CONANINFO
 import os
+import subprocess
+import sys
 from mock import Mock
 from conans.client.userio import UserIO
 from conans.test.utils.test_files import temp_folder
@@ -10,6 +12,7 @@ import six
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
 from conans.model.ref import PackageReference, ConanFileReference
 from conans.model.manifest import FileTreeManifest
+from conans.util.files import save
 
 
 class RemoveTest(unittest.TestCase):
@@ -250,3 +253,36 @@ class RemoveTest(unittest.TestCase):
                             {"H1": [], "H2": [1, 2], "B": [1, 2], "O": [1, 2]},
                             {"H1": [1, 2], "H2": [1, 2], "B": [1, 2], "O": [1, 2]},
                             {"H1": True, "H2": True, "B": True, "O": True})
+
+    def remove_locks_test(self):
+        client = TestClient()
+        client.save(cpp_hello_conan_files("Hello0", "0.1"))
+        client.run("export lasote/stable")
+        conan_ref = ConanFileReference.loads("Hello0/0.1/lasote/stable")
+        paths = client.client_cache
+        for lock in (paths.recipe_lock(conan_ref),
+                     paths.package_lock(PackageReference(conan_ref, "123")),
+                     paths.package_lock(PackageReference(conan_ref, "456"))):
+            save(lock, "")
+
+        client.run("remove Hello0* -p 123 -f")
+        self.assertFalse(os.path.exists(paths.package_lock(PackageReference(conan_ref, "123"))))
+        self.assertTrue(os.path.exists(paths.package_lock(PackageReference(conan_ref, "456"))))
+        self.assertTrue(os.path.exists(paths.recipe_lock(conan_ref)))
+
+        # A lock held by other process is kept, it would lock a removed file
+        lock = paths.package_lock(PackageReference(conan_ref, "456"))
+        code = ("import fasteners, sys; lock = fasteners.InterProcessLock(%r); lock.acquire(); "
+                "print('locked'); sys.stdout.flush(); sys.stdin.read()" % lock)
+        holder = subprocess.Popen([sys.executable, "-c", code], stdin=subprocess.PIPE,
+                                  stdout=subprocess.PIPE)
+        try:
+            self.assertEqual(holder.stdout.readline().strip(), b"locked")
+            client.run("remove Hello0* -p 456 -f")
+            self.assertTrue(os.path.exists(lock))
+        finally:
+            holder.communicate()
+
+        client.run("remove Hello0* -f")
+        locks_folder = os.path.join(paths.conan_folder, "locks")
+        self.assertEqual(os.listdir(locks_folder), [])
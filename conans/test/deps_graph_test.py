@@ -68,3 +68,24 @@ class DepsGraphTest(unittest.TestCase):
         deps.add_edge(2, 32)
         deps.add_edge(32, 5)
         self.assertEqual([[5, 31], [32], [2], [1]], deps.by_levels())
+
+    def edge_flags_test(self):
+        deps = DepsGraph()
+        for node in (1, 2, 3, 4):
+            deps.add_node(node)
+        deps.add_edge(1, 2)
+        deps.add_edge(1, 3, private=True)
+        deps.add_edge(2, 4)
+        deps.add_edge(3, 4)
+        deps.add_edge(3, 4)  # Repeated edges are ignored
+        self.assertEqual([[4], [2, 3], [1]], deps.by_levels())
+        self.assertEqual([[1], [2, 3], [4]], deps.inverse_levels())
+        self.assertEqual([2, 3], deps.neighbors(1))
+        self.assertEqual([2, 3], deps.inverse_neighbors(4))
+        self.assertEqual([2], deps.public_neighbors(1))
+        self.assertEqual([1], deps.private_inverse_neighbors(3))
+        self.assertEqual([], deps.private_inverse_neighbors(2))
+        self.assertEqual([4, 3, 2], deps.ordered_closure(1, [4, 3, 2]))
+        # 3 is privately required by an already built node
+        self.assertEqual([], deps.private_nodes([]))
+        self.assertEqual([3], deps.private_nodes([1]))
@@ -0,0 +1,132 @@
+import os
+import unittest
+from mock import patch
+from conans.client.download_cache import DownloadCache
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save, load, md5, copy_file
+
+
+class DownloadCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_folder = os.path.join(temp_folder(), "cache")
+        self.downloads = []
+
+    def _download(self, url, filename):
+        self.downloads.append(url)
+        save(filename, "Contents of %s" % url)
+
+    @staticmethod
+    def _checksums(url):
+        return {"md5": md5("Contents of %s" % url)}
+
+    def hit_test(self):
+        cache = DownloadCache(self.cache_folder, 1024 * 1024)
+        folder = temp_folder()
+        url = "http://myserver/file.tgz"
+        for name in ("file1", "file2"):
+            filename = os.path.join(folder, name)
+            cache.download(url, filename, self._checksums(url), self._download)
+            self.assertEqual(load(filename), "Contents of http://myserver/file.tgz")
+        self.assertEqual(self.downloads, ["http://myserver/file.tgz"])
+
+        url = "http://myserver/other.tgz"
+        cache.download(url, os.path.join(folder, "file3"), self._checksums(url), self._download)
+        self.assertEqual(self.downloads, ["http://myserver/file.tgz", "http://myserver/other.tgz"])
+
+    def no_checksum_test(self):
+        # The contents of the url can change, they are not cached
+        cache = DownloadCache(self.cache_folder, 1024 * 1024)
+        folder = temp_folder()
+        for name in ("file1", "file2"):
+            filename = os.path.join(folder, name)
+            cache.download("http://myserver/file.tgz", filename, {"md5": None}, self._download)
+            self.assertEqual(load(filename), "Contents of http://myserver/file.tgz")
+        self.assertEqual(len(self.downloads), 2)
+        self.assertFalse(os.path.exists(self.cache_folder))
+
+    def invalid_checksum_test(self):
+        cache = DownloadCache(self.cache_folder, 1024 * 1024)
+        filename = os.path.join(temp_folder(), "file1")
+        cache.download("http://myserver/file.tgz", filename, {"md5": "../../file"},
+                       self._download)
+        self.assertEqual(load(filename), "Contents of http://myserver/file.tgz")
+        self.assertFalse(os.path.exists(self.cache_folder))
+        self.assertIsNone(DownloadCache._key({"md5": "abcd\n"}))
+
+    def checksum_key_test(self):
+        cache = DownloadCache(self.cache_folder, 1024 * 1024)
+        folder = temp_folder()
+        filename = os.path.join(folder, "file1")
+        checksums = {"md5": md5("Contents of http://mirror/file.tgz").upper(), "sha1": None}
+        cache.download("http://mirror/file.tgz", filename, checksums, self._download)
+        # Same contents retrieved from other url are not downloaded again
+        filename = os.path.join(folder, "file2")
+        cache.download("http://othermirror/file.tgz", filename, checksums, self._download)
+        self.assertEqual(load(filename), "Contents of http://mirror/file.tgz")
+        self.assertEqual(self.downloads, ["http://mirror/file.tgz"])
+
+    def corrupted_hit_test(self):
+        cache = DownloadCache(self.cache_folder, 1024 * 1024)
+        folder = temp_folder()
+        checksums = {"md5": md5("Contents of http://myserver/file.tgz")}
+        cache.download("http://myserver/file.tgz", os.path.join(folder, "file1"), checksums,
+                       self._download)
+        cached = os.path.join(self.cache_folder, DownloadCache._key(checksums))
+        save(cached, "corrupted")
+
+        filename = os.path.join(folder, "file2")
+        cache.download("http://myserver/file.tgz", filename, checksums, self._download)
+        self.assertEqual(load(filename), "Contents of http://myserver/file.tgz")
+        self.assertEqual(len(self.downloads), 2)
+        self.assertEqual(load(cached), "Contents of http://myserver/file.tgz")
+
+    def evicted_hit_test(self):
+        cache = DownloadCache(self.cache_folder, 1024 * 1024)
+        filename = os.path.join(temp_folder(), "file1")
+        checksums = self._checksums("http://myserver/file.tgz")
+        cache.download("http://myserver/file.tgz", filename, checksums, self._download)
+
+        def evicted_copy(src, dst):
+            if src.startswith(self.cache_folder):  # Removed by other process meanwhile
+                save(dst, "Partial")
+                raise IOError("No such file or directory")
+            copy_file(src, dst)
+
+        with patch("conans.client.download_cache.copy_file", side_effect=evicted_copy):
+            cache.download("http://myserver/file.tgz", filename, checksums, self._download)
+        self.assertEqual(load(filename), "Contents of http://myserver/file.tgz")
+        self.assertEqual(len(self.downloads), 2)
+
+    def failed_download_test(self):
+        cache = DownloadCache(self.cache_folder, 1024 * 1024)
+
+        def download(url, filename):
+            save(filename, "corrupted")
+            raise Exception("md5 signature failed")
+
+        filename = os.path.join(temp_folder(), "file1")
+        with self.assertRaisesRegexp(Exception, "md5 signature failed"):
+            cache.download("http://myserver/file.tgz", filename, {"md5": "1234"}, download)
+        self.assertFalse(os.path.exists(self.cache_folder))
+
+    def eviction_test(self):
+        cache = DownloadCache(self.cache_folder, 100)
+        folder = temp_folder()
+        for i in range(6):
+            url = "http://myserver/file%d.tgz" % i
+            checksums = self._checksums(url)
+            cache.download(url, os.path.join(folder, "file%d" % i), checksums, self._download)
+            cached = os.path.join(self.cache_folder, DownloadCache._key(checksums))
+            os.utime(cached, (i, i))  # Deterministic LRU order
+        entries = os.listdir(self.cache_folder)
+        self.assertEqual(len(entries), 2)  # 37 bytes each
+        self.assertLessEqual(sum(os.path.getsize(os.path.join(self.cache_folder, entry))
+                                 for entry in entries), 100)
+        # The most recent ones are kept
+        url = "http://myserver/file5.tgz"
+        cache.download(url, os.path.join(folder, "new"), self._checksums(url), self._download)
+        self.assertEqual(len(self.downloads), 6)
+        url = "http://myserver/file0.tgz"
+        cache.download(url, os.path.join(folder, "new"), self._checksums(url), self._download)
+        self.assertEqual(len(self.downloads), 7)
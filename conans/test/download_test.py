@@ -3,9 +3,10 @@ from conans.test.tools import TestClient, TestServer
 from conans.test.utils.test_files import hello_source_files
 from conans.client.manager import CONANFILE
 import os
+from mock import patch
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import CONAN_MANIFEST, CONANINFO
-from conans.util.files import save
+from conans.util.files import save, load
 from conans.model.manifest import FileTreeManifest
 from conans.client.proxy import ConanProxy
 
@@ -44,6 +45,8 @@ class DownloadTest(unittest.TestCase):
                      "include/math/lib1.h": "//copy",
                      "my_lib/debug/libd.a": "//copy",
                      "my_data/readme.txt": "//copy"}, path=reg_folder)
+        conan_digest = FileTreeManifest.create(reg_folder)
+        save(os.path.join(reg_folder, CONAN_MANIFEST), str(conan_digest))
 
         package_ref = PackageReference(conan_ref, "fakeid")
         package_folder = client.paths.package(package_ref)
@@ -66,18 +69,27 @@ class DownloadTest(unittest.TestCase):
 
         installer = ConanProxy(client2.paths, client2.user_io, client2.remote_manager, "default")
 
-        installer.get_recipe(conan_ref)
-        installer.get_package(package_ref, force_build=False, short_paths=False)
+        with patch.dict(os.environ, {"CONAN_LAZY_EXPORTS": "1"}):
+            installer.get_recipe(conan_ref)
+            installer.get_package(package_ref, force_build=False, short_paths=False)
         # Check that the output is done in order
         lines = [line.strip() for line in str(client2.user_io.out).splitlines()
                  if line.startswith("Downloading")]
+        # The exported files are not downloaded until they are needed to build
         self.assertEqual(lines, ["Downloading conanmanifest.txt",
                                  "Downloading conanfile.py",
-                                 "Downloading conan_export.tgz",
                                  "Downloading conanmanifest.txt",
                                  "Downloading conaninfo.txt",
                                  "Downloading conan_package.tgz"
                                  ])
+        export_folder = client2.paths.export(conan_ref)
+        self.assertFalse(os.path.exists(os.path.join(export_folder, "include", "math", "lib1.h")))
+
+        installer.get_recipe_sources(conan_ref)
+        self.assertIn("Downloading conan_export.tgz", str(client2.user_io.out))
+        self.assertEqual("//copy", load(os.path.join(export_folder, "include", "math", "lib1.h")))
+        read_manifest, expected_manifest = client2.paths.conan_manifests(conan_ref)
+        self.assertEqual(read_manifest.file_sums, expected_manifest.file_sums)
 
         reg_path = client2.paths.export(ConanFileReference.loads("Hello/1.2.1/frodo/stable"))
         pack_folder = client2.paths.package(package_ref)
@@ -0,0 +1,19 @@
+import unittest
+from conans.util.env_reader import get_env
+
+
+class EnvReaderTest(unittest.TestCase):
+
+    def bool_test(self):
+        for value in ("1", "true", "True", "yes", "ON"):
+            self.assertTrue(get_env("CONAN_VAR", False, {"CONAN_VAR": value}))
+        for value in ("0", "false", "False", "no", "off", ""):
+            self.assertFalse(get_env("CONAN_VAR", False, {"CONAN_VAR": value}))
+        self.assertFalse(get_env("CONAN_VAR", False, {}))
+        self.assertTrue(get_env("CONAN_VAR", True, {}))
+
+    def types_test(self):
+        self.assertEqual(3, get_env("CONAN_VAR", 1, {"CONAN_VAR": "3"}))
+        self.assertEqual(1.5, get_env("CONAN_VAR", 1.0, {"CONAN_VAR": "1.5"}))
+        self.assertEqual(["a", "b"], get_env("CONAN_VAR", [], {"CONAN_VAR": "a,b"}))
+        self.assertEqual("value", get_env("CONAN_VAR", "", {"CONAN_VAR": "value"}))
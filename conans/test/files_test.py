@@ -1,6 +1,10 @@
+import errno
+import time
 import unittest
 import os
-from conans.util.files import save, load
+from mock import patch
+from conans.util import files
+from conans.util.files import save, load, copy_file
 from conans.test.utils.test_files import temp_folder
 import platform
 from conans.client.file_copier import FileCopier
@@ -59,3 +63,175 @@ class FileCopierTest(unittest.TestCase):
             self.assertEqual("Hello1", load(os.path.join(folder2, "texts/file1.txt")))
             self.assertEqual("Hello1 sub", load(os.path.join(folder2, "texts/sub1/file1.txt")))
             self.assertNotIn("subdir2", os.listdir(os.path.join(folder2, "texts")))
+
+    def multiple_patterns_test(self):
+        folder1 = temp_folder()
+        save(os.path.join(folder1, "include/hello.h"), "header")
+        save(os.path.join(folder1, "lib/Release/hello.lib"), "lib")
+        save(os.path.join(folder1, "bin/hello.dll"), "dll")
+        save(os.path.join(folder1, ".git/hello.h"), "git")
+        save(os.path.join(folder1, "test_package/build/hello.h"), "test_package")
+
+        _age(folder1)
+
+        folder2 = temp_folder()
+        copier = FileCopier(folder1, folder2)
+        copier("*.h", "include", "include")
+        copier("*.lib", "lib", keep_path=False)
+        self.assertEqual(["hello.h"], os.listdir(os.path.join(folder2, "include")))
+        self.assertEqual(["hello.lib"], os.listdir(os.path.join(folder2, "lib")))
+        self.assertFalse(os.path.exists(os.path.join(folder2, "test_package")))
+        # The folders skipped by the tree listing are walked if copied explicitly
+        copied = copier("*.h", "tp", "test_package/build")
+        self.assertEqual([os.path.join(folder2, "tp", "hello.h")], copied)
+
+        # The tree listing is reused, but new files are detected
+        save(os.path.join(folder1, "bin/bye.dll"), "dll")
+        copied = copier("*.dll", "bin", "bin")
+        self.assertEqual(sorted([os.path.join(folder2, "bin", "bye.dll"),
+                                 os.path.join(folder2, "bin", "hello.dll")]), sorted(copied))
+        copied = copier("*.h")
+        self.assertEqual([os.path.join(folder2, "include", "hello.h")], copied)
+
+    def copy_strategies_test(self):
+        folder1 = temp_folder()
+        for i in range(40):  # Enough files to be copied in parallel
+            save(os.path.join(folder1, "sub%d" % (i % 3), "file%d.h" % i), "Hello%d" % i)
+        save(os.path.join(folder1, "a", "repeated.lib"), "a")
+        save(os.path.join(folder1, "b", "repeated.lib"), "b")
+
+        folder2 = temp_folder()
+        copier = FileCopier(folder1, folder2)
+        self.assertEqual(40, len(copier("*.h", "include")))
+        self.assertEqual("Hello39", load(os.path.join(folder2, "include/sub0/file39.h")))
+        copier("*.lib", "lib", keep_path=False)
+        # The last one wins, as when copying them one by one
+        self.assertEqual("b", load(os.path.join(folder2, "lib/repeated.lib")))
+
+        if platform.system() != "Windows":
+            folder3 = temp_folder()
+            FileCopier(folder1, folder3, link=True)("*.h")
+            src = os.path.join(folder1, "sub0/file0.h")
+            dst = os.path.join(folder3, "sub0/file0.h")
+            self.assertTrue(os.path.samefile(src, dst))
+            # A later copy of other file breaks the link, never writes through it
+            folder4 = temp_folder()
+            save(os.path.join(folder4, "sub0/file0.h"), "Other")
+            FileCopier(folder4, folder3)("*.h")
+            self.assertEqual("Other", load(dst))
+            self.assertEqual("Hello0", load(src))
+
+        # Destinations relative to the current folder
+        folder5 = temp_folder()
+        current_dir = os.getcwd()
+        os.chdir(folder5)
+        try:
+            copy_file(os.path.join(folder1, "sub0/file0.h"), "file0.h")
+            copy_file(os.path.join(folder1, "sub1/file1.h"), "file1.h", link=True)
+        finally:
+            os.chdir(current_dir)
+        self.assertEqual("Hello0", load(os.path.join(folder5, "file0.h")))
+        self.assertEqual("Hello1", load(os.path.join(folder5, "file1.h")))
+
+    def scan_skip_unchanged_test(self):
+        folder1 = temp_folder()
+        save(os.path.join(folder1, "include/hello.h"), "header")
+        save(os.path.join(folder1, "lib/hello.lib"), "lib")
+        save(os.path.join(folder1, "lib/Release/hello.dll"), "dll")
+        _age(folder1)
+
+        folder2 = temp_folder()
+        copier = FileCopier(folder1, folder2, skip_unchanged=True)
+        copier.scan(folder1)
+        self.assertEqual([os.path.join(folder2, "Release", "hello.dll")],
+                         copier("*.dll", src="lib"))
+        self.assertEqual([os.path.join(folder2, "lib", "hello.lib")],
+                         copier("*.lib", "lib", "lib", keep_path=False))
+        # Subfolders reuse the scanned listing, not walked again
+        self.assertEqual([folder1], list(copier._listings))
+
+        # Unchanged files are not copied again, modified ones are
+        dst = os.path.join(folder2, "lib", "hello.lib")
+        save(dst, "modified")
+        dll = os.path.join(folder2, "Release", "hello.dll")
+        save(dll, "DLL")  # Same size and mtime, considered unchanged
+        os.utime(dll, (1000, 1000))
+        os.utime(os.path.join(folder1, "lib/Release/hello.dll"), (1000, 1000))
+        copier("*.lib", "lib", "lib", keep_path=False)
+        copier("*.dll", src="lib")
+        self.assertEqual("lib", load(dst))
+        self.assertEqual("DLL", load(dll))
+
+    def recent_folder_test(self):
+        folder1 = temp_folder()
+        save(os.path.join(folder1, "include/hello.h"), "header")
+        include = os.path.join(folder1, "include")
+        mtime = int(time.time())  # A filesystem with a resolution of seconds
+        os.utime(include, (mtime, mtime))
+        folder2 = temp_folder()
+        copier = FileCopier(folder1, folder2)
+        copier("*.h")
+        # Added in the same mtime tick of the folder, its listing cannot be reused
+        save(os.path.join(include, "bye.h"), "header")
+        os.utime(include, (mtime, mtime))
+        copied = copier("*.h")
+        self.assertEqual(sorted([os.path.join(folder2, "include", "bye.h"),
+                                 os.path.join(folder2, "include", "hello.h")]), sorted(copied))
+
+
+def _age(folder):
+    """ sets mtimes of the folder tree older than the filesystems resolution, so the tree
+    listings are reused
+    """
+    mtime = time.time() - 10
+    for root, _, _ in os.walk(folder):
+        os.utime(root, (mtime, mtime))
+
+
+@unittest.skipIf(platform.system() == "Windows", "No reflinks in Windows")
+class ReflinkTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = temp_folder()
+        self.src = os.path.join(folder, "src.txt")
+        self.dst = os.path.join(folder, "dst.txt")
+        save(self.src, "new")
+        save(self.dst, "old")
+        os.utime(self.src, (1000, 1000))
+        self.devices = (os.stat(folder).st_dev, os.stat(folder).st_dev)
+        files._no_reflink.discard(self.devices)
+
+    def tearDown(self):
+        files._no_reflink.discard(self.devices)
+
+    def _ioctl(self, error=None):
+        def ioctl(fd, _, src_fd):
+            if error:
+                raise IOError(error, os.strerror(error))
+            os.write(fd, os.read(src_fd, 100))
+        return ioctl
+
+    def reflink_test(self):
+        with patch("fcntl.ioctl", self._ioctl()):
+            self.assertTrue(files._reflink(self.src, self.dst))
+        self.assertEqual("new", load(self.dst))
+        self.assertEqual(1000, os.stat(self.dst).st_mtime)
+        self.assertEqual(["dst.txt", "src.txt"], sorted(os.listdir(os.path.dirname(self.dst))))
+
+    def not_supported_test(self):
+        with patch("fcntl.ioctl", self._ioctl(errno.EOPNOTSUPP)):
+            self.assertFalse(files._reflink(self.src, self.dst))
+        self.assertEqual("old", load(self.dst))
+        self.assertIn(self.devices, files._no_reflink)
+        self.assertEqual(["dst.txt", "src.txt"], sorted(os.listdir(os.path.dirname(self.dst))))
+
+    def error_test(self):
+        # Other errors do not disable the reflinks of the filesystem, nor truncate dst
+        with patch("fcntl.ioctl", self._ioctl(errno.ENOSPC)):
+            self.assertFalse(files._reflink(self.src, self.dst))
+        self.assertEqual("old", load(self.dst))
+        self.assertNotIn(self.devices, files._no_reflink)
+
+        with patch("fcntl.ioctl", self._ioctl(errno.ENOSPC)):
+            copy_file(self.src, self.dst)
+        self.assertEqual("new", load(self.dst))
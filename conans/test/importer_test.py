@@ -0,0 +1,34 @@
+import os
+import unittest
+from mock import Mock
+from conans.client.importer import FileImporter
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save, load
+
+
+class FileImporterTest(unittest.TestCase):
+
+    def copy_order_test(self):
+        store = temp_folder()
+        folders = {"A": os.path.join(store, "A"), "B": os.path.join(store, "B")}
+        save(os.path.join(folders["A"], "first", "data.txt"), "A first")
+        save(os.path.join(folders["B"], "data.txt"), "B")
+        save(os.path.join(folders["A"], "last", "data.txt"), "A last one")
+
+        dst = temp_folder()
+        importer = FileImporter(None, Mock(store=store), dst)
+        importer._get_folders = lambda: folders
+        importer("*.txt", src="first", root_package="A")
+        importer("*.txt", root_package="B")
+        importer("*.txt", src="last", root_package="A")
+        importer.execute()
+        # The copies are done in the order of the rules, the last one wins
+        self.assertEqual("A last one", load(os.path.join(dst, "data.txt")))
+
+        importer = FileImporter(None, Mock(store=store), dst)
+        importer._get_folders = lambda: folders
+        importer("*.txt", src="last", root_package="A")
+        importer("*.txt")
+        importer.execute()
+        # And the packages of a rule in the order of their names
+        self.assertEqual("B", load(os.path.join(dst, "data.txt")))
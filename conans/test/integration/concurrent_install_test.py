@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+from conans.test.tools import TestClient, TestServer
+from conans.model.ref import ConanFileReference
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+
+
+_LOCK_HOLDER = """
+import sys, time, fasteners
+lock = fasteners.InterProcessLock(sys.argv[1])
+lock.acquire()
+open(sys.argv[2], "w").close()
+time.sleep(1)
+lock.release()
+"""
+
+
+class ConcurrentInstallTest(unittest.TestCase):
+
+    def wait_other_process_test(self):
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.save(cpp_hello_conan_files("Hello0", "1.0", build=False))
+        client.run("export lasote/stable")
+        client.run("upload Hello0/1.0@lasote/stable")
+
+        client2 = TestClient(servers=servers)
+        conan_reference = ConanFileReference.loads("Hello0/1.0@lasote/stable")
+        lock_path = client2.paths.recipe_lock(conan_reference)
+        ready = os.path.join(client2.current_folder, "lock_acquired")
+        holder = subprocess.Popen([sys.executable, "-c", _LOCK_HOLDER, lock_path, ready])
+        try:
+            while not os.path.exists(ready):
+                time.sleep(0.05)
+            client2.run("install Hello0/1.0@lasote/stable --build=missing")
+        finally:
+            holder.wait()
+        self.assertIn("Hello0/1.0@lasote/stable: Waiting for other process retrieving it...",
+                      client2.user_io.out)
+        self.assertIn("Downloading conanfile.py", client2.user_io.out)
+        self.assertTrue(os.path.exists(client2.paths.conanfile(conan_reference)))
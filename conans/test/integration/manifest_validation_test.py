@@ -232,6 +232,15 @@ class ConanFileTest(ConanFile):
         self.assertIn("Hello/0.1@lasote/stable local cache package is corrupted",
                       self.client.user_io.out)
 
+    def test_missing_recipe_file(self):
+        export_path = self.client.paths.export(self.reference)
+        os.remove(os.path.join(export_path, "data.txt"))
+
+        self.client.run("install %s --build missing --manifests" % str(self.reference),
+                        ignore_error=True)
+        self.assertIn("Hello/0.1@lasote/stable local cache package is corrupted",
+                      self.client.user_io.out)
+
     def test_corrupted_package(self):
         self.client.run("install %s --build missing" % str(self.reference))
         package_reference = PackageReference.loads("Hello/0.1@lasote/stable:"
@@ -0,0 +1,71 @@
+import os
+import unittest
+from conans.test.tools import TestServer, TestClient
+from conans.model.ref import ConanFileReference
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.paths import CONANFILE
+
+
+class ObjectStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = TestServer(object_store=True)
+        self.reference = ConanFileReference.loads("Hello0/0.1@lasote/stable")
+        self.client = TestClient(servers={"default": self.server},
+                                 users={"default": [("lasote", "mypass")]})
+        files = cpp_hello_conan_files("Hello0", "0.1", build=False)
+        self.client.save(files)
+        self.client.run("export lasote/stable")
+        self.client.run("install %s --build=missing" % str(self.reference))
+        self.client.run("upload %s --all" % str(self.reference))
+
+    def upload_install_test(self):
+        # Files are in the object store, not in the server disk
+        keys = list(self.server.object_store.objects.keys())
+        self.assertIn("Hello0/0.1/lasote/stable/export/%s" % CONANFILE, keys)
+        self.assertTrue(any(key.endswith("conan_package.tgz") for key in keys))
+        self.assertFalse(os.path.exists(self.server.paths.conan(self.reference)))
+
+        client = TestClient(servers={"default": self.server})
+        client.run("search Hello0* -r=default")
+        self.assertIn("Hello0/0.1@lasote/stable", client.user_io.out)
+        client.run("install %s" % str(self.reference))
+        self.assertIn("Downloading conan_package.tgz", client.user_io.out)
+        conan_folder = client.paths.conan(self.reference)
+        self.assertTrue(os.path.exists(os.path.join(conan_folder, "export", CONANFILE)))
+
+        # Uploading again, nothing changed, nothing transferred
+        self.client.run("upload %s --all" % str(self.reference))
+        self.assertNotIn("Uploading conanfile.py", self.client.user_io.out)
+
+    def search_packages_remove_test(self):
+        client = TestClient(servers={"default": self.server},
+                            users={"default": [("lasote", "mypass")]})
+        client.run("search %s -r=default" % str(self.reference))
+        self.assertIn("Package_ID:", client.user_io.out)
+
+        client.run("remove %s -f -r=default" % str(self.reference))
+        self.assertEqual(self.server.object_store.objects, {})
+        error = client.run("install %s" % str(self.reference), ignore_error=True)
+        self.assertTrue(error)
+
+    def presigned_urls_test(self):
+        store = self.server.object_store
+
+        def app_path(url):
+            return url[len(self.server.fake_url):]
+
+        key = "Hello0/0.1/lasote/stable/export/%s" % CONANFILE
+        path = app_path(store.get_download_url(key, 100))
+        response = self.server.app.get(path)
+        self.assertEqual(response.body, store.objects[key])
+        # Tampered or expired urls are rejected
+        response = self.server.app.get(path.replace("expires=", "expires=1"),
+                                       expect_errors=True)
+        self.assertEqual(response.status_int, 403)
+        response = self.server.app.get(app_path(store.get_download_url(key, -10)),
+                                       expect_errors=True)
+        self.assertEqual(response.status_int, 403)
+        response = self.server.app.put(app_path(store.get_upload_url(key, 3, 100)), b"four",
+                                       expect_errors=True)
+        self.assertEqual(response.status_int, 401)
@@ -0,0 +1,96 @@
+import os
+import unittest
+from conans.test.tools import TestServer, TestClient
+from conans.model.ref import ConanFileReference
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.paths import CONANFILE, CONAN_MANIFEST
+from conans.util.files import load
+
+
+class PullThroughMirrorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.upstream = TestServer()
+        self.mirror = TestServer(upstream=self.upstream, upstream_ttl=0)
+        self.reference = ConanFileReference.loads("Hello0/0.1@lasote/stable")
+
+    def _upload(self, message="Hello"):
+        client = TestClient(servers={"default": self.upstream},
+                            users={"default": [("lasote", "mypass")]})
+        files = cpp_hello_conan_files("Hello0", "0.1", msg=message, build=False)
+        client.save(files)
+        client.run("export lasote/stable")
+        client.run("install %s --build=missing" % str(self.reference))
+        client.run("upload %s --all" % str(self.reference))
+
+    def mirror_install_test(self):
+        self._upload()
+        export = self.mirror.paths.export(self.reference)
+        self.assertFalse(os.path.exists(export))
+
+        client = TestClient(servers={"default": self.mirror})
+        client.run("install %s" % str(self.reference))
+        self.assertIn("Downloading conan_package.tgz", client.user_io.out)
+
+        # Recipe and package are now stored in the mirror
+        self.assertTrue(os.path.exists(os.path.join(export, CONANFILE)))
+        package_folder = self.mirror.paths.packages(self.reference)
+        self.assertEqual(len(os.listdir(package_folder)), 1)
+        upstream_export = self.upstream.paths.export(self.reference)
+        self.assertEqual(load(os.path.join(export, CONAN_MANIFEST)),
+                         load(os.path.join(upstream_export, CONAN_MANIFEST)))
+
+        # Upstream changes are retrieved when revalidating (ttl is 0)
+        old_manifest = load(os.path.join(export, CONAN_MANIFEST))
+        self._upload(message="Bye")
+        client.run("remove Hello0* -f")
+        client.run("install %s --build=missing" % str(self.reference))
+        self.assertNotEqual(old_manifest, load(os.path.join(export, CONAN_MANIFEST)))
+        self.assertEqual(load(os.path.join(export, CONAN_MANIFEST)),
+                         load(os.path.join(upstream_export, CONAN_MANIFEST)))
+
+    def not_found_test(self):
+        client = TestClient(servers={"default": self.mirror})
+        error = client.run("install %s" % str(self.reference), ignore_error=True)
+        self.assertTrue(error)
+        self.assertIn("Unable to find 'Hello0/0.1@lasote/stable' in remotes", client.user_io.out)
+        # No garbage left in the mirror storage
+        self.assertEqual(os.listdir(self.mirror.paths.store), [])
+
+    def uploaded_to_mirror_test(self):
+        self._upload()
+        # Uploaded directly to the mirror, the upstream one is not retrieved
+        client = TestClient(servers={"default": self.mirror},
+                            users={"default": [("lasote", "mypass")]})
+        client.save(cpp_hello_conan_files("Hello0", "0.1", msg="Mirror", build=False))
+        client.run("export lasote/stable")
+        client.run("upload %s" % str(self.reference))
+        export = self.mirror.paths.export(self.reference)
+        manifest = load(os.path.join(export, CONAN_MANIFEST))
+
+        client = TestClient(servers={"default": self.mirror})
+        client.run("install %s --build=missing" % str(self.reference))
+        self.assertEqual(manifest, load(os.path.join(export, CONAN_MANIFEST)))
+        self.assertEqual(manifest, load(os.path.join(client.paths.export(self.reference),
+                                                     CONAN_MANIFEST)))
+
+    def private_upstream_test(self):
+        self.upstream = TestServer(read_permissions=[("*/*@*/*", "lasote")])
+        self._upload()
+
+        mirror = TestServer(upstream=self.upstream, upstream_ttl=0)
+        client = TestClient(servers={"default": mirror})
+        error = client.run("install %s" % str(self.reference), ignore_error=True)
+        self.assertTrue(error)
+
+        mirror = TestServer(upstream=self.upstream, upstream_ttl=0,
+                            upstream_credentials=("lasote", "mypass"))
+        client = TestClient(servers={"default": mirror})
+        client.run("install %s" % str(self.reference))
+        self.assertIn("Downloading conan_package.tgz", client.user_io.out)
+
+        # The expired token is renewed
+        mirror.test_server.file_manager._upstream._client.token = "expired"
+        client.run("remove Hello0* -f")
+        client.run("install %s" % str(self.reference))
+        self.assertIn("Downloading conan_package.tgz", client.user_io.out)
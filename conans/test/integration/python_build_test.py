@@ -1,8 +1,9 @@
 import unittest
-from conans.test.tools import TestClient
+from conans.test.tools import TestClient, TestServer
 from conans.paths import CONANFILE
 from conans.util.files import load
 import os
+from mock import patch
 
 
 class PythonBuildTest(unittest.TestCase):
@@ -79,3 +80,49 @@ class ToolsTest(ConanFile):
                  if line.startswith("Consumer/0.1@lasote/stable: Hello")]
         self.assertEqual([' Hello Baz', ' Hello Foo', ' Hello Boom', ' Hello Bar'],
                          lines)
+
+    def import_exported_module_test(self):
+        conanfile = """from conans import ConanFile
+from helper import VERSION
+
+class HelloConan(ConanFile):
+    name = "Hello"
+    version = VERSION
+    exports = "helper.py"
+"""
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.save({CONANFILE: conanfile, "helper.py": "VERSION = '0.1'"})
+        client.run("export lasote/stable")
+        client.run("upload Hello/0.1@lasote/stable")
+
+        # The exported modules are retrieved with the recipe, they are needed to load it
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.save({"conanfile.txt": "[requires]\nHello/0.1@lasote/stable"}, clean_first=True)
+        with patch.dict(os.environ, {"CONAN_LAZY_EXPORTS": "1"}):
+            client.run("info")
+        self.assertIn("Hello/0.1@lasote/stable", client.user_io.out)
+        self.assertIn("Remote: default", client.user_io.out)
+
+    def load_exported_file_test(self):
+        conanfile = """import os
+from conans import ConanFile
+from conans.util.files import load
+
+class HelloConan(ConanFile):
+    name = "Hello"
+    version = load(os.path.join(os.path.dirname(__file__), "version.txt")).strip()
+    exports = "version.txt"
+"""
+        servers = {"default": TestServer()}
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.save({CONANFILE: conanfile, "version.txt": "0.1"})
+        client.run("export lasote/stable")
+        client.run("upload Hello/0.1@lasote/stable")
+
+        # By default the exported files are retrieved with the recipe
+        client = TestClient(servers=servers, users={"default": [("lasote", "mypass")]})
+        client.save({"conanfile.txt": "[requires]\nHello/0.1@lasote/stable"}, clean_first=True)
+        client.run("info")
+        self.assertIn("Hello/0.1@lasote/stable", client.user_io.out)
+        self.assertIn("Remote: default", client.user_io.out)
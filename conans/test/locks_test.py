@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import unittest
+from conans.test.utils.test_files import temp_folder
+from conans.util.locks import acquire_lock, remove_lock, _is_current
+
+
+class LocksTest(unittest.TestCase):
+
+    def remove_free_lock_test(self):
+        path = os.path.join(temp_folder(), "locks", "file.lock")
+        lock = acquire_lock(path)
+        lock.release()
+        remove_lock(path)
+        self.assertFalse(os.path.exists(path))
+        remove_lock(path)  # Not existing
+
+    def keep_held_lock_test(self):
+        path = os.path.join(temp_folder(), "file.lock")
+        # The locks of this process would not block
+        code = ("import fasteners, sys; lock = fasteners.InterProcessLock(%r); lock.acquire(); "
+                "print('locked'); sys.stdout.flush(); sys.stdin.read()" % path)
+        holder = subprocess.Popen([sys.executable, "-c", code], stdin=subprocess.PIPE,
+                                  stdout=subprocess.PIPE)
+        try:
+            self.assertEqual(holder.stdout.readline().strip(), b"locked")
+            remove_lock(path)
+            self.assertTrue(os.path.exists(path))
+            self.assertIsNone(acquire_lock(path, blocking=False))
+        finally:
+            holder.communicate()
+        remove_lock(path)
+        self.assertFalse(os.path.exists(path))
+
+    @unittest.skipIf(sys.platform == "win32", "Open files cannot be removed in Windows")
+    def removed_lock_test(self):
+        path = os.path.join(temp_folder(), "file.lock")
+        lock = acquire_lock(path)
+        self.assertTrue(_is_current(lock))
+        # Other process removed it and a new one locks the same path, this one is not valid
+        os.remove(path)
+        self.assertFalse(_is_current(lock))
+        with open(path, "w"):
+            pass
+        self.assertFalse(_is_current(lock))
+        lock.release()
+        lock = acquire_lock(path)
+        self.assertTrue(_is_current(lock))
+        lock.release()
@@ -1,5 +1,8 @@
 import unittest
 from conans.model.info import ConanInfo
+from conans.model.options import OptionsValues
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.model.values import Values
 
 info_text = '''[settings]
     arch=x86_64
@@ -54,3 +57,36 @@ class ConanInfoTest(unittest.TestCase):
                                  'compiler.version': '5.2', 'os': 'Linux',
                                  'build_type': 'Debug', 'compiler': 'gcc'}}
         self.assertEquals(min_serial, expected)
+
+    def package_id_invalidation_test(self):
+        settings = Values.loads("os=Linux\ncompiler=gcc\ncompiler.version=5.2")
+        options = OptionsValues.loads("shared=False\nzlib:shared=False")
+        zlib = PackageReference.loads("zlib/1.2.8@lasote/stable:"
+                                      "2dec3996ef8de7edb0304eaf4efdd96a0477d3a3")
+        info = ConanInfo.create(settings, options, [zlib], [], None)
+        ref = ConanFileReference.loads("Hello/0.1@lasote/stable")
+        settings_sha = info.settings.sha
+        options_sha = info.options.sha(None)
+        requires_sha = info.requires.sha
+
+        # Nested modifications invalidate the memoized digests
+        info.settings.compiler.version = "4.9"
+        self.assertNotEqual(info.settings.sha, settings_sha)
+        info.settings.compiler.version = "5.2"
+        self.assertEqual(info.settings.sha, settings_sha)
+
+        info.options["zlib"].shared = True
+        self.assertNotEqual(info.options.sha(None), options_sha)
+        info.options["zlib"].shared = False
+        self.assertEqual(info.options.sha(None), options_sha)
+
+        info.requires["zlib"].full_recipe()
+        self.assertNotEqual(info.requires.sha, requires_sha)
+
+        # The package_id is computed once, later modifications do not change it
+        package_id = info.package_id()
+        package_reference = info.package_reference(ref)
+        self.assertEqual(package_reference, PackageReference(ref, package_id))
+        self.assertIs(info.package_reference(ref), package_reference)
+        info.settings.compiler.version = "4.9"
+        self.assertEqual(info.package_id(), package_id)
@@ -1,5 +1,6 @@
 import unittest
-from conans.model.ref import ConanFileReference
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.model.version import Version
 from conans.errors import ConanException
 
 
@@ -26,3 +27,19 @@ class RefTest(unittest.TestCase):
         self.assertRaises(ConanException, ConanFileReference.loads, "opencv??/2.4.10@laso/testing")
         self.assertRaises(ConanException, ConanFileReference.loads, ".opencv/2.4.10@lasote/testing")
         self.assertRaises(ConanException, ConanFileReference.loads, "o/2.4.10 @ lasote/testing")
+        # Invalid references are not interned, they fail every time
+        self.assertRaises(ConanException, ConanFileReference.loads, "opencv??/2.4.10@laso/testing")
+
+    def interning_test(self):
+        ref = ConanFileReference.loads("opencv/2.4.10@lasote/testing")
+        self.assertIs(ConanFileReference.loads("opencv/2.4.10@lasote/testing"), ref)
+        package_ref = PackageReference.loads("opencv/2.4.10@lasote/testing:123abc")
+        self.assertIs(PackageReference.loads("opencv/2.4.10@lasote/testing:123abc"), package_ref)
+        self.assertIs(package_ref.conan, ref)
+        self.assertEqual(str(package_ref), "opencv/2.4.10@lasote/testing:123abc")
+
+        trusted = ConanFileReference.trusted("opencv", "2.4.10", "lasote", "testing")
+        self.assertEqual(trusted, ref)
+        self.assertEqual(hash(trusted), hash(ref))
+        self.assertIsInstance(trusted.version, Version)
+        self.assertEqual(str(trusted), "opencv/2.4.10@lasote/testing")
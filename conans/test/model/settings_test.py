@@ -19,6 +19,53 @@ class SettingsTest(unittest.TestCase):
                 "os": ["Windows", "Linux"]}
         self.sut = Settings(data)
 
+    def copy_on_write_test(self):
+        copied = self.sut.copy()
+        copied.compiler = "gcc"
+        copied.compiler.arch = "x86"
+        copied.compiler.arch.speed = "A"
+        copied.compiler["gcc"].version.remove("4.8")
+        copied.compiler.remove("Visual Studio")
+        copied.constraint({"compiler": None})
+
+        # The original is not modified by its copies
+        self.assertEqual(self.sut.values.dumps(), "")
+        self.assertEqual(self.sut.fields, ["compiler", "os"])
+        self.assertEqual(self.sut.compiler.values_range, ["Visual Studio", "gcc"])
+        self.assertEqual(self.sut.compiler["gcc"].version.values_range, ["4.8", "4.9"])
+        self.assertEqual(copied.values.dumps(), "compiler=gcc\ncompiler.arch=x86\n"
+                                                "compiler.arch.speed=A")
+        self.assertEqual(copied.compiler.version.values_range, ["4.9"])
+
+        # Nor the copies by the original
+        copied2 = self.sut.copy()
+        self.sut.os = "Linux"
+        self.sut.compiler.remove("gcc")
+        self.assertEqual(copied2.values.dumps(), "")
+        self.assertEqual(copied2.compiler.values_range, ["Visual Studio", "gcc"])
+        self.assertEqual(copied.values.dumps(), "compiler=gcc\ncompiler.arch=x86\n"
+                                                "compiler.arch.speed=A")
+
+    def copy_after_taking_children_test(self):
+        compiler = self.sut.compiler
+        arch = self.sut.compiler["gcc"].arch
+        copied = self.sut.copy()
+        # The children taken before the copy are modified, the copy doesn't change
+        compiler.remove("gcc")
+        arch.remove("x64")
+        compiler.value = "Visual Studio"
+        self.assertEqual(copied.compiler.values_range, ["Visual Studio", "gcc"])
+        self.assertEqual(copied.compiler["gcc"].arch.values_range, ["x64", "x86"])
+        self.assertEqual(copied.values.dumps(), "")
+        self.assertEqual(self.sut.compiler.values_range, ["Visual Studio"])
+
+        # Neither the children taken from the copy modify the original
+        copied_compiler = copied.compiler
+        copied2 = copied.copy()
+        copied_compiler.remove("Visual Studio")
+        self.assertEqual(copied2.compiler.values_range, ["Visual Studio", "gcc"])
+        self.assertEqual(self.sut.compiler.values_range, ["Visual Studio"])
+
     def remove_test(self):
         self.sut.remove("compiler")
         self.sut.os = "Windows"
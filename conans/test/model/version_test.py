@@ -35,3 +35,15 @@ class VersionTest(unittest.TestCase):
         self.assertTrue(Version("1.2.1-dev") > Version("1.2"))
         self.assertTrue(Version("1.2.1-dev") > Version("1.2.alpha"))
         self.assertTrue(Version("1.2.1-dev") > Version("1.2-alpha"))
+
+    def sort_test(self):
+        versions = ["1.2.1", "1.2.rc1", "1.10", "1.2", "0.9-beta", "1.2.0", "1.2.1-dev", "1.3"]
+        expected = ["0.9-beta", "1.2.rc1", "1.2", "1.2.0", "1.2.1-dev", "1.2.1", "1.3", "1.10"]
+        self.assertEqual(sorted(Version(v) for v in versions), expected)
+        self.assertEqual(sorted(versions, key=lambda v: Version(v).key), expected)
+        # Consistent in both directions
+        self.assertTrue(Version("1.2.rc1") < Version("1.2"))
+        self.assertTrue(Version("1.2") > Version("1.2.rc1"))
+        self.assertFalse(Version("1.2") < "1.2")
+        self.assertTrue(Version("1.2") <= "1.2")
+        self.assertEqual(Version("1.2.3").as_list, [1, 2, 3])
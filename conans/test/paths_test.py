@@ -8,6 +8,7 @@ from conans.test.utils.test_files import temp_folder
 from conans.search import DiskSearchManager, DiskSearchAdapter
 from conans.util.files import save
 from conans.model.info import ConanInfo
+from conans.errors import InvalidNameException
 
 
 class PathsTest(unittest.TestCase):
@@ -109,3 +110,7 @@ class PathsTest(unittest.TestCase):
         # Case sensitive search
         self.assertEqual(str(search_manager.search(pattern="SDL*", ignorecase=False)[0]),
                          str(conan_ref5))
+
+        # The folders of the storage are validated, they can contain anything
+        os.makedirs("bad$name/1.0/lasote/testing/%s" % EXPORT_FOLDER)
+        self.assertRaises(InvalidNameException, search_manager.search, "*")
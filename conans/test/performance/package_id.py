@@ -0,0 +1,57 @@
+import time
+import unittest
+from conans.client.conf import default_settings_yml
+from conans.model.info import ConanInfo
+from conans.model.options import OptionsValues
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.model.settings import Settings
+
+
+class PackageIdPerformanceTest(unittest.TestCase):
+    """ NOT really a test, but a benchmark of the package_id computation of a 500 nodes graph
+    FILE name is not "test" so it will not run under unit testing
+    """
+
+    def _graph(self, num):
+        settings = Settings.loads(default_settings_yml)
+        settings.os = "Windows"
+        settings.compiler = "Visual Studio"
+        settings.compiler.version = "14"
+        settings.compiler.runtime = "MD"
+        settings.arch = "x86_64"
+        settings.build_type = "Release"
+        infos = []
+        requires = []
+        for i in range(num):
+            options = OptionsValues.loads("shared=False\nfPIC=True\n" +
+                                          "\n".join("Hello%d:shared=True" % j
+                                                    for j in range(max(0, i - 5), i)))
+            info = ConanInfo.create(settings.values, options, requires[-5:], requires[:-5], None)
+            ref = ConanFileReference.loads("Hello%d/0.1@lasote/stable" % i)
+            infos.append((ref, info))
+            requires.append(PackageReference(ref, info.package_id()))
+        return infos
+
+    def _visit(self, infos, invalidate):
+        # init_package_info, _compute_private_nodes, _build_node, importer, printer...
+        for _ in range(5):
+            for ref, info in infos:
+                if invalidate:
+                    info.settings.os = "Windows"  # Same value, new version of the settings
+                    info._package_id = info._package_reference = None
+                info.package_reference(ref)
+
+    def package_id_test(self):
+        num = 500
+        t1 = time.time()
+        infos = self._graph(num)
+        print("Graph of %d nodes: %.3f s" % (num, time.time() - t1))
+
+        t1 = time.time()
+        self._visit(infos, invalidate=True)
+        cold = time.time() - t1
+        t1 = time.time()
+        self._visit(infos, invalidate=False)
+        memoized = time.time() - t1
+        print("package_reference(): computed %.3f s, memoized %.3f s" % (cold, memoized))
+        self.assertLess(memoized, cold)
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+from conans.test.utils.test_files import temp_folder
+
+
+class StartupTest(unittest.TestCase):
+    """ NOT really a test, but a benchmark of the command line startup time
+    FILE name is not "test" so it will not run under unit testing
+    """
+
+    def _run(self, code, user_home):
+        env = dict(os.environ)
+        env["CONAN_USER_HOME"] = user_home
+        return subprocess.check_output([sys.executable, "-c", code], env=env)
+
+    def help_startup_test(self):
+        user_home = temp_folder()
+        command = "from conans.client.command import main; main(['--help'])"
+        self._run(command, user_home)  # Warm up, creates conf, .pyc files...
+        times = []
+        for _ in range(10):
+            t1 = time.time()
+            self._run(command, user_home)
+            times.append(time.time() - t1)
+        best = min(times)
+        print("conan --help: best %.3f s, mean %.3f s" % (best, sum(times) / len(times)))
+        self.assertLess(best, 0.15)
+
+        # Modules only needed to talk with remotes or run commands are not imported
+        modules = self._run("import sys\n"
+                            "from conans.client.command import get_command\n"
+                            "get_command()\n"
+                            "print(' '.join(sys.modules))", user_home).decode().split()
+        for module in ("requests", "yaml", "patch", "conans.client.manager",
+                       "conans.client.remote_manager", "conans.client.rest.rest_client"):
+            self.assertNotIn(module, modules)
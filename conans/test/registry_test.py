@@ -52,3 +52,29 @@ class RegistryTest(unittest.TestCase):
         registry.set_ref(ref, remotes[0])
         remote = registry.get_ref(ref)
         self.assertEqual(remote, remotes[0])
+
+    def delayed_refs_test(self):
+        f = os.path.join(temp_folder(), "aux_file")
+        registry = RemoteRegistry(f, TestBufferConanOutput())
+        registry.add("local", "http://localhost:9300")
+        ref = ConanFileReference.loads("MyLib/0.1@lasote/stable")
+        remote = registry.remote("local")
+
+        registry.set_ref(ref, remote)
+        self.assertEqual(registry.get_ref(ref), remote)
+        # Not saved until flushed
+        other = RemoteRegistry(f, TestBufferConanOutput())
+        self.assertIsNone(other.get_ref(ref))
+        registry.flush()
+        self.assertEqual(other.get_ref(ref), remote)
+
+        # Changes from other instances (processes) are detected, pending refs are kept
+        ref2 = ConanFileReference.loads("MyLib2/0.1@lasote/stable")
+        registry.set_ref(ref2, remote)
+        other.add("new", "new_url")
+        self.assertEqual(registry.remote("new"), ("new", "new_url"))
+        self.assertEqual(registry.get_ref(ref2), remote)
+        registry.flush()
+        other = RemoteRegistry(f, TestBufferConanOutput())
+        self.assertEqual(other.get_ref(ref2), remote)
+        self.assertEqual(other.remote("new"), ("new", "new_url"))
@@ -5,12 +5,12 @@ import unittest
 from mock import Mock
 
 from conans.client.client_cache import ClientCache
-from conans.client.remote_manager import RemoteManager
+from conans.client.remote_manager import RemoteManager, compress_files, unzip_and_get_files
 from conans.client.remote_registry import Remote
 from conans.errors import NotFoundException
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.model.manifest import FileTreeManifest
-from conans.paths import CONANFILE, CONAN_MANIFEST, CONANINFO
+from conans.paths import CONANFILE, CONAN_MANIFEST, CONANINFO, PACKAGE_TGZ_NAME
 from conans.test.tools import TestBufferConanOutput, TestClient
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.cpp_test_files import cpp_hello_conan_files
@@ -93,3 +93,18 @@ class RemoteManagerTest(unittest.TestCase):
         self.assertFalse(self.remote_client.get_package.called)
         self.manager.get_package(self.package_reference, temp_folder(), Remote("other", "url"))
         self.assertTrue(self.remote_client.get_package.called)
+
+    def extraction_mtime_test(self):
+        folder = temp_folder()
+        save(os.path.join(folder, "include", "hello.h"), "header")
+        save(os.path.join(folder, CONANINFO), "info")
+        files = {"include/hello.h": os.path.join(folder, "include", "hello.h"),
+                 CONANINFO: os.path.join(folder, CONANINFO)}
+        files = compress_files(files, PACKAGE_TGZ_NAME, excluded=(CONANINFO, ), dest_dir=folder)
+
+        tgz_path = files[PACKAGE_TGZ_NAME]
+        dest_folder = temp_folder()
+        retrieved = unzip_and_get_files(files, dest_folder, PACKAGE_TGZ_NAME, mtime=1000)
+        self.assertEqual(sorted(retrieved), [CONANINFO, os.path.join("include", "hello.h")])
+        self.assertFalse(os.path.exists(tgz_path))
+        self.assertEqual(os.path.getmtime(os.path.join(dest_folder, "include", "hello.h")), 1000)
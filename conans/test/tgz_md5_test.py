@@ -1,9 +1,11 @@
 import unittest
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import save, md5sum
+from conans.util.files import save, md5sum, gzopen_without_timestamps, load
 from conans.paths import PACKAGE_TGZ_NAME
 import os
+import tarfile
 import time
+from collections import OrderedDict
 from conans.client.remote_manager import compress_files
 
 
@@ -34,3 +36,56 @@ class TgzMd5Test(unittest.TestCase):
         md5_b = md5sum(file_path)
 
         self.assertEquals(md5_a, md5_b)
+
+    def sorted_members_test(self):
+        folder = temp_folder()
+        files = {}
+        for i in range(100):
+            name = "include/sub%d/file%d.h" % (i % 3, i)
+            save(os.path.join(folder, name), "header %d" % i * (i * 10))
+            files[name] = os.path.join(folder, name)
+        save(os.path.join(folder, "lib", "big.lib"), b"x" * (2 * 1024 * 1024 + 1))
+        files["lib/big.lib"] = os.path.join(folder, "lib", "big.lib")
+
+        tgz_folder = temp_folder()
+        compress_files(files, PACKAGE_TGZ_NAME, excluded=[], dest_dir=tgz_folder)
+        tgz_path = os.path.join(tgz_folder, PACKAGE_TGZ_NAME)
+        with tarfile.open(tgz_path) as tgz:
+            self.assertEqual(tgz.getnames(), sorted(files))
+            self.assertEqual(tgz.extractfile("include/sub1/file7.h").read(),
+                             b"header 7" * 70)
+            self.assertEqual(tgz.getmember("lib/big.lib").size, 2 * 1024 * 1024 + 1)
+
+        # The insertion order doesn't matter
+        other_folder = temp_folder()
+        compress_files(OrderedDict(sorted(files.items(), reverse=True)), PACKAGE_TGZ_NAME,
+                       excluded=[], dest_dir=other_folder)
+        self.assertEqual(md5sum(tgz_path), md5sum(os.path.join(other_folder, PACKAGE_TGZ_NAME)))
+
+    def same_as_tarfile_test(self):
+        folder = temp_folder()
+        files = {}
+        for i in range(50):
+            name = "include/file%d.h" % i
+            save(os.path.join(folder, name), "header %d" % i * (i * 100))
+            files[name] = os.path.join(folder, name)
+        save(os.path.join(folder, "lib", "big.lib"), b"x" * (2 * 1024 * 1024 + 1))
+        files["lib/big.lib"] = os.path.join(folder, "lib", "big.lib")
+
+        tgz_folder = temp_folder()
+        compress_files(files, PACKAGE_TGZ_NAME, excluded=[], dest_dir=tgz_folder)
+
+        # The buffered writer produces the same bytes as adding the files one by one
+        expected_folder = temp_folder()
+        expected_path = os.path.join(expected_folder, PACKAGE_TGZ_NAME)
+        with open(expected_path, "wb") as tgz_handle:
+            tgz = gzopen_without_timestamps(PACKAGE_TGZ_NAME, mode="w", fileobj=tgz_handle)
+            for filename, abs_path in sorted(files.items()):
+                info = tarfile.TarInfo(name=filename)
+                info.size = os.stat(abs_path).st_size
+                info.mode = os.stat(abs_path).st_mode
+                with open(abs_path, "rb") as file_handler:
+                    tgz.addfile(tarinfo=info, fileobj=file_handler)
+            tgz.close()
+        self.assertEqual(load(expected_path, binary=True),
+                         load(os.path.join(tgz_folder, PACKAGE_TGZ_NAME), binary=True))
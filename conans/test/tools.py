@@ -15,6 +15,7 @@ import shutil
 import requests
 from mock import Mock
 import uuid
+import threading
 from webtest.app import TestApp
 from conans.client.rest.rest_client import RestApiClient
 from six.moves.urllib.parse import urlsplit, urlunsplit
@@ -33,6 +34,8 @@ import six
 from conans.client.rest.uploader_downloader import IterableToFileAdapter
 from conans.client.client_cache import ClientCache
 from conans.search import DiskSearchManager, DiskSearchAdapter
+from conans.server.test.utils.fake_object_store import FakeObjectStore
+from conans.server.conf import get_upstream_client
 
 
 class TestingResponse(object):
@@ -161,6 +164,39 @@ class TestRequester(object):
             headers.update(mock_request.headers)
 
 
+class ThreadedTestRequester(TestRequester):
+    """TestRequester performing each call in its own thread. Needed when the calls are done
+    from a server while serving a request (e.g. a mirror calling its upstream), as bottle
+    keeps the current request context per thread"""
+
+    def _in_thread(self, method, *args, **kwargs):
+        result = {}
+
+        def call():
+            try:
+                result["response"] = method(*args, **kwargs)
+            except Exception as exc:
+                result["error"] = exc
+        thread = threading.Thread(target=call)
+        thread.start()
+        thread.join()
+        if "error" in result:
+            raise result["error"]
+        return result["response"]
+
+    def get(self, *args, **kwargs):
+        return self._in_thread(super(ThreadedTestRequester, self).get, *args, **kwargs)
+
+    def put(self, *args, **kwargs):
+        return self._in_thread(super(ThreadedTestRequester, self).put, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self._in_thread(super(ThreadedTestRequester, self).delete, *args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        return self._in_thread(super(ThreadedTestRequester, self).post, *args, **kwargs)
+
+
 class TestServer(object):
     from conans import __version__ as SERVER_VERSION
     from conans.server.conf import MIN_CLIENT_COMPATIBLE_VERSION
@@ -168,12 +204,21 @@ class TestServer(object):
     def __init__(self, read_permissions=None,
                  write_permissions=None, users=None, plugins=None, base_path=None,
                  server_version=Version(SERVER_VERSION),
-                 min_client_compatible_version=Version(MIN_CLIENT_COMPATIBLE_VERSION)):
+                 min_client_compatible_version=Version(MIN_CLIENT_COMPATIBLE_VERSION),
+                 upstream=None, upstream_ttl=None, upstream_credentials=None,
+                 object_store=False):
         """
              'read_permissions' and 'write_permissions' is a list of:
                  [("opencv/2.3.4@lasote/testing", "user1, user2")]
 
              'users':  {username: plain-text-passwd}
+
+             'upstream': TestServer to be mirrored by this one (pull-through)
+
+             'upstream_credentials': (user, password) to log in the upstream
+
+             'object_store': store files in a FakeObjectStore (self.object_store), with
+                             presigned urls, instead of the disk
         """
         # Unique identifier for this server, will be used by TestRequester
         # to determine where to call. Why? remote_manager just assing an url
@@ -187,12 +232,26 @@ class TestServer(object):
             users = {"lasote": "mypass"}
         self.fake_url = "http://fake%s.com" % str(uuid.uuid4()).replace("-", "")
         min_client_ver = min_client_compatible_version
+        upstream_client = None
+        if upstream:
+            user, password = upstream_credentials or (None, None)
+            upstream_client = get_upstream_client(upstream.fake_url, user, password,
+                                                  ThreadedTestRequester({"upstream": upstream}))
+        self.object_store = None
+        if object_store:
+            self.object_store = FakeObjectStore(self.fake_url + "/objectstore")
         self.test_server = TestServerLauncher(base_path, read_permissions,
                                               write_permissions, users,
                                               base_url=self.fake_url + "/v1",
                                               plugins=plugins,
                                               server_version=server_version,
-                                              min_client_compatible_version=min_client_ver)
+                                              min_client_compatible_version=min_client_ver,
+                                              upstream_client=upstream_client,
+                                              object_store=self.object_store)
+        if upstream:
+            self.test_server.file_manager.ttl = upstream_ttl
+        if object_store:
+            self.test_server.ra.root_app.mount("/objectstore/", self.object_store.app)
         self.app = TestApp(self.test_server.ra.root_app)
 
     @property
@@ -382,7 +441,6 @@ class TestClient(object):
 
         # Migration system
         self.client_cache = migrate_and_get_client_cache(self.base_folder, TestBufferConanOutput(),
-                                                         manager=self.remote_manager,
                                                          storage_folder=self.storage_folder)
 
         # Maybe something have changed with migrations
@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+from mock import patch
+from conans.client.trash import Trash
+from conans.test.tools import TestClient
+from conans.test.utils.cpp_test_files import cpp_hello_conan_files
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+
+class TrashTest(unittest.TestCase):
+
+    def background_reap_test(self):
+        folder = temp_folder()
+        trash = Trash(os.path.join(folder, ".trash"))
+        for i in range(3):
+            path = os.path.join(folder, "build%d" % i)
+            save(os.path.join(path, "sub", "file.o"), "contents")
+            trash.remove(path)
+            self.assertFalse(os.path.exists(path))
+        trash.remove(os.path.join(folder, "not_existing"))
+
+        self._wait_empty(trash)
+
+        # Folders removed after the reaper finished are deleted by a new one
+        path = os.path.join(folder, "build_later")
+        save(os.path.join(path, "file.o"), "contents")
+        trash.remove(path)
+        self.assertFalse(os.path.exists(path))
+        self._wait_empty(trash)
+
+    @unittest.skipIf(sys.platform == "win32", "No zombie processes in Windows")
+    def reaper_not_child_test(self):
+        folder = temp_folder()
+        trash = Trash(os.path.join(folder, ".trash"))
+        path = os.path.join(folder, "build")
+        save(os.path.join(path, "file.o"), "contents")
+        started = []
+        subprocess_popen = subprocess.Popen
+
+        def popen(*args, **kwargs):
+            started.append(subprocess_popen(*args, **kwargs))
+            return started[-1]
+
+        with patch("subprocess.Popen", popen):
+            trash.remove(path)
+        self.assertEqual(len(started), 1)
+        # The started process has already been waited for, the reaper is not a child
+        with self.assertRaises(OSError):
+            os.waitpid(started[0].pid, os.WNOHANG)
+        self._wait_empty(trash)
+
+    def _wait_empty(self, trash):
+        for _ in range(100):
+            if not os.listdir(trash.folder):
+                break
+            time.sleep(0.1)
+        self.assertEqual(os.listdir(trash.folder), [])
+
+    def reaper_running_test(self):
+        folder = temp_folder()
+        trash = Trash(os.path.join(folder, ".trash"))
+        started = []
+        trash._start_reaper = lambda: started.append(True)
+        path = os.path.join(folder, "build")
+        save(os.path.join(path, "file.o"), "contents")
+        # A reaper of other process is deleting, the locks of this process would not block
+        code = ("import fasteners, sys; lock = fasteners.InterProcessLock(%r); lock.acquire(); "
+                "print('locked'); sys.stdout.flush(); sys.stdin.read()" % (trash.folder + ".lock"))
+        reaper = subprocess.Popen([sys.executable, "-c", code], stdin=subprocess.PIPE,
+                                  stdout=subprocess.PIPE)
+        try:
+            self.assertEqual(reaper.stdout.readline().strip(), b"locked")
+            trash.remove(path)
+        finally:
+            reaper.communicate()
+        # The running one will check the trash again, no new reaper
+        self.assertEqual(started, [])
+        trash.reap()
+        self.assertEqual(os.listdir(trash.folder), [])
+
+    def purge_test(self):
+        folder = temp_folder()
+        trash = Trash(os.path.join(folder, ".trash"))
+        trash._start_reaper = lambda: None  # Nothing deleted in background
+        path = os.path.join(folder, "build")
+        save(os.path.join(path, "file.o"), "contents")
+        trash.remove(path)
+        self.assertEqual(len(os.listdir(trash.folder)), 1)
+        trash.purge()
+        self.assertEqual(os.listdir(trash.folder), [])
+
+    def client_test(self):
+        client = TestClient()
+        client.save(cpp_hello_conan_files("Hello0", "0.1"))
+        client.run("export lasote/stable")
+        trash = client.client_cache.trash
+        trash._start_reaper = lambda: None
+        trash.remove(os.path.join(client.client_cache.store, "Hello0"))
+        # The trash contents are not references of the store
+        client.run("search")
+        self.assertIn("There are no packages", client.user_io.out)
+
+        client.run("cache purge")
+        self.assertIn("Purging %s" % trash.folder, client.user_io.out)
+        self.assertEqual(os.listdir(trash.folder), [])
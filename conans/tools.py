@@ -4,10 +4,7 @@ from __future__ import print_function
 import sys
 import os
 from conans.errors import ConanException
-from conans.util.files import _generic_algorithm_sum, load
-from patch import fromfile, fromstring
-from conans.client.rest.uploader_downloader import Downloader
-import requests
+from conans.util.files import _generic_algorithm_sum, load, break_hard_link
 from conans.client.output import ConanOutput
 import platform
 from conans.model.version import Version
@@ -130,24 +127,45 @@ def untargz(filename, destination="."):
         tarredgzippedFile.extractall(destination)
 
 
-def get(url):
+def get(url, md5=None, sha1=None, sha256=None):
     """ high level downloader + unziper + delete temporary zip
     """
     filename = os.path.basename(url)
-    download(url, filename)
+    download(url, filename, md5=md5, sha1=sha1, sha256=sha256)
     unzip(filename)
     os.unlink(filename)
 
 
-def download(url, filename, verify=True):
-    out = ConanOutput(sys.stdout, True)
-    if verify:
-        # We check the certificate using a list of known verifiers
-        import conans.client.rest.cacert as cacert
-        verify = cacert.file_path
-    downloader = Downloader(requests, out, verify=verify)
-    downloader.download(url, filename)
-    out.writeln("")
+def download(url, filename, verify=True, md5=None, sha1=None, sha256=None):
+    """ downloads url into filename. If the download cache is enabled (CONAN_DOWNLOAD_CACHE)
+    the file is retrieved from it if possible. Checksums are optional, if given, the file is
+    checked, and it is stored in the cache keyed by them. Without checksums it is not cached
+    """
+    from conans.client.download_cache import get_download_cache
+
+    def _download(url, filename):
+        # Not imported at module level, they are slow to import and rarely used by recipes
+        import requests
+        from conans.client.rest.uploader_downloader import Downloader
+        out = ConanOutput(sys.stdout, True)
+        verify_certs = verify
+        if verify_certs:
+            # We check the certificate using a list of known verifiers
+            import conans.client.rest.cacert as cacert
+            verify_certs = cacert.file_path
+        downloader = Downloader(requests, out, verify=verify_certs)
+        downloader.download(url, filename)
+        out.writeln("")
+        for algorithm, signature in checksums.items():
+            if signature:
+                check_with_algorithm_sum(algorithm, filename, signature)
+
+    checksums = {"md5": md5, "sha1": sha1, "sha256": sha256}
+    download_cache = get_download_cache()
+    if download_cache:
+        download_cache.download(url, filename, checksums, _download)
+    else:
+        _download(url, filename)
 #     save(filename, content)
 
 
@@ -155,6 +173,7 @@ def replace_in_file(file_path, search, replace):
     content = load(file_path)
     content = content.replace(search, replace)
     content = content.encode("utf-8")
+    break_hard_link(file_path)
     with open(file_path, "wb") as handle:
         handle.write(content)
 
@@ -187,6 +206,7 @@ def patch(base_path=None, patch_file=None, patch_string=None):
 
     if not patch_file and not patch_string:
         return
+    from patch import fromfile, fromstring
     if patch_file:
         patchset = fromfile(patch_file)
     else:
@@ -9,12 +9,15 @@
 import os
 
 
-def get_env(env_key, default=None, environment=os.environ):
+def get_env(env_key, default=None, environment=None):
     '''Get the env variable associated with env_key'''
+    environment = os.environ if environment is None else environment
 
     env_var = environment.get(env_key, default)
     if env_var != default:
-        if isinstance(default, str):
+        if isinstance(default, bool):  # Before int, bool is a subclass of int
+            return env_var.strip().lower() in ("1", "true", "yes", "on")
+        elif isinstance(default, str):
             return env_var
         elif isinstance(default, int):
             return int(env_var)
@@ -22,7 +25,5 @@ def get_env(env_key, default=None, environment=os.environ):
             return float(env_var)
         elif isinstance(default, list):
             return env_var.split(",")
-        elif isinstance(default, bool):
-            return env_var == "1"
 
     return env_var
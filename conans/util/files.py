@@ -1,6 +1,6 @@
 import os
 import shutil
-from errno import ENOENT, EEXIST
+from errno import ENOENT, EEXIST, EOPNOTSUPP, EXDEV, EINVAL, ENOTTY
 import hashlib
 import sys
 from os.path import abspath, realpath, join as joinpath
@@ -9,6 +9,7 @@ import re
 import six
 from conans.util.log import logger
 import tarfile
+from collections import OrderedDict
 
 
 def decode_text(text):
@@ -79,10 +80,26 @@ def save(path, content, append=False):
         if not isinstance(content, bytes):
             content = bytes(content, "utf-8")
     mode = 'wb' if not append else 'ab'
+    break_hard_link(path)
     with open(path, mode) as handle:
         handle.write(content)
 
 
+def break_hard_link(path):
+    """ if path is a hard link (e.g. the sources of build folders synced in "link" mode),
+    replaces it with an independent copy, so writing it doesn't modify the other names
+    """
+    try:
+        if os.stat(path).st_nlink < 2:
+            return
+    except OSError:  # Not existing
+        return
+    tmp_path = path + ".conan_unlink"
+    shutil.copy2(path, tmp_path)
+    os.unlink(path)
+    os.rename(tmp_path, path)
+
+
 def save_files(path, files):
     for name, content in list(files.items()):
         save(os.path.join(path, name), content)
@@ -143,6 +160,115 @@ def mkdir(path, raise_if_already_exists=False):
         raise
 
 
+# Linux ioctl to clone a file sharing its blocks (reflink) in btrfs, xfs, ocfs2...
+_FICLONE = 0x40049409
+# (src device, dst device) pairs where the reflink is known not to be supported
+_no_reflink = set()
+# Errors of the clone ioctl meaning that it is not supported
+_NO_REFLINK_ERRORS = (EOPNOTSUPP, EXDEV, EINVAL, ENOTTY)
+# Number of files from which the copies are done in parallel by a pool of threads
+PARALLEL_COPY_MIN_FILES = 32
+
+
+def _reflink(src, dst):
+    """ clones src into dst, sharing the data blocks (copy on write). Returns False if it
+    is not supported by the platform or filesystem, or it fails, dst is not modified then
+    """
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        return False
+    dst_folder = os.path.dirname(os.path.abspath(dst))  # dst can be relative, "file.h"
+    devices = (os.stat(src).st_dev, os.stat(dst_folder).st_dev)
+    if devices in _no_reflink:
+        return False
+    import tempfile
+    # Cloned into a temporary file that replaces dst, a failure does not truncate it
+    try:
+        fd, tmp = tempfile.mkstemp(dir=dst_folder, prefix=".conan_reflink")
+    except (IOError, OSError):
+        return False
+    try:
+        with open(src, "rb") as src_file:
+            fcntl.ioctl(fd, _FICLONE, src_file.fileno())
+        shutil.copystat(src, tmp)
+        os.close(fd)
+        fd = None
+        os.rename(tmp, dst)
+    except (IOError, OSError) as e:
+        if e.errno in _NO_REFLINK_ERRORS:  # Other errors (EACCES, ENOSPC...) are not cached
+            _no_reflink.add(devices)
+        if fd is not None:
+            os.close(fd)
+        os.remove(tmp)
+        return False
+    return True
+
+
+def copy_file(src, dst, link=False):
+    """ copies src file into dst, overwriting it, avoiding the copy of the contents when
+    possible:
+    link: True to hard link dst to src if they are in the same filesystem. Only valid for
+          sources that will not be modified, as both names share the contents
+    otherwise, the file is cloned (reflink) if the filesystem supports it, or copied
+    """
+    if os.path.exists(dst):
+        if os.path.samefile(src, dst):
+            return
+        # Never write through a hard link, it would modify the other names too
+        if link or os.stat(dst).st_nlink > 1:
+            os.unlink(dst)
+    if link:
+        try:
+            os.link(os.path.realpath(src), dst)
+            return
+        except (OSError, AttributeError):  # Different filesystems, os.link not available
+            pass
+    if not _reflink(src, dst):
+        shutil.copy2(src, dst)
+
+
+def _unchanged(src, dst):
+    """ dst was copied from src (copy2 and reflink preserve the mtime) and not modified since
+    """
+    try:
+        src_stat, dst_stat = os.stat(src), os.stat(dst)
+    except OSError:
+        return False
+    return (src_stat.st_size == dst_stat.st_size and
+            abs(src_stat.st_mtime - dst_stat.st_mtime) < 0.001)
+
+
+def copy_files(files, link=False, skip_unchanged=False):
+    """ copies a list of (src, dst) files, creating the destination folders first. Many
+    files are copied in parallel, as copying is bound to the I/O latency. If a dst is
+    repeated, the last src is the one copied
+    param skip_unchanged: do not copy again the files whose dst has the same size and mtime
+    """
+    files = list(OrderedDict((dst, (src, dst)) for src, dst in files).values())
+    if skip_unchanged:
+        files = [(src, dst) for src, dst in files if not _unchanged(src, dst)]
+    folders = set(os.path.dirname(dst) for _, dst in files)
+    for folder in sorted(folders):
+        if not os.path.isdir(folder):
+            mkdir(folder)
+
+    def copy(src_dst):
+        copy_file(src_dst[0], src_dst[1], link)
+
+    if len(files) < PARALLEL_COPY_MIN_FILES:
+        for src_dst in files:
+            copy(src_dst)
+        return
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(min(8, len(files) // PARALLEL_COPY_MIN_FILES + 1))
+    try:
+        pool.map(copy, files)
+    finally:
+        pool.close()
+        pool.join()
+
+
 def path_exists(path, basedir=None):
     """Case sensitive, for windows, optional
     basedir for skip caps check for tmp folders in testing for example (returned always
@@ -207,13 +333,18 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=9, **k
     return t
 
 
-def tar_extract(fileobj, destination_dir):
+def tar_extract(fileobj, destination_dir, mtime=None):
     '''Extract tar file controlling not absolute paths and fixing the routes
-    if the tar was zipped in windows'''
+    if the tar was zipped in windows
+    param mtime: timestamp set to the extracted files as they are written, the one stored in
+                 the tar file if None
+    return: list of the relative names of the extracted files'''
     def badpath(path, base):
         # joinpath will ignore base if path is absolute
         return not realpath(abspath(joinpath(base, path))).startswith(base)
 
+    extracted = []
+
     def safemembers(members):
         base = realpath(abspath("."))
 
@@ -223,11 +354,16 @@ def tar_extract(fileobj, destination_dir):
             else:
                 # Fixes unzip a windows zipped file in linux
                 finfo.name = finfo.name.replace("\\", "/")
+                if mtime is not None:
+                    finfo.mtime = mtime
+                if finfo.isfile():
+                    extracted.append(os.path.normpath(finfo.name))
                 yield finfo
 
     the_tar = tarfile.open(fileobj=fileobj)
     the_tar.extractall(path=destination_dir, members=safemembers(the_tar))
     the_tar.close()
+    return extracted
 
 
 def list_folder_subdirs(basedir="", level=None):
@@ -0,0 +1,50 @@
+""" Interprocess lock files that can be removed while other processes use them. A process
+waiting for a removed lock file would lock its old inode, while new ones lock a new file in
+the same path, so the locks check that they locked the current file of the path
+"""
+import os
+import sys
+
+import fasteners
+
+
+def acquire_lock(path, blocking=True):
+    """ returns the acquired fasteners.InterProcessLock of the path, or None if not blocking
+    and other process holds it
+    """
+    while True:
+        lock = fasteners.InterProcessLock(path)
+        if not lock.acquire(blocking=blocking):
+            return None
+        if _is_current(lock):
+            return lock
+        lock.release()  # Removed while waiting for it, lock the new file
+
+
+def remove_lock(path):
+    """ removes the lock file, unless other process holds it
+    """
+    if sys.platform == "win32":  # The files open by other processes cannot be removed
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return
+    if not os.path.exists(path):
+        return
+    lock = acquire_lock(path, blocking=False)
+    if lock is None:
+        return
+    try:
+        os.remove(path)
+    finally:
+        lock.release()
+
+
+def _is_current(lock):
+    if sys.platform == "win32":
+        return True
+    try:
+        return os.path.samestat(os.fstat(lock.lockfile.fileno()), os.stat(lock.path))
+    except OSError:  # Removed
+        return False